@@ -2,15 +2,17 @@ import gradio as gr
 from bangla_person_ner.utils.tokenizer import BasicTokenizer
 from bangla_person_ner.bangla_person_ner import BanglaPersorNer
 
-# try to create an object of BanglaPersorNer
+# create an object of BanglaPersorNer, only entities of Docs are used so activations are dropped
+bp_ner = BanglaPersorNer(lean=True)
+# try to load the model and warm it up
 try:
-    bp_ner = BanglaPersorNer()
+    bp_ner.warmup()
 except:
     # if model loading fails download it from google drive
     from bangla_person_ner.utils import downloader
-    # create an object of BanglaPersorNer
     downloader.download_model()
-    bp_ner = BanglaPersorNer()
+    # load the model and warm it up again
+    bp_ner.warmup()
 # create tokenizer object
 tokenizer = BasicTokenizer()
 
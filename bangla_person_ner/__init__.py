@@ -1,4 +1,21 @@
-from . import config
-from . import preprocessing
-from . import utils
-from . import bangla_person_ner
\ No newline at end of file
+import importlib
+
+# submodules are imported on first attribute access, so that importing the package
+# (i.e. for tokenizer or preprocessing) does not pull in spacy and the model code
+_SUBMODULES = ("config", "preprocessing", "utils", "bangla_person_ner", "server", "autotune")
+
+def __getattr__(name: str) -> object:
+    """This function imports a submodule of the package when it is accessed first time.
+
+    Args:
+        name (str): name of the attribute
+
+    Returns:
+        object: the imported submodule
+    """
+    if name in _SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(_SUBMODULES))
@@ -0,0 +1,157 @@
+import os
+import time
+import argparse
+import importlib.util
+from itertools import islice
+from .config import config as cfg
+from .bangla_person_ner import BanglaPersorNer
+from .utils.engines import ENGINES
+from .utils.bulk_io import open_corpus, iter_corpus_texts
+from .utils.tuning import write_tuned_config, set_torch_threads
+
+def load_sample_texts(input_path: str = "", input_format: str = "text", n_texts: int = 512) -> list:
+    """This function loads texts of sample corpus used for tuning.
+
+    Args:
+        input_path (str, optional): path of a corpus in bulk mode format. If empty, texts of
+            test data (cfg.TEST_DATA_PATH) are used. Defaults to "".
+        input_format (str, optional): "text" or "jsonl". Defaults to "text".
+        n_texts (int, optional): maximum number of texts. Defaults to 512.
+
+    Returns:
+        list: list of texts
+    """
+    if input_path:
+        with open_corpus(input_path) as corpus:
+            return [text for text, _, _ in islice(iter_corpus_texts(corpus, input_format), n_texts)]
+    import spacy
+    from spacy.tokens import DocBin
+    docs = DocBin().from_disk(cfg.TEST_DATA_PATH).get_docs(spacy.blank("bn").vocab)
+    return [doc.text for doc in islice(docs, n_texts)]
+
+def thread_grid(cpu_count: int) -> list:
+    """This function returns torch thread counts to try, powers of two up to cpu count and cpu count.
+
+    Args:
+        cpu_count (int): number of cpu cores
+
+    Returns:
+        list: thread counts, [None] if pytorch is not installed (threads are not tuned)
+    """
+    if importlib.util.find_spec("torch") is None:
+        return [None]
+    threads = [1]
+    while threads[-1] * 2 <= cpu_count:
+        threads.append(threads[-1] * 2)
+    if threads[-1] != cpu_count:
+        threads.append(cpu_count)
+    return threads
+
+def benchmark_config(bp_ner: BanglaPersorNer, texts: list, batch_size: int, n_threads: int, n_process: int) -> dict:
+    """This function measures throughput and latency of batch extraction with given settings.
+    With one process each batch is timed separately to get batch latency, with multiple processes
+    only throughput is measured (process start up is included, as in a real batch job).
+
+    Args:
+        bp_ner (BanglaPersorNer): object used for name extraction, model is already loaded
+        texts (list): sample texts
+        batch_size (int): number of texts in each model batch
+        n_threads (int): number of torch threads, None to keep current
+        n_process (int): number of processes used for inference
+
+    Returns:
+        dict: settings with docs_per_sec and p95_batch_seconds (None with multiple processes)
+    """
+    if n_threads is not None:
+        set_torch_threads(n_threads)
+    # warm up with this batch size
+    bp_ner.extract_person_names_batch(texts[:batch_size], batch_size=batch_size, n_process=1)
+    batch_seconds = []
+    if n_process == 1:
+        for i in range(0, len(texts), batch_size):
+            start = time.perf_counter()
+            bp_ner.extract_person_names_batch(texts[i:i + batch_size], batch_size=batch_size, n_process=1)
+            batch_seconds.append(time.perf_counter() - start)
+        elapsed = sum(batch_seconds)
+    else:
+        start = time.perf_counter()
+        bp_ner.extract_person_names_batch(texts, batch_size=batch_size, n_process=n_process)
+        elapsed = time.perf_counter() - start
+    p95_batch_seconds = sorted(batch_seconds)[int(0.95 * (len(batch_seconds) - 1))] if batch_seconds else None
+    return {
+        "batch_size": batch_size,
+        "torch_threads": n_threads,
+        "n_process": n_process,
+        "docs_per_sec": len(texts) / elapsed if elapsed > 0 else float("inf"),
+        "p95_batch_seconds": p95_batch_seconds,
+    }
+
+def autotune(bp_ner: BanglaPersorNer, texts: list, objective: str = "throughput",
+             batch_sizes: list = cfg.AUTOTUNE_BATCH_SIZES, n_processes: list = cfg.AUTOTUNE_N_PROCESSES) -> dict:
+    """This function benchmarks every combination of batch size, torch threads and number of
+    processes (using at most all cpu cores) and picks the best one.
+
+    Args:
+        bp_ner (BanglaPersorNer): object used for name extraction
+        texts (list): sample texts
+        objective (str, optional): "throughput" picks highest docs/sec, "latency" picks lowest
+            p95 batch latency (one process only). Defaults to "throughput".
+        batch_sizes (list, optional): batch sizes to try. Defaults to cfg.AUTOTUNE_BATCH_SIZES.
+        n_processes (list, optional): numbers of processes to try. Defaults to cfg.AUTOTUNE_N_PROCESSES.
+
+    Returns:
+        dict: best settings with objective, cpu_count and results of all combinations
+    """
+    cpu_count = os.cpu_count() or 1
+    # latency can only be measured with one process
+    if objective == "latency":
+        n_processes = [1]
+    # load the model before measuring
+    bp_ner.warmup(batch_size=1)
+    results = []
+    for n_process in n_processes:
+        # processes share the cores
+        if n_process > cpu_count:
+            continue
+        for n_threads in thread_grid(cpu_count // n_process):
+            for batch_size in batch_sizes:
+                result = benchmark_config(bp_ner, texts, batch_size, n_threads, n_process)
+                print(f"batch_size={batch_size:<4} torch_threads={str(n_threads):<4} n_process={n_process:<3} "
+                      f"{result['docs_per_sec']:>10.2f} docs/sec  p95 batch : "
+                      f"{'-' if result['p95_batch_seconds'] is None else format(result['p95_batch_seconds'], '.4f')}")
+                results.append(result)
+    if objective == "latency":
+        best = min(results, key=lambda result: result["p95_batch_seconds"])
+    else:
+        best = max(results, key=lambda result: result["docs_per_sec"])
+    return {**best, "objective": objective, "cpu_count": cpu_count, "n_texts": len(texts), "results": results}
+
+def main() -> None:
+    """This function is called if the script is called directly. It tunes batch settings on a
+    sample corpus and saves the best ones to tuned config.
+    """
+    # create argument parser
+    parser = argparse.ArgumentParser(description='Tune batch size, torch threads and number of processes.')
+    parser.add_argument('-i', '--input', type=str, default="", help='sample corpus (one text per line). defaults to texts of test data.')
+    parser.add_argument('--input-format', choices=["text", "jsonl"], default="text", help='format of sample corpus.')
+    parser.add_argument('-n', '--n-texts', type=int, default=512, help='number of sample texts.')
+    parser.add_argument('--objective', choices=["throughput", "latency"], default="throughput", help='what to optimize.')
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=cfg.AUTOTUNE_BATCH_SIZES, help='batch sizes to try.')
+    parser.add_argument('--n-processes', type=int, nargs='+', default=cfg.AUTOTUNE_N_PROCESSES, help='numbers of processes to try.')
+    parser.add_argument('--engine', choices=ENGINES, default=cfg.ENGINE, help='inference engine.')
+    parser.add_argument('--model-dir', type=str, default=cfg.MODEL_DIR, help='directory of the model.')
+    parser.add_argument('-o', '--output', type=str, default=cfg.TUNED_CONFIG_PATH, help='path of tuned config.')
+    # parse arguments
+    args = parser.parse_args()
+    # existing tuned config must not affect measurements
+    bp_ner = BanglaPersorNer(engine=args.engine, model_dir=args.model_dir, tuned_config_path="")
+    texts = load_sample_texts(args.input, args.input_format, args.n_texts)
+    tuned_config = autotune(bp_ner, texts, args.objective, args.batch_sizes, args.n_processes)
+    write_tuned_config(tuned_config, args.output)
+    print(f"\nBest for {args.objective} : batch_size={tuned_config['batch_size']}, "
+          f"torch_threads={tuned_config['torch_threads']}, n_process={tuned_config['n_process']}")
+    print(f"Saved tuned config at : {args.output}")
+
+if __name__ == "__main__":
+    # call main function
+    main()
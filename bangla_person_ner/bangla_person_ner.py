@@ -1,17 +1,138 @@
 import os
+import sys
 import argparse
 import json
-import spacy
+import time
+import threading
+from collections import deque
+from itertools import islice
+from typing import Iterable, Iterator
 from .config import config as cfg
+from .utils.name_gate import NameGate
+from .utils.batching import LengthBucketScheduler
+from .utils.metrics import InferenceMetrics, InstrumentedModel
+from .utils.tuning import read_tuned_config, set_torch_threads
+from .utils.engines import ENGINES, load_model
+from .utils.chunker import make_windows, merge_spans
+from .utils.cache import LRUCache, normalize_text
+from .utils.results import ExtractionResult, NO_NAME_FOUND, dumps_jsonl_line
+from .utils.bulk_io import open_corpus, skip_corpus_lines, iter_corpus_texts, read_checkpoint, write_checkpoint
+
 
 class BanglaPersorNer(object):
     """Class for Bangla person name extraction.
     """
-    def __init__(self) -> None:
+    def __init__(self, cache_size: int = cfg.CACHE_SIZE, cache_ttl: float = cfg.CACHE_TTL,
+                 engine: str = cfg.ENGINE, name_gate: NameGate = None, model_dir: str = cfg.MODEL_DIR,
+                 scheduler: LengthBucketScheduler = None, metrics: InferenceMetrics = None,
+                 lean: bool = cfg.LEAN_MODE, tuned_config_path: str = cfg.TUNED_CONFIG_PATH) -> None:
         """Initialize BanglaPersorNer class.
+
+        Args:
+            cache_size (int, optional): maximum number of results kept in LRU result cache.
+                Cache is disabled if 0. Defaults to cfg.CACHE_SIZE.
+            cache_ttl (float, optional): seconds after which a cached result expires. Cached
+                results never expire if None. Defaults to cfg.CACHE_TTL.
+            engine (str, optional): inference engine, one of utils.engines.ENGINES. "int8" and
+                "onnx" engines run faster on CPU with a small loss of accuracy, "gazetteer" engine
+                only finds known names but is much faster. Defaults to cfg.ENGINE.
+            name_gate (NameGate, optional): If provided, texts rejected by the gate are not sent to
+                the model and have no names. Defaults to None.
+            model_dir (str, optional): directory of the spacy model, i.e. cfg.STUDENT_MODEL_DIR for
+                the distilled CPU model. Defaults to cfg.MODEL_DIR.
+            scheduler (LengthBucketScheduler, optional): If provided, batch extraction sends texts
+                of similar length together under a token budget instead of batch_size texts in
+                input order. Defaults to None.
+            metrics (InferenceMetrics, optional): If provided, time spent in tokenizer, each
+                pipeline component, pre and post processing is recorded into it. Defaults to None.
+            lean (bool, optional): If set True, tensors and transformer output are dropped from
+                each Doc as soon as it is predicted, so batch jobs (and, Docs returned by get_doc)
+                do not keep activations alive. Entities are not affected. Defaults to cfg.LEAN_MODE.
+            tuned_config_path (str, optional): settings saved by autotune (batch size, number of
+                processes and torch threads), used as defaults of batch methods. Ignored if the
+                file does not exist or path is empty. Defaults to cfg.TUNED_CONFIG_PATH.
+
+        N.B. Only texts already in normalized form (see utils.cache.normalize_text) are cached,
+        other texts are always sent to the model, so enabling cache does not change any result.
+        """
+        # check engine name early, engine is applied when the model is loaded
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine {engine!r}, expected one of {ENGINES}.")
+        self.engine = engine
+        self.model_dir = model_dir
+        self.lean = lean
+        # defaults of batch methods, tuned settings if available
+        self.tuned_config = read_tuned_config(tuned_config_path)
+        self.batch_size = self.tuned_config.get("batch_size", cfg.BATCH_SIZE)
+        self.n_process = self.tuned_config.get("n_process", cfg.N_PROCESS)
+        # model is loaded on first use (or, by calling warmup)
+        self._model = None
+        self._model_lock = threading.Lock()
+        # create result cache if enabled
+        self._cache = LRUCache(maxsize=cache_size, ttl=cache_ttl) if cache_size > 0 else None
+        # gate which skips the model for texts without any name cue
+        self.name_gate = name_gate
+        # length bucketed batch scheduler
+        self.scheduler = scheduler
+        # latency metrics, model is wrapped to time its components when it is loaded
+        self.metrics = metrics
+        self._instrumented_model = None
+        if metrics is not None:
+            if self._cache is not None:
+                metrics.add_collector(lambda: {f"cache_{name}": value for name, value in self._cache.stats().items()})
+            if name_gate is not None:
+                metrics.add_collector(lambda: {f"gate_{name}": value for name, value in name_gate.stats().items()})
+
+    @property
+    def model(self) -> object:
+        """Spacy Language object of the model. Model is loaded when this is accessed first time.
+        """
+        # load the model only once, even if accessed from multiple threads
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    self._model = self._load_model()
+        return self._model
+
+    @property
+    def _nlp(self) -> object:
+        """Model used for inference, wrapped with InstrumentedModel if metrics are enabled.
+        """
+        if self.metrics is None:
+            return self.model
+        if self._instrumented_model is None:
+            self._instrumented_model = InstrumentedModel(self.model, self.metrics)
+        return self._instrumented_model
+
+    @property
+    def is_loaded(self) -> bool:
+        """True if the model is already loaded.
+        """
+        return self._model is not None
+
+    def _load_model(self) -> object:
+        """This function loads the model for selected engine. spacy is imported there, so that
+        creating an object of this class (or, importing this module) does not import it.
+
+        Returns:
+            object: Spacy Language object (or, GazetteerModel object for "gazetteer" engine)
         """
-        # Load the model
-        self._model = spacy.load(cfg.MODEL_DIR)
+        # set tuned number of torch threads before the model runs
+        if "torch_threads" in self.tuned_config:
+            set_torch_threads(self.tuned_config["torch_threads"])
+        return load_model(self.engine, self.model_dir, lean=self.lean)
+
+    def warmup(self, batch_size: int = None) -> None:
+        """This function loads the model (if not loaded yet) and runs inference on a dummy batch,
+        so that first real request does not pay for model loading and lazy initialization.
+
+        Args:
+            batch_size (int, optional): number of texts in the dummy batch. Defaults to None (self.batch_size).
+        """
+        batch_size = batch_size or self.batch_size
+        # run a dummy batch directly on the model so that cache is not affected
+        for _ in self.model.pipe([cfg.WARMUP_TEXT] * batch_size, batch_size=batch_size):
+            pass
 
     def get_doc(self, text: str) -> object:
         """This function performs model inference on given text and returns space Doc object.
@@ -22,18 +143,63 @@ class BanglaPersorNer(object):
         Returns:
             object: Spacy.tokens.Doc object
         """
+        # only tokenize the text if gate says it can not contain a name
+        if self.name_gate is not None and not self.name_gate.could_contain_name(text):
+            return self.model.make_doc(text)
         # get prediction on text
-        doc = self._model(text)
+        doc = self._nlp(text)
+        # return Doc object
+        return doc
+
+    def get_long_doc(self, text: str, max_chars: int = cfg.LONG_DOC_WINDOW_CHARS,
+                     overlap_sentences: int = cfg.LONG_DOC_OVERLAP_SENTENCES,
+                     batch_size: int = None) -> object:
+        """This function performs model inference on a long text (i.e. a news article). Text is
+        split into windows of sentences (see utils.chunker.make_windows), windows are inferenced
+        as a batch, and entities of overlapping windows are merged into a Doc of whole text.
+
+        Args:
+            text (str): text to be inferenced on
+            max_chars (int, optional): maximum number of characters in a window. Defaults to cfg.LONG_DOC_WINDOW_CHARS.
+            overlap_sentences (int, optional): number of sentences shared by consecutive windows.
+                Defaults to cfg.LONG_DOC_OVERLAP_SENTENCES.
+            batch_size (int, optional): number of windows in each model batch. Defaults to None (self.batch_size).
+
+        Returns:
+            object: Spacy.tokens.Doc object of whole text with merged entities
+        """
+        from spacy.util import filter_spans
+        batch_size = batch_size or self.batch_size
+        # split text into windows
+        windows = make_windows(text, max_chars=max_chars, overlap_sentences=overlap_sentences)
+        # get predictions on all windows as a batch
+        window_texts = [text[start:end] for start, end in windows]
+        spans = []
+        for (window_start, _), window_doc in zip(windows, self._nlp.pipe(window_texts, batch_size=batch_size)):
+            # convert entity offsets from window to document
+            for entity in window_doc.ents:
+                spans.append((window_start + entity.start_char, window_start + entity.end_char, entity.label_))
+        # tokenize whole text (without running the pipeline) and add merged entities
+        doc = self.model.make_doc(text)
+        entities = []
+        for start_char, end_char, label in merge_spans(spans):
+            entity = doc.char_span(start_char, end_char, label=label, alignment_mode="expand")
+            if entity is not None:
+                entities.append(entity)
+        # entities expanded to token boundaries may overlap, keep longest ones
+        doc.ents = filter_spans(entities)
         # return Doc object
         return doc
 
-    def extract_person_name(self, text: str) -> dict:
+    def extract_person_name(self, text: str, compact: bool = False) -> dict:
         """This function takes a text string and extract bangla person names from the text
         and return the results as list of dictionary. Each dictionary in returned list
         contains text of the name, start and end position in tokenized text.
 
         Args:
             text (str): text on which we want to perform name extraction
+            compact (bool, optional): If set True returns an ExtractionResult object instead of
+                dictionary. Defaults to False.
 
         Returns:
             dict: dictionary in format
@@ -49,48 +215,425 @@ class BanglaPersorNer(object):
                         ]
                     }
         """
+        # time whole call if metrics are enabled
+        if self.metrics is None:
+            return self._extract_person_name(text, compact)
+        start = time.perf_counter()
+        result = self._extract_person_name(text, compact)
+        self.metrics.observe("total", time.perf_counter() - start)
+        return result
+
+    def _extract_person_name(self, text: str, compact: bool) -> dict:
+        """This function is the implementation of extract_person_name.
+
+        Args:
+            text (str): text on which we want to perform name extraction
+            compact (bool): If set True returns an ExtractionResult object instead of dictionary
+
+        Returns:
+            dict: dictionary in format described in extract_person_name
+        """
+        # get prediction on text if cache is disabled, or text is not in normalized form (positions
+        # of names in a result cached for its normalized form would not refer to the text)
+        if self._cache is None or normalize_text(text) != text:
+            doc = self.get_doc(text)
+            # convert the Doc object to result dictionary and return
+            return self._make_result(text, self._entities_from_doc(doc), compact)
+        # texts rejected by the gate have no names, no need to cache them
+        if self.name_gate is not None and not self.name_gate.could_contain_name(text):
+            return self._make_result(text, (), compact)
+        # otherwise look for the result in the cache first
+        entities = self._cache.get(text)
+        # get prediction on text and cache it, if not found in the cache
+        if entities is None:
+            entities = self._entities_from_doc(self._nlp(text))
+            self._cache.put(text, entities)
+        # return the result
+        return self._make_result(text, entities, compact)
+
+    def extract_person_names_long(self, text: str, max_chars: int = cfg.LONG_DOC_WINDOW_CHARS,
+                                  overlap_sentences: int = cfg.LONG_DOC_OVERLAP_SENTENCES,
+                                  batch_size: int = None, compact: bool = False) -> dict:
+        """This function extracts bangla person names from a long text (i.e. a news article)
+        using get_long_doc. In addition to the fields returned by extract_person_name, each
+        extracted name contains "start_char" and "end_char", character offsets in the text.
+
+        Args:
+            text (str): text on which we want to perform name extraction
+            max_chars (int, optional): maximum number of characters in a window. Defaults to cfg.LONG_DOC_WINDOW_CHARS.
+            overlap_sentences (int, optional): number of sentences shared by consecutive windows.
+                Defaults to cfg.LONG_DOC_OVERLAP_SENTENCES.
+            batch_size (int, optional): number of windows in each model batch. Defaults to None (self.batch_size).
+            compact (bool, optional): If set True returns an ExtractionResult object instead of
+                dictionary. Defaults to False.
+
+        Returns:
+            dict: dictionary in format described in extract_person_name with character offsets
+        """
+        # get prediction on text
+        doc = self.get_long_doc(text, max_chars=max_chars, overlap_sentences=overlap_sentences, batch_size=batch_size)
+        # compact result already contains character offsets
+        if compact:
+            return self._make_result(text, self._entities_from_doc(doc), compact)
+        # convert the Doc object to result dictionary
+        result = self._make_result(text, self._entities_from_doc(doc))
+        # add character offsets of names
+        if doc.ents:
+            for name, entity in zip(result["extracted_names"], doc.ents):
+                name["start_char"] = entity.start_char
+                name["end_char"] = entity.end_char
+        # return the result
+        return result
+
+    def extract_person_names_stream(self, texts: Iterable[str], batch_size: int = None,
+                                    n_process: int = None, compact: bool = False) -> Iterator[dict]:
+        """This function takes an iterable of text strings and lazily yields name extraction
+        results in input order. Texts are sent to the model in batches using spacy nlp.pipe,
+        so the transformer can process several texts in one forward pass. If result cache (or,
+        name gate, scheduler, metrics) is enabled, texts are read in chunks of cfg.CACHE_CHUNK_SIZE,
+        cached texts (or, texts rejected by the gate) are not sent to the model and duplicate texts
+        in a chunk are sent to the model only once.
+
+        Args:
+            texts (Iterable[str]): texts on which we want to perform name extraction
+            batch_size (int, optional): number of texts in each model batch. Defaults to None (self.batch_size).
+            n_process (int, optional): number of processes used for inference. Defaults to None (self.n_process).
+            compact (bool, optional): If set True yields ExtractionResult objects instead of
+                dictionaries. Defaults to False.
+
+        Yields:
+            Iterator[dict]: dictionary in same format as returned by extract_person_name
+        """
+        # use tuned (or, configured) defaults
+        batch_size = batch_size or self.batch_size
+        n_process = n_process or self.n_process
+        # use chunked path if cache, gate, scheduler or metrics is enabled
+        if (self._cache is not None or self.name_gate is not None or self.scheduler is not None
+                or self.metrics is not None):
+            yield from self._extract_person_names_stream_chunked(texts, batch_size, n_process, compact)
+            return
+        # pass texts twice (once as context) so that we get back the original text with each Doc
+        text_tuples = ((text, text) for text in texts)
+        # get predictions in batches, spacy keeps the input order in output
+        for doc, text in self.model.pipe(text_tuples, as_tuples=True, batch_size=batch_size, n_process=n_process):
+            # convert the Doc object to result dictionary and yield
+            yield self._make_result(text, self._entities_from_doc(doc), compact)
+
+    def _extract_person_names_stream_chunked(self, texts: Iterable[str], batch_size: int,
+                                             n_process: int, compact: bool) -> Iterator[dict]:
+        """This function is the version of extract_person_names_stream used with result cache,
+        name gate, scheduler and (or) metrics.
+
+        Args:
+            texts (Iterable[str]): texts on which we want to perform name extraction
+            batch_size (int): number of texts in each model batch
+            n_process (int): number of processes used for inference
+            compact (bool): If set True yields ExtractionResult objects instead of dictionaries
+
+        Yields:
+            Iterator[dict]: dictionary in same format as returned by extract_person_name
+        """
+        # create an iterator so that we can read texts in chunks
+        texts = iter(texts)
+        # read chunks until texts are exhausted
+        while True:
+            chunk = list(islice(texts, cfg.CACHE_CHUNK_SIZE))
+            if not chunk:
+                break
+            start = time.perf_counter()
+            # entities of each unique text in the chunk
+            entities_by_key = {}
+            # unique texts which need to be sent to the model
+            missed_keys = []
+            # missed texts which are cached, only texts in normalized form are cached so that
+            # positions of cached names refer to the text
+            cached_keys = set()
+            for key in chunk:
+                # duplicate in the chunk, look up only once
+                if key in entities_by_key:
+                    continue
+                # texts rejected by the gate have no names
+                if self.name_gate is not None and not self.name_gate.could_contain_name(key):
+                    entities_by_key[key] = ()
+                    continue
+                cacheable = self._cache is not None and normalize_text(key) == key
+                entities = self._cache.get(key) if cacheable else None
+                entities_by_key[key] = entities
+                if entities is None:
+                    missed_keys.append(key)
+                    if cacheable:
+                        cached_keys.add(key)
+            if self.metrics is not None:
+                self.metrics.observe("preprocess", time.perf_counter() - start, "batch")
+            # get predictions for missed keys only and cache them
+            if self.scheduler is not None:
+                docs = self.scheduler.pipe(self._nlp, missed_keys, n_process=n_process, batch_size=batch_size)
+            else:
+                docs = self._nlp.pipe(missed_keys, batch_size=batch_size, n_process=n_process)
+            for key, doc in zip(missed_keys, docs):
+                entities = self._entities_from_doc(doc)
+                if key in cached_keys:
+                    self._cache.put(key, entities)
+                entities_by_key[key] = entities
+            # build results in input order
+            start = time.perf_counter()
+            results = [self._make_result(text, entities_by_key[text], compact) for text in chunk]
+            if self.metrics is not None:
+                self.metrics.observe("postprocess", time.perf_counter() - start, "batch")
+            yield from results
+
+    def extract_person_names_batch(self, texts: Iterable[str], batch_size: int = None,
+                                   n_process: int = None, compact: bool = False) -> list:
+        """This function takes a list of text strings and extract bangla person names from
+        all of them using batched inference.
+
+        Args:
+            texts (Iterable[str]): texts on which we want to perform name extraction
+            batch_size (int, optional): number of texts in each model batch. Defaults to None (self.batch_size).
+            n_process (int, optional): number of processes used for inference. Defaults to None (self.n_process).
+            compact (bool, optional): If set True returns ExtractionResult objects instead of
+                dictionaries. Defaults to False.
+
+        Returns:
+            list: list of dictionaries in same format as returned by extract_person_name,
+                one for each text in input order
+        """
+        # collect all results from the streaming version
+        return list(self.extract_person_names_stream(texts, batch_size=batch_size, n_process=n_process, compact=compact))
+
+    def cache_stats(self) -> dict:
+        """This function returns statistics of the result cache.
+
+        Returns:
+            dict: dictionary in format returned by LRUCache.stats, or None if cache is disabled
+        """
+        return self._cache.stats() if self._cache is not None else None
+
+    @staticmethod
+    def _entities_from_doc(doc: object) -> tuple:
+        """This function extracts entities from a predicted Doc object as immutable tuple,
+        so that it can be cached and shared safely.
+
+        Args:
+            doc (object): Spacy.tokens.Doc object
+
+        Returns:
+            tuple: tuple of (entity_text, entity_label, entity_start, entity_end,
+                entity_start_char, entity_end_char) tuples
+        """
+        return tuple(
+            (entity.text, entity.label_, entity.start, entity.end, entity.start_char, entity.end_char)
+            for entity in doc.ents
+        )
+
+    @staticmethod
+    def _make_result(text: str, entities: tuple, compact: bool = False) -> dict:
+        """This function builds result dictionary from extracted entities.
+
+        Args:
+            text (str): text on which prediction was done
+            entities (tuple): entities in format returned by _entities_from_doc
+            compact (bool, optional): If set True returns an ExtractionResult object instead of
+                dictionary. Defaults to False.
+
+        Returns:
+            dict: dictionary in format described in extract_person_name
+        """
+        # build compact result if asked
+        if compact:
+            return ExtractionResult.from_entities(text, entities)
         # initialize variable to store and return outputs
         result = {
         "sentence" : text,
         "extracted_names" : []
         }
-        # get prediction on text
-        doc = self.get_doc(text)
-        
         # if no name found then add "no name is found" as extracted names and return
-        if not doc.ents:
-            result["extracted_names"] = "কোন নাম খুঁজে পাওয়া যায় নি/No name is found"
+        if not entities:
+            result["extracted_names"] = NO_NAME_FOUND
             return result
 
         # iterate over each entity and append entity details to extracted names
-        for entity in doc.ents:
+        for name, label, start, end, _, _ in entities:
             result["extracted_names"].append(
                 {
-                    "name": entity.text, 
-                    "label": entity.label_,
-                    "start": entity.start,
-                    "end": entity.end
+                    "name": name, 
+                    "label": label,
+                    "start": start,
+                    "end": end
                 }
             )
         # return the result
         return result
 
+def run_bulk_extraction(bp_ner: BanglaPersorNer, input_path: str, output_path: str = "",
+                        input_format: str = "text", text_key: str = "text",
+                        batch_size: int = None, n_process: int = None,
+                        checkpoint_path: str = "", checkpoint_every: int = cfg.BULK_CHECKPOINT_EVERY,
+                        compact: bool = False) -> int:
+    """This function extracts person names from every line of a corpus and writes results as
+    json lines incrementally. Corpus is streamed through batched inference, so memory usage does
+    not depend on corpus size. If checkpoint path is provided, progress is saved after every
+    checkpoint_every lines and a restarted job resumes from the last saved position.
+
+    Args:
+        bp_ner (BanglaPersorNer): object used for name extraction
+        input_path (str): path of the corpus file or "-" for stdin
+        output_path (str, optional): path of the output jsonl file. If empty, results are
+            printed to terminal. Defaults to "".
+        input_format (str, optional): "text" or "jsonl". Defaults to "text".
+        text_key (str, optional): key of the text in jsonl objects. Defaults to "text".
+        batch_size (int, optional): number of texts in each model batch. Defaults to None (bp_ner.batch_size).
+        n_process (int, optional): number of processes used for inference. Defaults to None (bp_ner.n_process).
+        checkpoint_path (str, optional): path of the checkpoint file, output path must be a regular
+            file to use it. Defaults to "".
+        checkpoint_every (int, optional): number of lines between checkpoints. Defaults to cfg.BULK_CHECKPOINT_EVERY.
+        compact (bool, optional): If set True writes compact records (see ExtractionResult.to_record)
+            instead of result dictionaries. Defaults to False.
+
+    Raises:
+        ValueError: if checkpoint path is provided but output is not a regular file
+
+    Returns:
+        int: number of lines processed in this run
+    """
+    # checkpoint records a position in output file, so output can not be stdout (or, a pipe)
+    if checkpoint_path and not _is_regular_file_path(output_path):
+        raise ValueError("Checkpoint needs output path of a regular file, output can not be stdout or a pipe.")
+    # read checkpoint to find where to resume from
+    checkpoint = read_checkpoint(checkpoint_path)
+    # open output, drop anything written after the last checkpoint so that no result is duplicated
+    if output_path:
+        os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+        output = open(output_path, "ab")
+        output.truncate(checkpoint["output_offset"])
+        output.seek(checkpoint["output_offset"])
+    else:
+        output = sys.stdout.buffer
+    # sizes (in bytes) and numbers of lines of texts sent to the model but not written yet
+    line_sizes = deque()
+    # number of lines processed in this run
+    n_processed = 0
+    with open_corpus(input_path) as corpus:
+        # move to the checkpointed position
+        skip_corpus_lines(corpus, checkpoint["lines"], checkpoint["input_offset"])
+
+        def texts_gen() -> Iterator[str]:
+            # yield texts and remember line sizes to update checkpoint when results are written
+            for text, line_size, n_lines in iter_corpus_texts(corpus, input_format=input_format, text_key=text_key):
+                line_sizes.append((line_size, n_lines))
+                yield text
+
+        # get results in input order
+        for res in bp_ner.extract_person_names_stream(texts_gen(), batch_size=batch_size, n_process=n_process, compact=compact):
+            # write result as a json line
+            output.write(dumps_jsonl_line(res.to_record() if compact else res))
+            # update progress
+            n_processed += 1
+            line_size, n_lines = line_sizes.popleft()
+            checkpoint["lines"] += n_lines
+            checkpoint["input_offset"] += line_size
+            # save checkpoint periodically
+            if checkpoint_path and n_processed % checkpoint_every == 0:
+                _save_bulk_checkpoint(output, checkpoint, checkpoint_path)
+    # save final checkpoint
+    if checkpoint_path:
+        _save_bulk_checkpoint(output, checkpoint, checkpoint_path)
+    # close output file
+    if output_path:
+        output.close()
+    else:
+        output.flush()
+    # return number of processed lines
+    return n_processed
+
+def _is_regular_file_path(path: str) -> bool:
+    """This function checks whether a path is (or, can be created as) a regular file, i.e. not
+    empty (stdout), a pipe or a device.
+
+    Args:
+        path (str): path of the file
+
+    Returns:
+        bool: True if path is a regular file or does not exist yet
+    """
+    return bool(path) and (not os.path.exists(path) or os.path.isfile(path))
+
+def _save_bulk_checkpoint(output: object, checkpoint: dict, checkpoint_path: str) -> None:
+    """This function makes sure written results are on disk and then saves the checkpoint.
+
+    Args:
+        output (object): binary file object of the output
+        checkpoint (dict): checkpoint in format returned by read_checkpoint
+        checkpoint_path (str): path of the checkpoint file
+    """
+    # flush results to disk before checkpoint points after them
+    output.flush()
+    os.fsync(output.fileno())
+    # record output position and save checkpoint
+    checkpoint["output_offset"] = output.tell()
+    write_checkpoint(checkpoint_path, checkpoint)
+
 def main() -> None:
     """This function is called if the script is called directly. It takes user input
-    from terminal and prints output to either terminal or file.
+    from terminal and prints output to either terminal or file. In bulk mode it reads
+    a corpus from file (or, stdin) and writes results as json lines.
     """
     # create argument parser
     parser = argparse.ArgumentParser(description='Predict bangla names in given text.')
+    # input is either a string or a corpus file
+    input_group = parser.add_mutually_exclusive_group(required=True)
     # add argument for input to argrument parser
-    parser.add_argument(
-        '-i', '--input', required=True, type=str, help='input string - bangla text to predict names.')
+    input_group.add_argument(
+        '-i', '--input', type=str, help='input string - bangla text to predict names.')
+    # add argument for corpus input to argrument parser
+    input_group.add_argument(
+        '-f', '--input-file', type=str, help='input corpus path (or, "-" for stdin) - one text per line. enables bulk mode.')
     # add argument for output to argrument parser
     parser.add_argument(
-        '-o', '--output', required=False, type=str, help='output json path - path of a json file to write the output.')
+        '-o', '--output', required=False, type=str, help='output json path - path of a json file (jsonl file in bulk mode) to write the output.')
+    # add arguments for bulk mode to argrument parser
+    parser.add_argument(
+        '--input-format', choices=["text", "jsonl"], default="text", help='bulk mode - format of the input corpus.')
+    parser.add_argument(
+        '--text-key', type=str, default="text", help='bulk mode - key of the text in jsonl input.')
+    parser.add_argument(
+        '--batch-size', type=int, default=None, help='bulk mode - number of texts in each model batch. defaults to tuned (or, configured) value.')
+    parser.add_argument(
+        '--n-process', type=int, default=None, help='bulk mode - number of worker processes for inference. defaults to tuned (or, configured) value.')
+    parser.add_argument(
+        '--engine', choices=ENGINES, default=cfg.ENGINE, help='inference engine.')
+    parser.add_argument(
+        '--model-dir', type=str, default=cfg.MODEL_DIR, help='directory of the model, i.e. distilled student model.')
+    parser.add_argument(
+        '--name-gate', action='store_true', help='skip the model for texts without any name cue (see utils.name_gate).')
+    parser.add_argument(
+        '--lean', action='store_true', help='drop transformer activations from Docs right after prediction.')
+    parser.add_argument(
+        '--schedule', action='store_true', help='bulk mode - batch texts of similar length under a token budget (see utils.batching).')
+    parser.add_argument(
+        '--checkpoint', type=str, default="", help='bulk mode - checkpoint path. defaults to output path with ".ckpt" suffix.')
+    parser.add_argument(
+        '--compact', action='store_true', help='bulk mode - write compact records with parallel lists of names and offsets.')
+    parser.add_argument(
+        '--checkpoint-every', type=int, default=cfg.BULK_CHECKPOINT_EVERY, help='bulk mode - number of lines between checkpoints.')
     # parse arguments
     args = parser.parse_args()
     # create an object of BanglaPersorNer
-    bp_ner = BanglaPersorNer()
+    bp_ner = BanglaPersorNer(
+        engine=args.engine, model_dir=args.model_dir, lean=args.lean, name_gate=NameGate.from_lexicon_file() if args.name_gate else None,
+        scheduler=LengthBucketScheduler() if args.schedule else None)
+    # run bulk mode if corpus is provided
+    if args.input_file:
+        # checkpoint only makes sense if output is written to a regular file
+        if args.checkpoint and not _is_regular_file_path(args.output):
+            parser.error("--checkpoint requires -o/--output to be a regular file, not stdout or a pipe.")
+        checkpoint_path = args.checkpoint or (args.output + ".ckpt" if _is_regular_file_path(args.output) else "")
+        n_processed = run_bulk_extraction(
+            bp_ner, args.input_file, output_path=args.output, input_format=args.input_format,
+            text_key=args.text_key, batch_size=args.batch_size, n_process=args.n_process,
+            checkpoint_path=checkpoint_path, checkpoint_every=args.checkpoint_every, compact=args.compact)
+        print(f"Processed {n_processed} lines.", file=sys.stderr)
+        return
     # extract names from argument input
     res = bp_ner.extract_person_name(args.input)
     # if there is output argument then write the output to 
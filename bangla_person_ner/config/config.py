@@ -13,15 +13,45 @@ SKIP_PUNC = [".",]
 # raw data related directory and file names
 RAW_DATA1_FILE_PATH = os.path.join(_module_path,"dataset/data1_raw.txt")
 RAW_DATA2_FILE_PATH = os.path.join(_module_path,"dataset/data2_raw.jsonl")
+# urls of raw data. data_1 is split into numbered text files (1.txt ... 20.txt)
+DATA1_BASE_URL = "https://raw.githubusercontent.com/Rifat1493/Bengali-NER/master/annotated%20data/"
+DATA1_N_FILES = 20
+DATA2_URL = "https://raw.githubusercontent.com/banglakit/bengali-ner-data/master/main.jsonl"
+# directory of (partially) downloaded files, downloads resume from here and it is removed when raw data is written
+DOWNLOAD_DIR = os.path.join(_module_path,"dataset/downloads")
+# number of files downloaded at once (and, size of connection pool)
+DOWNLOAD_N_WORKERS = 4
+# seconds to wait for connection and for each read
+DOWNLOAD_TIMEOUT = 30
+# number of retries of a failed request (connection error, cut off response or temporary error status),
+# waiting DOWNLOAD_BACKOFF * 2**retry seconds in between
+DOWNLOAD_RETRIES = 5
+DOWNLOAD_BACKOFF = 0.5
 
 # processesed data related directory and file names
 PROCESSESED_DATA1_PATH = os.path.join(_module_path,"dataset/data1_processed.json")
 PROCESSESED_DATA2_PATH = os.path.join(_module_path,"dataset/data2_processed.json")
+# processed data in compact format, interned token and tag ids in memory mapped arrays (see utils.compact_data)
+PROCESSED_DATA1_DIR = os.path.join(_module_path,"dataset/data1_processed")
+PROCESSED_DATA2_DIR = os.path.join(_module_path,"dataset/data2_processed")
+# format of saved processed data, "compact" or "json". json is always available as an export option.
+PROCESSED_DATA_FORMAT = "compact"
+# number of characters read at a time when raw text data is streamed
+STREAM_CHUNK_SIZE = 1 << 16
+# number of worker processes used for raw data processing. 1 processes data in the main process.
+PREPROCESS_N_WORKERS = 1
+# number of sentences (or, lines) sent to a worker at once
+PREPROCESS_CHUNK_SIZE = 1000
 
 # final training, validation data paths
 TRAIN_DATA_PATH = os.path.join(_module_path,"dataset/train.spacy")
 VALID_DATA_PATH = os.path.join(_module_path,"dataset/valid.spacy")
 TEST_DATA_PATH = os.path.join(_module_path,"dataset/test.spacy")
+# manifest of data preparation stages, records hashes of inputs and outputs of each stage (see utils.manifest)
+MANIFEST_PATH = os.path.join(_module_path,"dataset/manifest.json")
+# spacy training config and output directory of training (model-best and model-last are saved in it)
+SPACY_CONFIG_PATH = os.path.join(_module_path,"config/spacy_config.cfg")
+TRAIN_OUTPUT_DIR = os.path.join(_module_path,"models")
 
 # training data split percentage as float
 # percentage of test+validation data w.r.t. total data
@@ -31,5 +61,103 @@ TEST_PERCENTAGE = 0.50 # 50% of test+validation data, which is 10% of total data
 
 # model directory
 MODEL_DIR = os.path.join(_module_path,"models/model-best")
+# snapshot of a model is saved next to its directory with this suffix (see utils.snapshot)
+MODEL_SNAPSHOT_SUFFIX = ".snapshot"
+# If True models are loaded from their snapshot when it is up to date, weights are memory mapped and shared by workers
+USE_MODEL_SNAPSHOT = True
 # public url of model
-MODEL_URL = "https://drive.google.com/drive/folders/1zJfAVSItJVkHt-ttGgB383VrXeBasAHX"
\ No newline at end of file
+MODEL_URL = "https://drive.google.com/drive/folders/1zJfAVSItJVkHt-ttGgB383VrXeBasAHX"
+
+# default number of texts sent to the model at once in batched inference
+BATCH_SIZE = 32
+# default number of processes used for batched inference
+N_PROCESS = 1
+# number of lines processed between two checkpoints in bulk extraction
+BULK_CHECKPOINT_EVERY = 1000
+
+# maximum number of results kept in result cache of BanglaPersorNer. 0 disables the cache.
+CACHE_SIZE = 0
+# seconds after which a cached result expires. None means results never expire.
+CACHE_TTL = None
+# number of texts read at once by cached (or, scheduled) batch extraction. duplicate texts in a chunk are inferenced once.
+CACHE_CHUNK_SIZE = 1024
+
+# text used to run a dummy batch when warming up the model
+WARMUP_TEXT = "মো. আলমের কাছ থেকে ১৫ লাখ টাকা আদায় করা হয়।"
+
+# maximum number of characters in a window of long document inference
+LONG_DOC_WINDOW_CHARS = 600
+# number of sentences shared by consecutive windows of long document inference
+LONG_DOC_OVERLAP_SENTENCES = 1
+
+# inference server settings
+SERVER_HOST = "0.0.0.0"
+SERVER_PORT = 8000
+# maximum number of texts in a micro-batch
+SERVER_MAX_BATCH_SIZE = 32
+# maximum milliseconds a request waits for a micro-batch to fill
+SERVER_MAX_WAIT_MS = 5
+# maximum number of waiting texts, new requests get 503 when their texts do not fit in the queue
+# (413 if a request alone has more texts)
+SERVER_MAX_QUEUE_SIZE = 1024
+# maximum size of a request body in bytes
+SERVER_MAX_BODY_BYTES = 1024 * 1024
+
+# inference engine of BanglaPersorNer, one of "spacy", "int8", "onnx", "onnx-int8", "gazetteer"
+# (see utils.engines.ENGINES)
+ENGINE = "spacy"
+# path of the transformer exported to onnx (int8 model is saved with ".int8.onnx" suffix)
+ONNX_MODEL_PATH = os.path.join(_module_path,"models/onnx/transformer.onnx")
+
+# path of name lexicon built from PERSON entities of processed data
+NAME_LEXICON_PATH = os.path.join(_module_path,"dataset/name_lexicon.txt")
+# tokens shorter than this are not added to name lexicon
+LEXICON_MIN_TOKEN_LENGTH = 2
+# honorific tokens which usually come with a name, used by name gate
+GATE_HONORIFIC_CUES = ["মো.", "মোঃ", "মোহাম্মদ", "মুহাম্মদ", "ডা.", "ডাঃ", "ড.", "জনাব", "বেগম", "শ্রী", "শ্রীমতী",
+                       "মিসেস", "মিস্টার", "মি.", "অধ্যাপক", "প্রফেসর", "মাওলানা", "হাজী", "আলহাজ্ব", "শেখ", "সৈয়দ"]
+# common suffixes removed from tokens before name lexicon lookup
+GATE_NAME_SUFFIXES = ["ের", "র", "কে", "েরা", "রা", "দের", "ও", "ই"]
+
+# path of name gazetteer (token lists of known names) used by "gazetteer" engine
+GAZETTEER_PATH = os.path.join(_module_path,"dataset/name_gazetteer.jsonl")
+
+# knowledge distillation related paths
+# unlabeled bangla text (one text per line) which is labeled by the transformer teacher
+DISTILL_UNLABELED_PATH = os.path.join(_module_path,"dataset/unlabeled.txt")
+# training, validation data labeled by the teacher
+DISTILL_TRAIN_DATA_PATH = os.path.join(_module_path,"dataset/distill_train.spacy")
+DISTILL_VALID_DATA_PATH = os.path.join(_module_path,"dataset/distill_valid.spacy")
+# training config of small CNN student model
+STUDENT_CONFIG_PATH = os.path.join(_module_path,"config/student_config.cfg")
+# student model directory
+STUDENT_MODEL_DIR = os.path.join(_module_path,"models/student/model-best")
+
+# length bucketed batch scheduling (see utils.batching)
+# token budget of a padded batch (number of texts * longest text in wordpieces)
+SCHEDULER_MAX_TOKENS = 4096
+# maximum number of texts in a scheduled batch
+SCHEDULER_MAX_BATCH_SIZE = 128
+# average number of characters in a wordpiece, used to estimate length of a text
+CHARS_PER_WORDPIECE = 4
+
+# upper bounds (seconds) of latency histogram buckets of inference metrics (see utils.metrics)
+METRICS_LATENCY_BUCKETS = [0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+# upper bounds (characters) of input length histogram buckets of inference metrics
+METRICS_LENGTH_BUCKETS = [16, 32, 64, 128, 256, 512, 1024, 2048, 4096]
+
+# lean mode drops activations from Docs right after prediction (see utils.engines.add_doc_cleaner)
+LEAN_MODE = False
+# Doc attributes reset by lean mode, transformer output is "_.trf_data"
+LEAN_CLEANED_ATTRS = {"tensor": None, "_.trf_data": None}
+
+# settings (batch size, number of processes, torch threads) saved by autotune, read at startup if exists
+TUNED_CONFIG_PATH = os.path.join(_module_path,"models/tuned_config.json")
+# grids searched by autotune
+AUTOTUNE_BATCH_SIZES = [8, 16, 32, 64, 128]
+AUTOTUNE_N_PROCESSES = [1, 2, 4]
+
+# name of BasicTokenizer in spacy registry, used in training configs (see utils.spacy_tokenizer)
+SPACY_TOKENIZER_NAME = "bangla_person_ner.BasicTokenizer.v1"
+# If True loaded models tokenize with BasicTokenizer (same tokens as training data) instead of spacy tokenizer
+USE_BASIC_TOKENIZER = True
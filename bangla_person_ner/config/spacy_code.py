@@ -0,0 +1,3 @@
+# custom functions referenced from training configs, passed to spacy commands with
+# "--code bangla_person_ner/config/spacy_code.py" (run from the project directory)
+import bangla_person_ner.utils.spacy_tokenizer
@@ -0,0 +1,108 @@
+import os
+import argparse
+from typing import Iterable, Iterator
+from ..config import config as cfg
+
+def iter_unlabeled_texts(data_path: str = cfg.DISTILL_UNLABELED_PATH) -> Iterator[str]:
+    """This function yields non empty lines of an unlabeled text file.
+
+    Args:
+        data_path (str, optional): path of text file, one text per line. Defaults to cfg.DISTILL_UNLABELED_PATH.
+
+    Yields:
+        Iterator[str]: text
+    """
+    with open(data_path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield line
+
+def iter_unannotated_docs(nlp: object, data_path: str) -> Iterator[object]:
+    """This function yields Docs of spacy binary data without their annotations, so that
+    they can be labeled again keeping tokenization of the data.
+
+    Args:
+        nlp (object): Spacy Language object, its vocab is used to create Docs
+        data_path (str): path of spacy binary data, i.e. cfg.TRAIN_DATA_PATH
+
+    Yields:
+        Iterator[object]: Spacy.tokens.Doc object
+    """
+    from spacy.tokens import Doc, DocBin
+    for doc in DocBin().from_disk(data_path).get_docs(nlp.vocab):
+        yield Doc(nlp.vocab, words=[token.text for token in doc], spaces=[bool(token.whitespace_) for token in doc])
+
+def label_with_teacher(teacher: object, inputs: Iterable, batch_size: int = cfg.BATCH_SIZE) -> Iterator[object]:
+    """This function labels texts (or, unannotated Docs) with entities predicted by the teacher.
+
+    Args:
+        teacher (object): Spacy Language object of the teacher model
+        inputs (Iterable): texts or Spacy.tokens.Doc objects
+        batch_size (int, optional): number of inputs in each batch. Defaults to cfg.BATCH_SIZE.
+
+    Yields:
+        Iterator[object]: Spacy.tokens.Doc object with entities of the teacher
+    """
+    yield from teacher.pipe(inputs, batch_size=batch_size)
+
+def save_docs(docs: Iterable, save_path: str) -> int:
+    """This function saves Docs with their entities as spacy binary data.
+
+    Args:
+        docs (Iterable): Spacy.tokens.Doc objects
+        save_path (str): path where the binary file will be saved
+
+    Returns:
+        int: number of saved Docs
+    """
+    from spacy.tokens import DocBin
+    # keep only tokens and entities, transformer output is not needed by the student
+    db = DocBin(attrs=["ENT_IOB", "ENT_TYPE"])
+    for doc in docs:
+        db.add(doc)
+    # create directories and write spacy binary data to file
+    os.makedirs(os.path.dirname(save_path), exist_ok=True)
+    db.to_disk(save_path)
+    return len(db)
+
+def build_distillation_data(teacher_dir: str = cfg.MODEL_DIR, unlabeled_path: str = cfg.DISTILL_UNLABELED_PATH,
+                            batch_size: int = cfg.BATCH_SIZE) -> tuple:
+    """This function labels unlabeled texts and train data with the teacher as student train data,
+    and validation data as student validation data.
+
+    Args:
+        teacher_dir (str, optional): directory of the teacher model. Defaults to cfg.MODEL_DIR.
+        unlabeled_path (str, optional): path of unlabeled text file. It is skipped if the file
+            does not exist. Defaults to cfg.DISTILL_UNLABELED_PATH.
+        batch_size (int, optional): number of texts in each batch. Defaults to cfg.BATCH_SIZE.
+
+    Returns:
+        tuple: number of saved train and validation Docs
+    """
+    from itertools import chain
+    from ..utils.engines import load_model
+    # teacher tokenizes unlabeled texts with BasicTokenizer, like train data
+    teacher = load_model(model_dir=teacher_dir)
+    # train data of the student : train data (keeping its tokenization) and unlabeled texts
+    train_inputs = iter_unannotated_docs(teacher, cfg.TRAIN_DATA_PATH)
+    if os.path.exists(unlabeled_path):
+        train_inputs = chain(train_inputs, iter_unlabeled_texts(unlabeled_path))
+    n_train = save_docs(label_with_teacher(teacher, train_inputs, batch_size), cfg.DISTILL_TRAIN_DATA_PATH)
+    # validation data of the student
+    valid_inputs = iter_unannotated_docs(teacher, cfg.VALID_DATA_PATH)
+    n_valid = save_docs(label_with_teacher(teacher, valid_inputs, batch_size), cfg.DISTILL_VALID_DATA_PATH)
+    return n_train, n_valid
+
+if __name__ == "__main__":
+    # create argument parser
+    parser = argparse.ArgumentParser(description='Label data with the transformer teacher for training the student model.')
+    parser.add_argument('-t', '--teacher', type=str, default=cfg.MODEL_DIR, help='directory of the teacher model.')
+    parser.add_argument('-u', '--unlabeled', type=str, default=cfg.DISTILL_UNLABELED_PATH, help='unlabeled text file, one text per line.')
+    parser.add_argument('-b', '--batch-size', type=int, default=cfg.BATCH_SIZE, help='number of texts in each batch.')
+    # parse arguments
+    args = parser.parse_args()
+    # label and save data
+    n_train, n_valid = build_distillation_data(args.teacher, args.unlabeled, args.batch_size)
+    print(f"Saved {n_train} train docs at : {cfg.DISTILL_TRAIN_DATA_PATH}")
+    print(f"Saved {n_valid} validation docs at : {cfg.DISTILL_VALID_DATA_PATH}")
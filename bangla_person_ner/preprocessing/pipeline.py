@@ -0,0 +1,94 @@
+import os
+import argparse
+from . import raw_data_processing, train_data_processing, tag_arrays
+from ..utils import tokenizer, spacy_tokenizer, compact_data, parallel
+from ..utils.compact_data import save_compact_data, load_processed_data, processed_data_paths
+from ..utils.manifest import StageManifest, code_version
+from ..config import config as cfg
+
+# stages of data preparation in order, "train" is only run when asked
+STAGES = ("download", "process_data_1", "process_data_2", "split_and_convert", "train")
+
+def run_pipeline(force: list = (), train: bool = False, n_workers: int = cfg.PREPROCESS_N_WORKERS,
+                 config_path: str = cfg.SPACY_CONFIG_PATH, gpu_id: int = -1,
+                 manifest_path: str = cfg.MANIFEST_PATH, data_format: str = cfg.PROCESSED_DATA_FORMAT) -> list:
+    """This function runs data preparation stages which are not up to date. A stage is skipped
+    if its input files, config values and code did not change since its last run and its outputs
+    are unchanged, i.e. changing split percentages does not process raw data again.
+
+    Args:
+        force (list, optional): names of stages to run even if they are up to date. Defaults to ().
+        train (bool, optional): If set True also trains the model with spacy. Defaults to False.
+        n_workers (int, optional): number of worker processes for raw data processing. Defaults to cfg.PREPROCESS_N_WORKERS.
+        config_path (str, optional): spacy training config. Defaults to cfg.SPACY_CONFIG_PATH.
+        gpu_id (int, optional): gpu used for training, -1 for cpu. Defaults to -1.
+        manifest_path (str, optional): path of the manifest. Defaults to cfg.MANIFEST_PATH.
+        data_format (str, optional): format of processed data, "compact" or "json". Defaults to cfg.PROCESSED_DATA_FORMAT.
+
+    Returns:
+        list: names of stages which were run
+    """
+    manifest = StageManifest(manifest_path)
+    ran = []
+    # raw files are only downloaded if missing, so download has no inputs to compare
+    if not os.path.exists(cfg.RAW_DATA1_FILE_PATH) or not os.path.exists(cfg.RAW_DATA2_FILE_PATH) or "download" in force:
+        # downloader is imported only when needed as it pulls in network libraries
+        from ..utils.downloader import download_data
+        print("Stage download : running")
+        download_data(missing_only="download" not in force)
+        ran.append("download")
+    # each raw data is processed separately, so a change in one does not process the other
+    processing_params = {"TAGS_TO_KEEP": cfg.TAGS_TO_KEEP, "SKIP_PUNC": cfg.SKIP_PUNC, "format": data_format}
+    # code of the stage is raw_data_processing and every module its output goes through
+    processing_code = code_version(raw_data_processing, tag_arrays, parallel, tokenizer, compact_data)
+    save_data = save_compact_data if data_format == "compact" else raw_data_processing.save_processed_data
+    processed_path_1, processed_path_2 = processed_data_paths(data_format)
+    processing_stages = (
+        ("process_data_1", cfg.RAW_DATA1_FILE_PATH, processed_path_1, raw_data_processing.iter_text_data),
+        ("process_data_2", cfg.RAW_DATA2_FILE_PATH, processed_path_2, raw_data_processing.iter_jsonl_data),
+    )
+    for stage, raw_path, processed_path, iter_data in processing_stages:
+        def process(raw_path=raw_path, processed_path=processed_path, iter_data=iter_data):
+            save_data(iter_data(raw_path, n_workers), processed_path)
+        if manifest.run_stage(stage, process, [raw_path], [processed_path], processing_params, processing_code,
+                              force=stage in force):
+            ran.append(stage)
+    # split and convert processed data to spacy binary format
+    split_params = {"TEST_VAL_PERCENTAGE": cfg.TEST_VAL_PERCENTAGE, "TEST_PERCENTAGE": cfg.TEST_PERCENTAGE}
+    split_code = code_version(train_data_processing, spacy_tokenizer, tokenizer, compact_data)
+    def split_and_convert():
+        data = (load_processed_data(processed_path_1), load_processed_data(processed_path_2))
+        train_data_processing.split_and_convert_data(data=data)
+    if manifest.run_stage(
+            "split_and_convert", split_and_convert, [processed_path_1, processed_path_2],
+            [cfg.TRAIN_DATA_PATH, cfg.VALID_DATA_PATH, cfg.TEST_DATA_PATH], split_params, split_code,
+            force="split_and_convert" in force):
+        ran.append("split_and_convert")
+    # train the model with spacy
+    if train:
+        import spacy
+        from spacy.cli.train import train as spacy_train
+        train_params = {"gpu_id": gpu_id, "spacy_version": spacy.__version__}
+        def train_model():
+            spacy_train(config_path, cfg.TRAIN_OUTPUT_DIR, use_gpu=gpu_id,
+                        overrides={"paths.train": cfg.TRAIN_DATA_PATH, "paths.dev": cfg.VALID_DATA_PATH})
+        model_dirs = [os.path.join(cfg.TRAIN_OUTPUT_DIR, "model-best"), os.path.join(cfg.TRAIN_OUTPUT_DIR, "model-last")]
+        if manifest.run_stage(
+                "train", train_model, [config_path, cfg.TRAIN_DATA_PATH, cfg.VALID_DATA_PATH], model_dirs,
+                train_params, code_version(spacy_tokenizer, tokenizer), force="train" in force):
+            ran.append("train")
+    return ran
+
+if __name__ == "__main__":
+    # create argument parser
+    parser = argparse.ArgumentParser(description='Prepare data (and, train the model), skipping stages which are up to date.')
+    parser.add_argument('--force', nargs='+', choices=STAGES, default=[], help='stages to run even if they are up to date.')
+    parser.add_argument('--train', action='store_true', help='also train the model with spacy.')
+    parser.add_argument('-w', '--n-workers', type=int, default=cfg.PREPROCESS_N_WORKERS, help='number of worker processes for raw data processing.')
+    parser.add_argument('--config', type=str, default=cfg.SPACY_CONFIG_PATH, help='spacy training config.')
+    parser.add_argument('--gpu-id', type=int, default=-1, help='gpu used for training, -1 for cpu.')
+    parser.add_argument('--format', choices=["compact", "json"], default=cfg.PROCESSED_DATA_FORMAT, help='format of processed data.')
+    # parse arguments
+    args = parser.parse_args()
+    ran = run_pipeline(args.force, args.train, args.n_workers, args.config, args.gpu_id, data_format=args.format)
+    print(f"\nStages run : {', '.join(ran) if ran else 'none, everything is up to date'}")
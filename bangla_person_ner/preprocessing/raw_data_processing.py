@@ -1,9 +1,13 @@
 import os
 import re
 import json
-from spacy.training.iob_utils import iob_to_biluo
-from ..utils.downloader import download_data 
+import shutil
+import argparse
+import tempfile
+from typing import Iterable, Iterator
 from ..utils.tokenizer import BasicTokenizer
+from ..utils.parallel import map_chunks
+from .tag_arrays import encode_tags, decode_tags, filter_tags, iob_to_biluo_ids, single_tag_mask
 from ..config import config as cfg
 
 # initialize a tokenizer object
@@ -23,6 +27,85 @@ def _write_json(json_data: json, json_save_path: str):
         # write json data to file
         f.write(json.dumps(json_data, ensure_ascii=False, indent=4))
 
+def _iter_blocks(f: object, separator: str = "\n\n", chunk_size: int = cfg.STREAM_CHUNK_SIZE) -> Iterator[str]:
+    """This function reads a file in chunks and yields blocks separated by separator, same
+    blocks as f.read().split(separator) without reading the whole file.
+
+    Args:
+        f (object): file object opened in text mode
+        separator (str, optional): separator of blocks. Defaults to "\n\n".
+        chunk_size (int, optional): number of characters read at a time. Defaults to cfg.STREAM_CHUNK_SIZE.
+
+    Yields:
+        Iterator[str]: block of text
+    """
+    # text after the last separator found so far
+    buffer = ""
+    for chunk in iter(lambda: f.read(chunk_size), ""):
+        buffer += chunk
+        blocks = buffer.split(separator)
+        # last block may continue in next chunk
+        buffer = blocks.pop()
+        yield from blocks
+    yield buffer
+
+def _data_key(tags: list) -> str:
+    """This function returns key of processed data a sentence belongs to.
+
+    Args:
+        tags (list): tags of the sentence
+
+    Returns:
+        str: "no_person" if sentence has only one type of tag, "person" otherwise
+    """
+    return "no_person" if len(set(tags))==1 else "person"
+
+def save_processed_data(processed_dicts: Iterable[dict], json_save_path: str) -> dict:
+    """This function streams processed sentences to a json file, which is byte for byte same as
+    _write_json of processed data dictionary. Sentences of each key are first written to a
+    temporary file next to the json file, so memory use does not depend on size of the data.
+
+    Args:
+        processed_dicts (Iterable[dict]): processed sentences, dictionaries with "tokens" and "tags"
+        json_save_path (str): path to save json data
+
+    Returns:
+        dict: number of sentences of each key ("person" and "no_person")
+    """
+    # create folders if not exists
+    save_dir = os.path.dirname(json_save_path)
+    os.makedirs(save_dir, exist_ok=True)
+    keys = ("person", "no_person")
+    counts = dict.fromkeys(keys, 0)
+    # same encoder settings as _write_json
+    encoder = json.JSONEncoder(ensure_ascii=False, indent=4)
+    with tempfile.TemporaryDirectory(dir=save_dir) as tmp_dir:
+        buckets = {key: open(os.path.join(tmp_dir, key), "w+", encoding="utf-8") for key in keys}
+        try:
+            # write each sentence to its bucket, indented as an item of a list of a json object
+            for processed_dict in processed_dicts:
+                key = _data_key(processed_dict["tags"])
+                item = encoder.encode(processed_dict).replace("\n", "\n" + " "*8)
+                buckets[key].write((",\n" if counts[key] else "") + " "*8 + item)
+                counts[key] += 1
+            # join buckets into the json object
+            with open(json_save_path, "w", encoding="utf-8") as f:
+                f.write("{")
+                for i, key in enumerate(keys):
+                    f.write(("," if i else "") + f'\n    "{key}": ')
+                    if not counts[key]:
+                        f.write("[]")
+                        continue
+                    f.write("[\n")
+                    buckets[key].seek(0)
+                    shutil.copyfileobj(buckets[key], f)
+                    f.write("\n    ]")
+                f.write("\n}")
+        finally:
+            for bucket in buckets.values():
+                bucket.close()
+    return counts
+
 def _remove_unwanted_tags(tags: list) -> list:
     """Removed tags which are not required for this project.
 
@@ -78,24 +161,24 @@ def _handle_dot_and_minus_text(tokens: list, tags: list) -> tuple:
     # return new tokens and new tags
     return (new_tokens, new_tags)
 
-def _print_data_processing_summary(processed_data: dict, data_name: str):
+def _print_data_processing_summary(counts: dict, data_name: str):
     """This function prints summary of data proccessing.
 
     Args:
-        processed_data (dict): dictionary of processed data
+        counts (dict): number of sentences of each key of processed data
         data_name (str): Name of data set.
     """
     print("\nData summary: ", data_name)
     print("-"*30)
-    print(f"Total sentence : {len(processed_data['no_person']) + len(processed_data['person'])}")
-    print(f"Sentence with person tag: {len(processed_data['person'])}")
-    print(f"Sentence without person tag: {len(processed_data['no_person'])}")
+    print(f"Total sentence : {counts['no_person'] + counts['person']}")
+    print(f"Sentence with person tag: {counts['person']}")
+    print(f"Sentence without person tag: {counts['no_person']}")
 
 def _clean_jsonl(text: str) -> str:
     """This function cleans data and places placeholders for non-breaking-space and "..."
 
     Args:
-        text (str): whole jsonl file as string
+        text (str): a line (or, whole) of jsonl file as string
 
     Returns:
         str: text after cleaning
@@ -139,13 +222,216 @@ def _handle_nbsp_and_replacement_jsonl(tokens: list, tags: list) -> tuple:
     # return new tokens and tags
     return (new_tokens, new_tags)
 
-def process_text_data(data_path: str, print_summary: bool = True, save_path: str = "") -> dict:
-    """This function does all processing necessary for text data.
+def _parse_tagged_sentence(tagged_sentence: str) -> tuple:
+    """This function seperates tokens and tags of a sentence of text data.
+
+    Args:
+        tagged_sentence (str): block of text data, one token and tag per line
+
+    Returns:
+        tuple: tuple of token list and tag list, None if sentence is empty
+    """
+    # if sentence is empty skip
+    if not tagged_sentence:
+        return None
+    # strip extra spaces
+    tagged_sentence = tagged_sentence.strip()
+    # strip extra new lines
+    tagged_sentence = tagged_sentence.strip("\n")
+    # seperate words (tokens, tags)
+    tagged_words = tagged_sentence.split("\n")
+    # initialize variable
+    tokens, tags = [], []
+    # iterate each word
+    for tagged_word in tagged_words:
+        # if empty skip
+        if not tagged_word:
+            continue
+        # remove consecutive tab space with single tab space
+        tagged_word = re.sub(r"\t+", "\t", tagged_word)
+        # remove extra tab space
+        tagged_word = tagged_word.strip("\t")
+        # seperate token and tag
+        word_tag_split = tagged_word.split("\t")
+        # if token and tag both does not exists then skip
+        if len(word_tag_split)<2:
+            continue
+        # add token to tokens list
+        tokens.append(word_tag_split[0])
+        # add tag to tags list
+        tags.append(word_tag_split[1])
+    return (tokens, tags)
+
+def _parse_jsonl_line(raw_line: str) -> tuple:
+    """This function cleans a line of jsonl data and tokenizes its sentence.
+
+    Args:
+        raw_line (str): line of jsonl data
+
+    Returns:
+        tuple: tuple of token list and tag list, None if line is skipped
+    """
+    # clean line
+    raw_line = _clean_jsonl(raw_line)
+    # skip empty lines (i.e. at the end of file)
+    if not raw_line:
+        return None
+    # load line data to json
+    tagged_sentence = json.loads(raw_line)
+    # if length of line json is not 2 then print that and skip
+    if len(tagged_sentence)!=2:
+        print(f"Issue found with line data : {tagged_sentence}")
+        return None
+    # get sentence and tags
+    sentence, tags = tagged_sentence[0], tagged_sentence[1]
+    # tokenize sentence
+    tokens = tokenizer.tokenize(sentence)
+    return (tokens, tags)
+
+def _fit_jsonl_tags(tokens: list, tags: list, single_tag: bool) -> dict:
+    """This function matches filtered tags of a line of jsonl data with its tokens.
+
+    Args:
+        tokens (list): List of tokens strings
+        tags (list): list of tags after removing unwanted tags
+        single_tag (bool): whether only one type of tag exists, len(set(tags))==1
+
+    Returns:
+        dict: processed sentence (see _process_text_chunk), None if line is skipped
+    """
+    # if tokens length is less than tags length and only one type 
+    # of tag exits then reduce the tags to token length
+    if len(tokens)<len(tags) and single_tag:
+        tags = [tags[0]]*len(tokens)
+    # if length of tokens and length of tags do not match then skip
+    if len(tokens)!=len(tags):
+        return None
+    # remove non-breaking-space and revert back placeholders
+    tokens, tags = _handle_nbsp_and_replacement_jsonl(tokens, tags)
+    # format tokens and tags
+    return {
+            "tokens": tokens,
+            "tags": tags,
+        }
+
+def _process_text_chunk(tagged_sentences: list) -> list:
+    """This function does all processing necessary for a chunk of sentences of text data (run in
+    worker processes). Tags of the whole chunk are filtered and converted to BILUO at once as an
+    array of tag ids (see tag_arrays).
+
+    Args:
+        tagged_sentences (list): blocks of text data, one token and tag per line
+
+    Returns:
+        list: processed sentences, dictionaries of tokens and tags i.e.
+                {
+                    "tokens" : ["ইব্রাহীম", "ভালো", "কোডিং", "পারে", "।"],
+                    "tags": ["U-PERSON", "O", "O", "O", "O"],
+                }
+            empty sentences are dropped
+    """
+    parsed = (_parse_tagged_sentence(tagged_sentence) for tagged_sentence in tagged_sentences)
+    parsed = [tokens_tags for tokens_tags in parsed if tokens_tags is not None]
+    # remove unwanted tags and convert from IOB to BILUO
+    tag_ids, offsets, vocab = encode_tags(tags for _, tags in parsed)
+    tag_ids, vocab = filter_tags(tag_ids, vocab)
+    tag_ids, vocab = iob_to_biluo_ids(tag_ids, offsets, vocab)
+    processed_dicts = []
+    for (tokens, _), tags in zip(parsed, decode_tags(tag_ids, offsets, vocab)):
+        # handle "." and "-" to match with jsonl data
+        tokens, tags = _handle_dot_and_minus_text(tokens, tags)
+        processed_dicts.append({"tokens": tokens, "tags": tags})
+    return processed_dicts
+
+def _process_jsonl_chunk(raw_lines: list) -> list:
+    """This function does all processing necessary for a chunk of lines of jsonl data (run in
+    worker processes). Tags of the whole chunk are filtered at once as an array of tag ids (see
+    tag_arrays).
+
+    Args:
+        raw_lines (list): lines of jsonl data
+
+    Returns:
+        list: processed sentences (see _process_text_chunk), empty and invalid lines are dropped
+    """
+    parsed = (_parse_jsonl_line(raw_line) for raw_line in raw_lines)
+    parsed = [tokens_tags for tokens_tags in parsed if tokens_tags is not None]
+    # remove unwanted tags
+    tag_ids, offsets, vocab = encode_tags(tags for _, tags in parsed)
+    tag_ids, vocab = filter_tags(tag_ids, vocab)
+    single_tags = single_tag_mask(tag_ids, offsets).tolist()
+    processed_dicts = (
+        _fit_jsonl_tags(tokens, tags, single_tag)
+        for (tokens, _), tags, single_tag in zip(parsed, decode_tags(tag_ids, offsets, vocab), single_tags))
+    return [processed_dict for processed_dict in processed_dicts if processed_dict is not None]
+
+def iter_text_data(data_path: str, n_workers: int = cfg.PREPROCESS_N_WORKERS,
+                   chunk_size: int = cfg.PREPROCESS_CHUNK_SIZE) -> Iterator[dict]:
+    """This function does all processing necessary for text data, one sentence at a time. With
+    multiple workers chunks of sentences are processed in parallel, output (and its order) is
+    same as with one worker.
+
+    Args:
+        data_path (str): path to the text data
+        n_workers (int, optional): number of worker processes. Defaults to cfg.PREPROCESS_N_WORKERS.
+        chunk_size (int, optional): number of sentences sent to a worker at once. Defaults to cfg.PREPROCESS_CHUNK_SIZE.
+
+    Yields:
+        Iterator[dict]: processed sentence (see _process_text_chunk)
+    """
+    # read text from file
+    with open(data_path, encoding="utf8") as f:
+        # seperate sentences and process them
+        yield from map_chunks(_process_text_chunk, _iter_blocks(f), n_workers, chunk_size)
+
+def iter_jsonl_data(data_path: str, n_workers: int = cfg.PREPROCESS_N_WORKERS,
+                    chunk_size: int = cfg.PREPROCESS_CHUNK_SIZE) -> Iterator[dict]:
+    """This function does all processing necessary for jsonl data, one line at a time. With
+    multiple workers chunks of lines are processed in parallel, output (and its order) is same
+    as with one worker.
+
+    Args:
+        data_path (str): path to the jsonl data
+        n_workers (int, optional): number of worker processes. Defaults to cfg.PREPROCESS_N_WORKERS.
+        chunk_size (int, optional): number of lines sent to a worker at once. Defaults to cfg.PREPROCESS_CHUNK_SIZE.
+
+    Yields:
+        Iterator[dict]: processed sentence (see _process_text_chunk)
+    """
+    # read text from file
+    with open(data_path, encoding="utf8") as f:
+        # process each line
+        yield from map_chunks(_process_jsonl_chunk, f, n_workers, chunk_size)
+
+def _collect_processed_data(processed_dicts: Iterable[dict]) -> dict:
+    """This function seperates processed sentences by PERSON tags.
+
+    Args:
+        processed_dicts (Iterable[dict]): processed sentences
+
+    Returns:
+        dict: dictionary of processed data with "person" and "no_person" keys
+    """
+    # initialize variable
+    processed_data = {
+        'person': [],
+        'no_person': [],
+    }
+    # seperate by PERSON tags
+    for processed_dict in processed_dicts:
+        processed_data[_data_key(processed_dict["tags"])].append(processed_dict)
+    return processed_data
+
+def process_text_data(data_path: str, print_summary: bool = True, save_path: str = "",
+                      n_workers: int = cfg.PREPROCESS_N_WORKERS) -> dict:
+    """This function does all processing necessary for text data. Whole processed data is kept
+    in memory, use iter_text_data with save_processed_data for large data.
 
     Args:
         data_path (str): path to the text data
         print_summary (bool, optional): If set True print summary of the processed data. Defaults to True.
         save_path (str, optional): If provided writes the processed data as json file. Defaults to "".
+        n_workers (int, optional): number of worker processes. Defaults to cfg.PREPROCESS_N_WORKERS.
 
     Returns:
         dict: dictionary of processed data. Dictionary has format
@@ -164,143 +450,36 @@ def process_text_data(data_path: str, print_summary: bool = True, save_path: str
                     ]
                 }
     """
-    # initialize variable
-    processed_data = {
-        'person': [],
-        'no_person': [],
-    }
-    # read text from file
-    raw_data = open(data_path, encoding="utf8").read()
-    # seperate sentences
-    tagged_sentences = raw_data.split("\n\n")
     # process each sentence
-    for tagged_sentence in tagged_sentences:
-        # if sentence is empty skip
-        if not tagged_sentence:
-            continue
-        # strip extra spaces
-        tagged_sentence = tagged_sentence.strip()
-        # strip extra new lines
-        tagged_sentence = tagged_sentence.strip("\n")
-        # seperate words (tokens, tags)
-        tagged_words = tagged_sentence.split("\n")
-        # initialize variable
-        tokens, tags = [], []
-        # iterate each word
-        for tagged_word in tagged_words:
-            # if empty skip
-            if not tagged_word:
-                continue
-            # remove consecutive tab space with single tab space
-            tagged_word = re.sub(r"\t+", "\t", tagged_word)
-            # remove extra tab space
-            tagged_word = tagged_word.strip("\t")
-            # seperate token and tag
-            word_tag_split = tagged_word.split("\t")
-            # if token and tag both does not exists then skip
-            if len(word_tag_split)<2:
-                continue
-            # add token to tokens list
-            tokens.append(word_tag_split[0])
-            # add tag to tags list
-            tags.append(word_tag_split[1])
-        # remove unwanted tags (everything except PERSON tag)
-        tags = _remove_unwanted_tags(tags)
-        # convert from IOB to BILUO
-        tags = iob_to_biluo(tags)
-        # handle "." and "-" to match with jsonl data
-        tokens, tags = _handle_dot_and_minus_text(tokens, tags)
-        # format tokens and tags
-        processed_dict = {
-                "tokens": tokens,
-                "tags": tags,
-            }
-        # seperate by PERSON tags
-        if len(set(tags))==1:
-            processed_data["no_person"].append(processed_dict)
-        else:
-            processed_data["person"].append(processed_dict)
+    processed_data = _collect_processed_data(iter_text_data(data_path, n_workers))
     # print summary if flag is on
     if print_summary:
-        _print_data_processing_summary(processed_data=processed_data, data_name="data_1")
+        _print_data_processing_summary({key: len(value) for key, value in processed_data.items()}, data_name="data_1")
     # save json if path is passed
     if save_path:
         _write_json(json_data=processed_data, json_save_path=save_path)
     # return processed data
     return processed_data
 
-def process_jsonl_data(data_path: str, print_summary: bool = True, save_path: str = "") -> dict:
-    """This function does all processing necessary for jsonl data.
+def process_jsonl_data(data_path: str, print_summary: bool = True, save_path: str = "",
+                       n_workers: int = cfg.PREPROCESS_N_WORKERS) -> dict:
+    """This function does all processing necessary for jsonl data. Whole processed data is kept
+    in memory, use iter_jsonl_data with save_processed_data for large data.
 
     Args:
         data_path (str): path to the text data
         print_summary (bool, optional): If set True print summary of the processed data. Defaults to True.
         save_path (str, optional): If provided writes the processed data as json file. Defaults to "".
+        n_workers (int, optional): number of worker processes. Defaults to cfg.PREPROCESS_N_WORKERS.
 
     Returns:
-        dict: dictionary of processed data. Dictionary has format
-                {
-                    "person": [
-                        {
-                        "tokens" : ["ইব্রাহীম", "ভালো", "কোডিং", "পারে", "।"],
-                        "tags": ["B-PER", "O", "O", "O", "O"],
-                        },
-                    ],
-                    "person": [
-                        {
-                        "tokens" : ["আগামীকাল", "পরীক্ষা", "আছে", "।"],
-                        "tags": ["O", "O", "O", "O"],
-                        },
-                    ]
-                }
+        dict: dictionary of processed data, same format as process_text_data
     """
-    # initialize variables
-    processed_data = {
-        'person': [],
-        'no_person': [],
-    }
-    # read text from file
-    raw_data = open(data_path, encoding="utf8").read()
-    # clean text
-    raw_data = _clean_jsonl(raw_data)
-    # seperate lines
-    raw_lines = raw_data.split("\n")
-    # iterate over each line
-    for raw_line in raw_lines:
-        # load line data to json
-        tagged_sentence = json.loads(raw_line)
-        # if length of line json is not 2 then print that and skip
-        if len(tagged_sentence)!=2:
-            print(f"Issue found with line data : {tagged_sentence}")
-            continue
-        # get sentence and tags
-        sentence, tags = tagged_sentence[0], tagged_sentence[1]
-        # tokenize sentence
-        tokens = tokenizer.tokenize(sentence)
-        # remove unwanted tags (everything except PERSON tag)
-        tags = _remove_unwanted_tags(tags)
-        # if tokens length is less than tags length and only one type 
-        # of tag exits then reduce the tags to token length
-        if len(tokens)<len(tags) and len(set(tags))==1:
-            tags = [tags[0]]*len(tokens)
-        # if length of tokens and length of tags do not match then skip
-        if len(tokens)!=len(tags):
-            continue
-        # remove non-breaking-space and revert back placeholders
-        tokens, tags = _handle_nbsp_and_replacement_jsonl(tokens, tags)
-        # format tokens and tags
-        processed_dict = {
-                "tokens": tokens,
-                "tags": tags,
-            }
-        # seperate by PERSON tags
-        if len(set(tags))==1:
-            processed_data["no_person"].append(processed_dict)
-        else:
-            processed_data["person"].append(processed_dict)
+    # process each line
+    processed_data = _collect_processed_data(iter_jsonl_data(data_path, n_workers))
     # print summary if flag is on
     if print_summary:
-        _print_data_processing_summary(processed_data=processed_data, data_name="data_2")
+        _print_data_processing_summary({key: len(value) for key, value in processed_data.items()}, data_name="data_2")
     # save json if path is passed
     if save_path:
         _write_json(json_data=processed_data, json_save_path=save_path)
@@ -308,12 +487,27 @@ def process_jsonl_data(data_path: str, print_summary: bool = True, save_path: st
     return processed_data
 
 if __name__ == "__main__":
+    # create argument parser
+    parser = argparse.ArgumentParser(description='Download and process raw data.')
+    parser.add_argument('-w', '--n-workers', type=int, default=cfg.PREPROCESS_N_WORKERS, help='number of worker processes.')
+    parser.add_argument('--chunk-size', type=int, default=cfg.PREPROCESS_CHUNK_SIZE, help='number of sentences sent to a worker at once.')
+    parser.add_argument('--format', choices=["compact", "json"], default=cfg.PROCESSED_DATA_FORMAT, help='format of saved processed data.')
+    # parse arguments
+    args = parser.parse_args()
     # download the dataset provided for the project if it does not exist
     data_path_1 = cfg.RAW_DATA1_FILE_PATH
     data_path_2 = cfg.RAW_DATA2_FILE_PATH
     if not os.path.exists(data_path_1) or not os.path.exists(data_path_2):
-        download_data()
-    # process text data (data_1)
-    data_1 = process_text_data(data_path=data_path_1, save_path=cfg.PROCESSESED_DATA1_PATH)
-    # process jsonl data (data_2)
-    data_2 = process_jsonl_data(data_path=data_path_2, save_path=cfg.PROCESSESED_DATA2_PATH)
\ No newline at end of file
+        # downloader is imported only when needed as it pulls in network libraries
+        from ..utils.downloader import download_data
+        download_data(missing_only=True)
+    # compact data is imported here as it imports this module for json export
+    from ..utils.compact_data import save_compact_data, processed_data_paths
+    save_data = save_compact_data if args.format == "compact" else save_processed_data
+    save_path_1, save_path_2 = processed_data_paths(args.format)
+    # process text data (data_1), streaming sentences to disk
+    counts = save_data(iter_text_data(data_path_1, args.n_workers, args.chunk_size), save_path_1)
+    _print_data_processing_summary(counts, data_name="data_1")
+    # process jsonl data (data_2), streaming lines to disk
+    counts = save_data(iter_jsonl_data(data_path_2, args.n_workers, args.chunk_size), save_path_2)
+    _print_data_processing_summary(counts, data_name="data_2")
@@ -0,0 +1,170 @@
+import numpy as np
+from itertools import chain
+from typing import Iterable
+from spacy.training.iob_utils import iob_to_biluo
+
+# Tags of many sentences are handled as one flat array of tag ids with sentence offsets, tags of
+# sentence i are ids[offsets[i]:offsets[i + 1]]. String operations are done once per distinct tag
+# (on the vocabulary) and applied to the whole array through lookup tables.
+
+# data types of tag id and offset arrays
+TAG_ID_DTYPE = np.int32
+OFFSET_DTYPE = np.int64
+# positions of a token in an entity, in order of ids of converted tags (see iob_to_biluo_ids)
+_BILUO_POSITIONS = ("U", "B", "I", "L")
+
+def _intern(strings: Iterable[str]) -> tuple:
+    """This function maps strings to ids, equal strings get same id.
+
+    Args:
+        strings (Iterable[str]): strings to map
+
+    Returns:
+        tuple: array of ids and vocabulary (list of distinct strings)
+    """
+    strings = list(strings)
+    # distinct strings in order of first appearance
+    vocab = list(dict.fromkeys(strings))
+    ids = {string: i for i, string in enumerate(vocab)}
+    return (np.fromiter(map(ids.__getitem__, strings), dtype=TAG_ID_DTYPE, count=len(strings)), vocab)
+
+def encode_tags(tag_lists: Iterable[list]) -> tuple:
+    """This function encodes tags of sentences into a flat array of tag ids.
+
+    Args:
+        tag_lists (Iterable[list]): list of tags of each sentence
+
+    Returns:
+        tuple: tag ids, sentence offsets and vocabulary of tags
+    """
+    tag_lists = tag_lists if isinstance(tag_lists, list) else list(tag_lists)
+    ids, vocab = _intern(chain.from_iterable(tag_lists))
+    offsets = np.zeros(len(tag_lists) + 1, dtype=OFFSET_DTYPE)
+    np.cumsum(np.fromiter(map(len, tag_lists), dtype=OFFSET_DTYPE, count=len(tag_lists)), out=offsets[1:])
+    return (ids, offsets, vocab)
+
+def decode_tags(ids: np.ndarray, offsets: np.ndarray, vocab: list) -> list:
+    """This function decodes a flat array of tag ids into tags of each sentence.
+
+    Args:
+        ids (np.ndarray): tag ids
+        offsets (np.ndarray): sentence offsets
+        vocab (list): vocabulary of tags
+
+    Returns:
+        list: list of tags of each sentence
+    """
+    # indexing an object array decodes all tags at once
+    tags = np.array(vocab, dtype=object)[ids].tolist()
+    bounds = offsets.tolist()
+    return list(map(tags.__getitem__, map(slice, bounds[:-1], bounds[1:])))
+
+def _remap(ids: np.ndarray, mapped_vocab: list) -> tuple:
+    """This function applies a mapping of vocabulary strings to tag ids.
+
+    Args:
+        ids (np.ndarray): tag ids
+        mapped_vocab (list): new string of each vocabulary entry
+
+    Returns:
+        tuple: new tag ids and new vocabulary
+    """
+    lookup, vocab = _intern(mapped_vocab)
+    return (lookup[ids], vocab)
+
+def filter_tags(ids: np.ndarray, vocab: list) -> tuple:
+    """This function replaces tags not in cfg.TAGS_TO_KEEP with "O" and PER with PERSON, same as
+    _remove_unwanted_tags of raw_data_processing but once per distinct tag.
+
+    Args:
+        ids (np.ndarray): tag ids
+        vocab (list): vocabulary of tags
+
+    Returns:
+        tuple: filtered tag ids and their vocabulary
+    """
+    # same string operations as _remove_unwanted_tags, done on the vocabulary. imported here
+    # as raw_data_processing imports this module
+    from .raw_data_processing import _remove_unwanted_tags
+    return _remap(ids, _remove_unwanted_tags(vocab))
+
+def sentence_starts(offsets: np.ndarray, n_tags: int) -> np.ndarray:
+    """This function marks first tag of each sentence.
+
+    Args:
+        offsets (np.ndarray): sentence offsets
+        n_tags (int): number of tags
+
+    Returns:
+        np.ndarray: boolean array, True for first tag of a sentence
+    """
+    starts = np.zeros(n_tags, dtype=bool)
+    # offsets of empty sentences (and, the end) are not a tag of their own
+    starts[offsets[:-1][offsets[:-1] < offsets[1:]]] = True
+    return starts
+
+def iob_to_biluo_ids(ids: np.ndarray, offsets: np.ndarray, vocab: list) -> tuple:
+    """This function converts IOB tags of each sentence to BILUO tags, same as spacy iob_to_biluo.
+
+    As in spacy, every tag except "O" starts an entity unless it continues the entity of the previous
+    tag, i.e. it is "I" + tag[1:] or "L" + tag[1:] of the tag starting that entity. Converted tags
+    are "U-", "B-", "I-" or "L-" + tag[2:] of the first tag, by position of the token in the entity.
+
+    Args:
+        ids (np.ndarray): tag ids
+        offsets (np.ndarray): sentence offsets
+        vocab (list): vocabulary of tags
+
+    Raises:
+        ValueError: if a single token entity has no label, same error as spacy
+
+    Returns:
+        tuple: BILUO tag ids and their vocabulary
+    """
+    # lookup tables over the vocabulary
+    outside_table = np.array([tag == "O" for tag in vocab], dtype=bool)
+    continue_table = np.array([tag[:1] in ("I", "L") for tag in vocab], dtype=bool)
+    suffix_table, _ = _intern(tag[1:] for tag in vocab)
+    label_table, labels = _intern(tag[2:] for tag in vocab)
+    if not len(ids):
+        return (ids.copy(), ["O"])
+    inside = ~outside_table[ids]
+    suffixes = suffix_table[ids]
+    # a tag continues the entity of previous tag in same sentence if it is "I"/"L" with same suffix
+    continues = inside & continue_table[ids] & ~sentence_starts(offsets, len(ids))
+    continues[1:] &= inside[:-1] & (suffixes[1:] == suffixes[:-1])
+    # next tag continues the entity of this tag
+    continued = np.zeros(len(ids), dtype=bool)
+    continued[:-1] = continues[1:]
+    # position of each tag in its entity, index of _BILUO_POSITIONS
+    positions = np.where(continues, np.where(continued, 2, 3), np.where(continued, 1, 0))
+    label_ids = label_table[ids]
+    if "" in labels:
+        # spacy raises an error for a single token entity without label, raise same error for the first one
+        invalid = np.flatnonzero(inside & (positions == 0) & (label_ids == labels.index("")))
+        if len(invalid):
+            iob_to_biluo([vocab[ids[invalid[0]]]])
+    # converted tag id 0 is "O", then 4 positions of each label
+    biluo_ids = np.where(inside, 1 + label_ids * len(_BILUO_POSITIONS) + positions, 0).astype(TAG_ID_DTYPE)
+    biluo_vocab = ["O"] + [f"{position}-{label}" for label in labels for position in _BILUO_POSITIONS]
+    return (biluo_ids, biluo_vocab)
+
+def single_tag_mask(ids: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    """This function finds sentences with exactly one distinct tag, i.e. len(set(tags))==1. The
+    vocabulary must not have duplicates.
+
+    Args:
+        ids (np.ndarray): tag ids
+        offsets (np.ndarray): sentence offsets
+
+    Returns:
+        np.ndarray: boolean array, True for each sentence with one distinct tag
+    """
+    lengths = np.diff(offsets)
+    mask = np.zeros(len(lengths), dtype=bool)
+    non_empty = lengths > 0
+    if non_empty.any():
+        # empty sentences are dropped, so each start is followed by start of next sentence
+        starts = offsets[:-1][non_empty]
+        mask[non_empty] = np.minimum.reduceat(ids, starts) == np.maximum.reduceat(ids, starts)
+    return mask
@@ -1,19 +1,25 @@
 import os
-import spacy
 from spacy.tokens import DocBin, Doc, Span
 from spacy.training.iob_utils import tags_to_entities
 from sklearn.model_selection import train_test_split
+from ..utils.spacy_tokenizer import blank_pipeline
+from ..utils.compact_data import SentenceView
 from ..config import config as cfg
 
 def _split_train_val_test(data: list) -> tuple:
     """This function takes data as a list and splits it into train, validation, and test set.
+    Compact data (SentenceView) is split by positions, so sentences are not decoded.
 
     Args:
-        data (list): data as list
+        data (list): data as list (or, SentenceView)
 
     Returns:
         tuple: tuple of train, validation, and test set of data
     """
+    if isinstance(data, SentenceView):
+        # split positions of sentences and select them from the view
+        train_pos, val_pos, test_pos = _split_train_val_test(list(range(len(data))))
+        return (data.take(train_pos), data.take(val_pos), data.take(test_pos))
     # split into train data and test+validation data
     train_data, test_val_data = train_test_split(data, test_size=cfg.TEST_VAL_PERCENTAGE)
     # split into validation data and test data
@@ -29,8 +35,9 @@ def _convert_save_spacy_binary(data: list, save_path: str):
         data (list): list of data in custom format
         save_path (str): path where the binary file will be saved
     """
-    # initialize a blank model
-    nlp = spacy.blank("bn")
+    # initialize a blank model with BasicTokenizer. tokens of data are already BasicTokenizer
+    # tokens, so Docs are created from them directly
+    nlp = blank_pipeline()
     # initialize DocBin to store the converted binary data
     db = DocBin()
     # iterate over each data
@@ -110,9 +117,16 @@ def split_and_convert_data(data: list):
     # print stats of training data
     
 if __name__ == "__main__":
-    import json
-    # process text data (data_1)
-    data_1 = json.load(open(cfg.PROCESSESED_DATA1_PATH, encoding="utf-8"))
-    # process jsonl data (data_2)
-    data_2 = json.load(open(cfg.PROCESSESED_DATA2_PATH, encoding="utf-8"))
+    import argparse
+    from ..utils.compact_data import load_processed_data, processed_data_paths
+    # create argument parser
+    parser = argparse.ArgumentParser(description='Split processed data and convert it to spacy binary format.')
+    parser.add_argument('--format', choices=["compact", "json"], default=cfg.PROCESSED_DATA_FORMAT, help='format of processed data.')
+    # parse arguments
+    args = parser.parse_args()
+    data_path_1, data_path_2 = processed_data_paths(args.format)
+    # processed text data (data_1)
+    data_1 = load_processed_data(data_path_1)
+    # processed jsonl data (data_2)
+    data_2 = load_processed_data(data_path_2)
     split_and_convert_data(data=(data_1,data_2))
\ No newline at end of file
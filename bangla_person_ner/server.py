@@ -0,0 +1,385 @@
+import json
+import asyncio
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from .config import config as cfg
+from .bangla_person_ner import BanglaPersorNer
+from .utils.engines import ENGINES
+from .utils.batching import LengthBucketScheduler
+from .utils.metrics import InferenceMetrics
+
+# reason phrases of status codes used by the server
+_STATUS_PHRASES = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    503: "Service Unavailable",
+}
+
+class QueueFullError(Exception):
+    """Raised when micro-batcher queue is full and a request can not be accepted.
+    """
+
+class TooManyTextsError(ValueError):
+    """Raised when a request has more texts than micro-batcher queue can hold.
+    """
+
+class MicroBatcher(object):
+    """Collects concurrent extraction requests into micro-batches and runs them on
+    BanglaPersorNer in a background thread. Texts of a request are queued in chunks of at most
+    max_batch_size texts. A batch is run when next chunk would not fit in max_batch_size texts
+    or when its first chunk has waited max_wait_ms, whichever comes first.
+    """
+    def __init__(self, bp_ner: BanglaPersorNer, max_batch_size: int = cfg.SERVER_MAX_BATCH_SIZE,
+                 max_wait_ms: float = cfg.SERVER_MAX_WAIT_MS, max_queue_size: int = cfg.SERVER_MAX_QUEUE_SIZE) -> None:
+        """Initialize MicroBatcher class.
+
+        Args:
+            bp_ner (BanglaPersorNer): object used for name extraction
+            max_batch_size (int, optional): maximum number of texts in a batch. Defaults to cfg.SERVER_MAX_BATCH_SIZE.
+            max_wait_ms (float, optional): maximum milliseconds a request waits for a batch to fill.
+                Defaults to cfg.SERVER_MAX_WAIT_MS.
+            max_queue_size (int, optional): maximum number of waiting (or, running) texts, a request
+                without texts counts as one. New requests are rejected when they do not fit in the
+                queue. Defaults to cfg.SERVER_MAX_QUEUE_SIZE.
+        """
+        self.bp_ner = bp_ner
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.max_queue_size = max_queue_size
+        # number of texts in the queue or in the running batch, only changed in event loop thread.
+        # texts of a chunk are released when the chunk is run (or, dropped as its request is cancelled)
+        self._n_queued_texts = 0
+        self._queue = asyncio.Queue()
+        # model runs in a single background thread so that event loop keeps serving requests
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._task = None
+
+    def start(self) -> None:
+        """This function starts the background task which forms and runs batches.
+        """
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """This function stops the background task and the inference thread.
+        """
+        if self._task is not None:
+            self._task.cancel()
+        self._executor.shutdown(wait=False)
+
+    async def run_in_executor(self, func: object, *args) -> object:
+        """This function runs a function in the inference thread.
+
+        Args:
+            func (object): function to run
+
+        Returns:
+            object: return value of the function
+        """
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    async def submit(self, texts: list) -> list:
+        """This function adds texts of a request to the queue and waits for their results.
+
+        Args:
+            texts (list): list of texts
+
+        Raises:
+            TooManyTextsError: if the request has more texts than the queue can hold
+            QueueFullError: if texts of the request do not fit in the queue
+
+        Returns:
+            list: list of result dictionaries in format returned by BanglaPersorNer.extract_person_name
+        """
+        n_texts = max(len(texts), 1)
+        if n_texts > self.max_queue_size:
+            raise TooManyTextsError(f"A request can have at most {self.max_queue_size} texts.")
+        if self._n_queued_texts + n_texts > self.max_queue_size:
+            raise QueueFullError("Too many texts are waiting.")
+        self._n_queued_texts += n_texts
+        # queue texts in chunks, so that a large request does not make a batch larger than max_batch_size
+        loop = asyncio.get_running_loop()
+        futures = []
+        for start in range(0, n_texts, self.max_batch_size):
+            future = loop.create_future()
+            self._queue.put_nowait((texts[start:start + self.max_batch_size], future))
+            futures.append(future)
+        # if the request is cancelled, gather cancels futures of its chunks and they are dropped
+        chunk_results = await asyncio.gather(*futures)
+        return [result for results in chunk_results for result in results]
+
+    def _release(self, chunk: tuple) -> None:
+        """This function removes texts of a chunk from the number of queued texts.
+
+        Args:
+            chunk (tuple): tuple of texts and future
+        """
+        # a request without texts is counted as one
+        self._n_queued_texts -= max(len(chunk[0]), 1)
+
+    async def _get_chunk(self) -> tuple:
+        """This function waits for the next chunk whose request is not cancelled.
+
+        Returns:
+            tuple: tuple of texts and future
+        """
+        while True:
+            chunk = await self._queue.get()
+            if not chunk[1].done():
+                return chunk
+            self._release(chunk)
+
+    async def _run(self) -> None:
+        """This function forms batches from queued requests and runs them until cancelled.
+        """
+        loop = asyncio.get_running_loop()
+        # chunk which did not fit in previous batch, it starts the next batch
+        pending = None
+        while True:
+            # wait for the first chunk of the batch
+            batch = [pending if pending is not None else await self._get_chunk()]
+            pending = None
+            n_texts = len(batch[0][0])
+            deadline = loop.time() + self.max_wait
+            # add more chunks until batch is full or first chunk waited long enough
+            while n_texts < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    request = await asyncio.wait_for(self._get_chunk(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if n_texts + len(request[0]) > self.max_batch_size:
+                    pending = request
+                    break
+                batch.append(request)
+                n_texts += len(request[0])
+            # run the batch in inference thread
+            texts = [text for request_texts, _ in batch for text in request_texts]
+            try:
+                results = await self.run_in_executor(
+                    self.bp_ner.extract_person_names_batch, texts, max(len(texts), 1), 1)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            finally:
+                for chunk in batch:
+                    self._release(chunk)
+            # distribute results to requests
+            start = 0
+            for request_texts, future in batch:
+                end = start + len(request_texts)
+                if not future.done():
+                    future.set_result(results[start:end])
+                start = end
+
+class InferenceServer(object):
+    """Minimal HTTP/JSON server for name extraction built on asyncio streams.
+
+    Endpoints:
+        POST /extract : body {"text": "..."} returns a result dictionary,
+                        body {"texts": ["...", ...]} returns {"results": [...]}
+        GET /health   : 200 while server is running
+        GET /ready    : 200 when the model is loaded and warmed up, 503 otherwise
+        GET /metrics  : latency metrics in Prometheus text format, 404 if metrics are not enabled
+    """
+    def __init__(self, batcher: MicroBatcher, max_body_bytes: int = cfg.SERVER_MAX_BODY_BYTES) -> None:
+        """Initialize InferenceServer class.
+
+        Args:
+            batcher (MicroBatcher): micro-batcher used to run extraction
+            max_body_bytes (int, optional): maximum size of a request body. Defaults to cfg.SERVER_MAX_BODY_BYTES.
+        """
+        self.batcher = batcher
+        self.max_body_bytes = max_body_bytes
+        self.ready = False
+
+    async def warmup(self) -> None:
+        """This function loads and warms up the model in inference thread and marks server as ready.
+        """
+        await self.batcher.run_in_executor(self.batcher.bp_ner.warmup)
+        self.ready = True
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """This function serves requests of a connection until client closes it.
+
+        Args:
+            reader (asyncio.StreamReader): reader of the connection
+            writer (asyncio.StreamWriter): writer of the connection
+        """
+        try:
+            while True:
+                # read request line and headers
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+                lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, path, version = lines[0].split(" ", 2)
+                except ValueError:
+                    await self._write_response(writer, 400, {"error": "Malformed request line."}, False)
+                    break
+                headers = {}
+                for line in lines[1:]:
+                    if ":" in line:
+                        name, value = line.split(":", 1)
+                        headers[name.strip().lower()] = value.strip()
+                keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+                # read body, length must be a non negative integer
+                length_header = headers.get("content-length", "") or "0"
+                if not (length_header.isascii() and length_header.isdigit()):
+                    await self._write_response(writer, 400, {"error": "Invalid Content-Length."}, False)
+                    break
+                content_length = int(length_header)
+                if content_length > self.max_body_bytes:
+                    await self._write_response(writer, 413, {"error": "Request body is too large."}, False)
+                    break
+                body = await reader.readexactly(content_length) if content_length else b""
+                # handle request and write response
+                status, payload = await self._dispatch(method, path.split("?", 1)[0], body)
+                await self._write_response(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(self, method: str, path: str, body: bytes) -> tuple:
+        """This function handles a request.
+
+        Args:
+            method (str): HTTP method
+            path (str): request path
+            body (bytes): request body
+
+        Returns:
+            tuple: tuple of status code and json payload (or, text payload)
+        """
+        if path == "/health":
+            return (200, {"status": "ok"})
+        if path == "/ready":
+            return (200, {"status": "ready"}) if self.ready else (503, {"status": "loading"})
+        if path == "/metrics":
+            metrics = self.batcher.bp_ner.metrics
+            return (200, metrics.to_prometheus()) if metrics is not None else (404, {"error": "Metrics are not enabled."})
+        if path != "/extract":
+            return (404, {"error": "Not found."})
+        if method != "POST":
+            return (405, {"error": "Use POST."})
+        if not self.ready:
+            return (503, {"error": "Model is not ready."})
+        # parse request body
+        try:
+            data = json.loads(body)
+            if not isinstance(data, dict):
+                raise ValueError
+            single = "text" in data
+            texts = [data["text"]] if single else data["texts"]
+            # texts must be a non empty list of strings, i.e. not a string (list of characters)
+            if not isinstance(texts, list) or not texts or not all(isinstance(text, str) for text in texts):
+                raise ValueError
+        except (ValueError, KeyError, TypeError):
+            return (400, {"error": 'Body must be {"text": str} or {"texts": [str, ...]} with at least one text.'})
+        # run extraction, reject if queue is full (backpressure)
+        try:
+            results = await self.batcher.submit(texts)
+        except TooManyTextsError as e:
+            return (413, {"error": str(e)})
+        except QueueFullError as e:
+            return (503, {"error": str(e)})
+        return (200, results[0] if single else {"results": results})
+
+    @staticmethod
+    async def _write_response(writer: asyncio.StreamWriter, status: int, payload: dict, keep_alive: bool) -> None:
+        """This function writes a json response, or a plain text response if payload is a string.
+
+        Args:
+            writer (asyncio.StreamWriter): writer of the connection
+            status (int): status code
+            payload (dict): json payload (or, text)
+            keep_alive (bool): if False, asks client to close the connection
+        """
+        if isinstance(payload, str):
+            body = payload.encode("utf-8")
+            content_type = "text/plain; version=0.0.4; charset=utf-8"
+        else:
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            content_type = "application/json; charset=utf-8"
+        head = (
+            f"HTTP/1.1 {status} {_STATUS_PHRASES.get(status, '')}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+async def serve(bp_ner: BanglaPersorNer, host: str = cfg.SERVER_HOST, port: int = cfg.SERVER_PORT,
+                max_batch_size: int = None, max_wait_ms: float = cfg.SERVER_MAX_WAIT_MS,
+                max_queue_size: int = cfg.SERVER_MAX_QUEUE_SIZE) -> None:
+    """This function starts the inference server and serves until cancelled. Model is warmed up
+    in background, /ready returns 200 after that.
+
+    Args:
+        bp_ner (BanglaPersorNer): object used for name extraction
+        host (str, optional): host to bind. Defaults to cfg.SERVER_HOST.
+        port (int, optional): port to bind. Defaults to cfg.SERVER_PORT.
+        max_batch_size (int, optional): maximum number of texts in a batch. Defaults to None (tuned
+            batch size of bp_ner if available, otherwise cfg.SERVER_MAX_BATCH_SIZE).
+        max_wait_ms (float, optional): maximum milliseconds a request waits for a batch to fill.
+            Defaults to cfg.SERVER_MAX_WAIT_MS.
+        max_queue_size (int, optional): maximum number of waiting texts. Defaults to cfg.SERVER_MAX_QUEUE_SIZE.
+    """
+    max_batch_size = max_batch_size or bp_ner.tuned_config.get("batch_size", cfg.SERVER_MAX_BATCH_SIZE)
+    batcher = MicroBatcher(bp_ner, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms, max_queue_size=max_queue_size)
+    server = InferenceServer(batcher)
+    batcher.start()
+    http_server = await asyncio.start_server(server.handle_connection, host, port)
+    print(f"Serving on http://{host}:{port}")
+    # load the model while already answering health checks
+    warmup_task = asyncio.get_running_loop().create_task(server.warmup())
+    try:
+        async with http_server:
+            await http_server.serve_forever()
+    finally:
+        warmup_task.cancel()
+        await batcher.stop()
+
+def main() -> None:
+    """This function is called if the script is called directly. It parses arguments and runs the server.
+    """
+    # create argument parser
+    parser = argparse.ArgumentParser(description='Serve bangla person name extraction over HTTP.')
+    parser.add_argument('--host', type=str, default=cfg.SERVER_HOST, help='host to bind.')
+    parser.add_argument('--port', type=int, default=cfg.SERVER_PORT, help='port to bind.')
+    parser.add_argument('--max-batch-size', type=int, default=None, help='maximum number of texts in a batch. defaults to tuned (or, configured) value.')
+    parser.add_argument('--max-wait-ms', type=float, default=cfg.SERVER_MAX_WAIT_MS, help='maximum milliseconds a request waits for a batch to fill.')
+    parser.add_argument('--max-queue-size', type=int, default=cfg.SERVER_MAX_QUEUE_SIZE, help='maximum number of waiting texts.')
+    parser.add_argument('--cache-size', type=int, default=cfg.CACHE_SIZE, help='size of result cache, 0 disables it.')
+    parser.add_argument('--engine', choices=ENGINES, default=cfg.ENGINE, help='inference engine.')
+    parser.add_argument('--model-dir', type=str, default=cfg.MODEL_DIR, help='directory of the model, i.e. distilled student model.')
+    parser.add_argument('--schedule', action='store_true', help='batch texts of similar length under a token budget (see utils.batching).')
+    parser.add_argument('--lean', action='store_true', help='drop transformer activations from Docs right after prediction.')
+    parser.add_argument('--metrics', action='store_true', help='record latency of each stage and serve them at /metrics.')
+    # parse arguments
+    args = parser.parse_args()
+    # create an object of BanglaPersorNer and serve it
+    bp_ner = BanglaPersorNer(cache_size=args.cache_size, engine=args.engine, model_dir=args.model_dir, lean=args.lean,
+                             scheduler=LengthBucketScheduler() if args.schedule else None,
+                             metrics=InferenceMetrics() if args.metrics else None)
+    try:
+        asyncio.run(serve(bp_ner, host=args.host, port=args.port, max_batch_size=args.max_batch_size,
+                          max_wait_ms=args.max_wait_ms, max_queue_size=args.max_queue_size))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    # call main function
+    main()
@@ -0,0 +1,115 @@
+from typing import Callable, Iterable
+from ..config import config as cfg
+
+def estimate_wordpieces(text: str, chars_per_wordpiece: int = cfg.CHARS_PER_WORDPIECE) -> int:
+    """This function cheaply estimates number of transformer wordpieces of a text. Each word is
+    counted as one wordpiece per chars_per_wordpiece characters (at least one).
+
+    Args:
+        text (str): text to estimate
+        chars_per_wordpiece (int, optional): average characters in a wordpiece. Defaults to cfg.CHARS_PER_WORDPIECE.
+
+    Returns:
+        int: estimated number of wordpieces, at least 1
+    """
+    return max(1, sum((len(word) + chars_per_wordpiece - 1) // chars_per_wordpiece for word in text.split()))
+
+def plan_batches(lengths: list, max_tokens: int = cfg.SCHEDULER_MAX_TOKENS,
+                 max_batch_size: int = cfg.SCHEDULER_MAX_BATCH_SIZE) -> list:
+    """This function groups items into batches of similar length. Items are sorted by length
+    and added to a batch while padded size of the batch (number of items * longest item) is
+    within max_tokens. An item longer than max_tokens gets a batch of its own.
+
+    Args:
+        lengths (list): length of each item
+        max_tokens (int, optional): token budget of a padded batch. Defaults to cfg.SCHEDULER_MAX_TOKENS.
+        max_batch_size (int, optional): maximum number of items in a batch. Defaults to cfg.SCHEDULER_MAX_BATCH_SIZE.
+
+    Returns:
+        list: list of batches, each batch is a list of item indices
+    """
+    batches = []
+    batch = []
+    # in ascending order, last added item is the longest item of a batch
+    for index in sorted(range(len(lengths)), key=lengths.__getitem__):
+        if batch and ((len(batch) + 1) * lengths[index] > max_tokens or len(batch) == max_batch_size):
+            batches.append(batch)
+            batch = []
+        batch.append(index)
+    if batch:
+        batches.append(batch)
+    return batches
+
+def padding_ratio(lengths: list, batches: Iterable[list]) -> float:
+    """This function computes share of padding in padded batches.
+
+    Args:
+        lengths (list): length of each item
+        batches (Iterable[list]): batches of item indices
+
+    Returns:
+        float: padding tokens / all tokens of padded batches
+    """
+    n_padded = n_tokens = 0
+    for batch in batches:
+        batch_lengths = [lengths[index] for index in batch]
+        n_padded += len(batch_lengths) * max(batch_lengths)
+        n_tokens += sum(batch_lengths)
+    return 1 - n_tokens / n_padded if n_padded else 0.0
+
+class LengthBucketScheduler(object):
+    """Batch scheduler which sends texts of similar length to the model together under a token
+    budget, so that transformer spends less compute on padding. Results are returned in input order.
+    """
+    def __init__(self, max_tokens: int = cfg.SCHEDULER_MAX_TOKENS, max_batch_size: int = cfg.SCHEDULER_MAX_BATCH_SIZE,
+                 length_fn: Callable[[str], int] = estimate_wordpieces) -> None:
+        """Initialize LengthBucketScheduler class.
+
+        Args:
+            max_tokens (int, optional): token budget of a padded batch. Defaults to cfg.SCHEDULER_MAX_TOKENS.
+            max_batch_size (int, optional): maximum number of texts in a batch. Defaults to cfg.SCHEDULER_MAX_BATCH_SIZE.
+            length_fn (Callable[[str], int], optional): function which returns length of a text,
+                i.e. number of wordpieces from transformer tokenizer. Defaults to estimate_wordpieces.
+        """
+        self.max_tokens = max_tokens
+        self.max_batch_size = max_batch_size
+        self.length_fn = length_fn
+
+    def plan(self, texts: list) -> list:
+        """This function groups texts into batches of similar length.
+
+        Args:
+            texts (list): texts to schedule
+
+        Returns:
+            list: list of batches, each batch is a list of text indices
+        """
+        return plan_batches([self.length_fn(text) for text in texts], self.max_tokens, self.max_batch_size)
+
+    def pipe(self, nlp: object, texts: list, n_process: int = 1, batch_size: int = cfg.BATCH_SIZE) -> list:
+        """This function runs the model on scheduled batches and returns Docs in input order.
+        With multiple processes, texts are sent in length order with fixed batch_size instead,
+        as spacy splits batches between processes.
+
+        Args:
+            nlp (object): Spacy Language object
+            texts (list): texts to run the model on
+            n_process (int, optional): number of processes used for inference. Defaults to 1.
+            batch_size (int, optional): number of texts in each batch, only used if n_process > 1.
+                Defaults to cfg.BATCH_SIZE.
+
+        Returns:
+            list: Spacy.tokens.Doc object of each text in input order
+        """
+        batches = self.plan(texts)
+        docs = [None] * len(texts)
+        if n_process > 1:
+            order = [index for batch in batches for index in batch]
+            for index, doc in zip(order, nlp.pipe((texts[index] for index in order), batch_size=batch_size, n_process=n_process)):
+                docs[index] = doc
+            return docs
+        # run each batch in one forward pass
+        for batch in batches:
+            for index, doc in zip(batch, nlp.pipe([texts[index] for index in batch], batch_size=len(batch))):
+                docs[index] = doc
+        return docs
@@ -0,0 +1,116 @@
+import os
+import sys
+import json
+from typing import BinaryIO, Iterator
+
+def open_corpus(input_path: str) -> BinaryIO:
+    """This function opens a corpus for reading in binary mode. If path is "-" then stdin is used.
+
+    Args:
+        input_path (str): path of the corpus file or "-" for stdin
+
+    Returns:
+        BinaryIO: binary file object of the corpus
+    """
+    # use binary stdin if path is "-"
+    if input_path == "-":
+        return sys.stdin.buffer
+    # otherwise open the file in binary mode
+    return open(input_path, "rb")
+
+def skip_corpus_lines(corpus: BinaryIO, n_lines: int, byte_offset: int) -> None:
+    """This function moves the corpus to the position after given number of lines.
+    Seekable files are moved directly to the byte offset, streams (i.e. stdin) are read line by line.
+
+    Args:
+        corpus (BinaryIO): binary file object of the corpus
+        n_lines (int): number of lines to skip
+        byte_offset (int): byte offset of the position after skipped lines
+    """
+    # nothing to skip
+    if not n_lines:
+        return
+    # jump to the offset if file is seekable
+    if corpus.seekable():
+        corpus.seek(byte_offset)
+        return
+    # otherwise read and drop lines
+    for _ in range(n_lines):
+        if not corpus.readline():
+            break
+
+def iter_corpus_texts(corpus: BinaryIO, input_format: str = "text", text_key: str = "text") -> Iterator[tuple]:
+    """This function reads a corpus line by line and yields text of each line with line size in bytes.
+    Only one line is held in memory at a time. Blank lines of jsonl corpus have no text, they are
+    skipped and counted with the next line, so positions after yielded lines stay right.
+
+    Args:
+        corpus (BinaryIO): binary file object of the corpus
+        input_format (str, optional): "text" for plain text (one text per line) or "jsonl"
+            for json lines (a string or an object with text_key per line). Defaults to "text".
+        text_key (str, optional): key of the text in jsonl objects. Defaults to "text".
+
+    Yields:
+        Iterator[tuple]: tuple of text, number of bytes and number of lines read for the text
+            (more than one line if blank lines are skipped before it)
+    """
+    # bytes and lines of skipped blank lines
+    skipped_bytes, skipped_lines = 0, 0
+    # read each line
+    for line in iter(corpus.readline, b""):
+        # decode the line and remove new line characters
+        raw_text = line.decode("utf-8").rstrip("\r\n")
+        # parse json lines
+        if input_format == "jsonl":
+            # skip blank lines (i.e. at the end of file)
+            if not raw_text.strip():
+                skipped_bytes += len(line)
+                skipped_lines += 1
+                continue
+            line_data = json.loads(raw_text)
+            # line can be a string or an object containing the text
+            text = line_data if isinstance(line_data, str) else line_data[text_key]
+        else:
+            text = raw_text
+        # yield text with size of the line (and, skipped lines before it)
+        yield (text, skipped_bytes + len(line), skipped_lines + 1)
+        skipped_bytes, skipped_lines = 0, 0
+
+def read_checkpoint(checkpoint_path: str) -> dict:
+    """This function reads bulk extraction checkpoint. If checkpoint does not exist
+    it returns a checkpoint pointing to the start of input and output.
+
+    Args:
+        checkpoint_path (str): path of the checkpoint file
+
+    Returns:
+        dict: dictionary in format
+                {
+                    "lines": number_of_processed_lines,
+                    "input_offset": byte_offset_in_input,
+                    "output_offset": byte_offset_in_output,
+                }
+    """
+    # start from beginning if there is no checkpoint
+    if not checkpoint_path or not os.path.exists(checkpoint_path):
+        return {"lines": 0, "input_offset": 0, "output_offset": 0}
+    # read the checkpoint
+    with open(checkpoint_path, encoding="utf-8") as f:
+        return json.load(f)
+
+def write_checkpoint(checkpoint_path: str, checkpoint: dict) -> None:
+    """This function atomically writes bulk extraction checkpoint, so that a killed job never
+    leaves a partially written checkpoint.
+
+    Args:
+        checkpoint_path (str): path of the checkpoint file
+        checkpoint (dict): checkpoint in format returned by read_checkpoint
+    """
+    # write to a temporary file first
+    tmp_path = checkpoint_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(checkpoint, f)
+        f.flush()
+        os.fsync(f.fileno())
+    # replace old checkpoint with the new one
+    os.replace(tmp_path, checkpoint_path)
@@ -0,0 +1,112 @@
+import time
+import threading
+import unicodedata
+from collections import OrderedDict
+
+def normalize_text(text: str) -> str:
+    """This function normalizes text to be used as cache key. Text is converted to unicode NFC
+    form and all consecutive whitespace characters are replaced with a single space.
+
+    Args:
+        text (str): text to normalize
+
+    Returns:
+        str: normalized text
+    """
+    # convert to NFC form so that same bangla text typed differently gets same key
+    text = unicodedata.normalize("NFC", text)
+    # collapse whitespace and strip leading, trailing whitespace
+    return " ".join(text.split())
+
+class LRUCache(object):
+    """Thread safe, bounded least-recently-used cache with optional time-to-live.
+    """
+    def __init__(self, maxsize: int, ttl: float = None) -> None:
+        """Initialize LRUCache class.
+
+        Args:
+            maxsize (int): maximum number of entries. Least recently used entry is evicted when full.
+            ttl (float, optional): seconds after which an entry expires. Entries never expire
+                if None. Defaults to None.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        # key -> (value, expiry time)
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        # counters
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> object:
+        """This function returns cached value of the key and marks it as recently used.
+
+        Args:
+            key (str): key of the entry
+
+        Returns:
+            object: cached value, or None if key is not cached (or, expired)
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            # key is not cached
+            if entry is None:
+                self.misses += 1
+                return None
+            value, expires_at = entry
+            # key is cached but expired, so remove it
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            # mark as recently used
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: str, value: object) -> None:
+        """This function adds (or, updates) an entry and evicts least recently used entries if cache is full.
+
+        Args:
+            key (str): key of the entry
+            value (object): value to cache
+        """
+        # calculate expiry time of the entry
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            # evict least recently used entries
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """This function removes all entries from the cache. Counters are not reset.
+        """
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        """This function returns cache statistics.
+
+        Returns:
+            dict: dictionary with size, maxsize, hits, misses, evictions, expirations and hit_rate
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def __len__(self) -> int:
+        return len(self._data)
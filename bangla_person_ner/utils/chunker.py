@@ -0,0 +1,117 @@
+import re
+
+# sentence boundaries: bangla dari (।), double dari (॥), question, exclamation marks and new lines
+SENTENCE_BOUNDARY_RE = re.compile(r"[।॥?!]+|\n+")
+
+def split_sentences(text: str) -> list:
+    """This function splits text into sentences and returns character spans of the sentences.
+    Boundary characters are kept with the sentence they end. Leading and trailing whitespace of
+    sentences is excluded from spans and empty sentences are skipped.
+
+    Args:
+        text (str): text to split
+
+    Returns:
+        list: list of (start, end) character spans of sentences in text
+    """
+    # initialize variables
+    spans = []
+    start = 0
+    # cut text after each boundary, and at the end of text
+    boundaries = [match.end() for match in SENTENCE_BOUNDARY_RE.finditer(text)] + [len(text)]
+    for end in boundaries:
+        # exclude leading and trailing whitespace from span
+        sentence = text[start:end]
+        stripped = sentence.strip()
+        if stripped:
+            sentence_start = start + sentence.index(stripped[0])
+            spans.append((sentence_start, sentence_start + len(stripped)))
+        start = end
+    # return sentence spans
+    return spans
+
+def _split_long_span(text: str, start: int, end: int, max_chars: int) -> list:
+    """This function splits a span longer than max_chars at whitespace into spans of at most
+    max_chars characters. A word longer than max_chars is split at max_chars.
+
+    Args:
+        text (str): whole text
+        start (int): start of the span
+        end (int): end of the span
+        max_chars (int): maximum length of a span
+
+    Returns:
+        list: list of (start, end) character spans
+    """
+    spans = []
+    while end - start > max_chars:
+        # find last whitespace which keeps the piece within max_chars
+        cut = text.rfind(" ", start + 1, start + max_chars + 1)
+        if cut == -1:
+            cut = start + max_chars
+        spans.append((start, cut))
+        # skip whitespace at start of next piece
+        start = cut
+        while start < end and text[start].isspace():
+            start += 1
+    if start < end:
+        spans.append((start, end))
+    return spans
+
+def make_windows(text: str, max_chars: int, overlap_sentences: int = 1) -> list:
+    """This function groups sentences of text into windows of at most max_chars characters.
+    Consecutive windows share last overlap_sentences sentences of previous window, so that
+    a name near a window border is seen with context in at least one window.
+
+    Args:
+        text (str): text to split into windows
+        max_chars (int): maximum number of characters in a window
+        overlap_sentences (int, optional): number of sentences shared by consecutive windows. Defaults to 1.
+
+    Returns:
+        list: list of (start, end) character spans of windows in text
+    """
+    # split into sentences and split sentences longer than a window
+    sentences = []
+    for start, end in split_sentences(text):
+        sentences.extend(_split_long_span(text, start, end, max_chars))
+    # initialize variables
+    windows = []
+    first = 0
+    # each iteration creates one window starting from sentence at index first
+    while first < len(sentences):
+        last = first
+        # add sentences while window fits in max_chars
+        while last + 1 < len(sentences) and sentences[last + 1][1] - sentences[first][0] <= max_chars:
+            last += 1
+        windows.append((sentences[first][0], sentences[last][1]))
+        # stop if all sentences are covered
+        if last == len(sentences) - 1:
+            break
+        # start next window with overlapping sentences, but always move forward
+        first = max(last + 1 - overlap_sentences, first + 1)
+    # return window spans
+    return windows
+
+def merge_spans(spans: list) -> list:
+    """This function merges entity spans found in overlapping windows. Duplicate spans are
+    removed and for overlapping spans the longest one (first one if same length) is kept.
+
+    Args:
+        spans (list): list of (start_char, end_char, label) tuples in document offsets
+
+    Returns:
+        list: list of non overlapping (start_char, end_char, label) tuples sorted by start
+    """
+    # prefer longer spans, then earlier spans
+    sorted_spans = sorted(set(spans), key=lambda span: (-(span[1] - span[0]), span[0]))
+    # keep span if none of its characters is covered by an already kept span
+    kept = []
+    covered = set()
+    for span in sorted_spans:
+        chars = range(span[0], span[1])
+        if not covered.intersection(chars):
+            kept.append(span)
+            covered.update(chars)
+    # return spans sorted by start
+    return sorted(kept)
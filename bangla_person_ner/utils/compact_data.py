@@ -0,0 +1,342 @@
+import os
+import json
+import argparse
+from collections.abc import Sequence
+from itertools import chain
+from typing import Iterable, Iterator
+import numpy as np
+from ..config import config as cfg
+
+# keys of processed data
+DATA_KEYS = ("person", "no_person")
+# data types of arrays, tags have a handful of values
+TOKEN_DTYPE = np.int32
+TAG_DTYPE = np.uint8
+OFFSET_DTYPE = np.int64
+# number of ids kept in memory before they are appended to array files
+_FLUSH_SIZE = 1 << 16
+
+def _array_path(data_dir: str, key: str, name: str) -> str:
+    """This function returns path of an array file of compact data.
+
+    Args:
+        data_dir (str): directory of compact data
+        key (str): key of processed data, "person" or "no_person"
+        name (str): "tokens", "tags" or "offsets"
+
+    Returns:
+        str: path of the array file
+    """
+    return os.path.join(data_dir, f"{key}.{name}.bin")
+
+class CompactDataWriter(object):
+    """Writes processed sentences in compact format, one sentence at a time. Tokens and tags are
+    interned into a vocabulary and their ids are appended to flat integer arrays of each key,
+    with offsets of sentences in a separate array. A directory of compact data has
+
+        vocab.json                  : tokens and tags of the vocabulary, number of sentences of each key
+        {key}.tokens.bin            : token ids of all sentences (int32)
+        {key}.tags.bin              : tag ids of all sentences (uint8)
+        {key}.offsets.bin           : start of each sentence and end of the last one (int64)
+
+    vocab.json is written last, so a directory without it (i.e. writing failed) is never loaded.
+    """
+    def __init__(self, data_dir: str) -> None:
+        """Initialize CompactDataWriter class.
+
+        Args:
+            data_dir (str): directory of compact data, created if not exists
+        """
+        os.makedirs(data_dir, exist_ok=True)
+        self.data_dir = data_dir
+        # vocabulary of a previous write must not describe arrays of this one
+        self._vocab_path = os.path.join(data_dir, "vocab.json")
+        if os.path.exists(self._vocab_path):
+            os.remove(self._vocab_path)
+        self.token_ids = {}
+        self.tag_ids = {}
+        self.counts = dict.fromkeys(DATA_KEYS, 0)
+        self._files = {
+            (key, name): open(_array_path(data_dir, key, name), "wb")
+            for key in DATA_KEYS for name in ("tokens", "tags", "offsets")}
+        # ids (and, offsets) not written yet
+        self._buffers = {file_key: [] for file_key in self._files}
+        self._lengths = dict.fromkeys(DATA_KEYS, 0)
+        for key in DATA_KEYS:
+            self._buffers[(key, "offsets")].append(0)
+
+    def add(self, processed_dict: dict) -> None:
+        """This function adds a processed sentence.
+
+        Args:
+            processed_dict (dict): dictionary with "tokens" and "tags"
+
+        Raises:
+            ValueError: if there are more tags than uint8 can hold
+        """
+        tokens, tags = processed_dict["tokens"], processed_dict["tags"]
+        # same key as raw_data_processing
+        key = "no_person" if len(set(tags))==1 else "person"
+        token_ids, tag_ids = self.token_ids, self.tag_ids
+        sentence_tag_ids = [tag_ids.setdefault(tag, len(tag_ids)) for tag in tags]
+        # tag ids are stored as uint8, fail before an id which does not fit is written
+        if len(tag_ids) > np.iinfo(TAG_DTYPE).max + 1:
+            raise ValueError(f"Too many tags ({len(tag_ids)}) for compact format.")
+        self._buffers[(key, "tokens")].extend(
+            [token_ids.setdefault(token, len(token_ids)) for token in tokens])
+        self._buffers[(key, "tags")].extend(sentence_tag_ids)
+        self._lengths[key] += len(tokens)
+        self._buffers[(key, "offsets")].append(self._lengths[key])
+        self.counts[key] += 1
+        if len(self._buffers[(key, "tokens")]) >= _FLUSH_SIZE:
+            self._flush(key)
+
+    def _flush(self, key: str) -> None:
+        """This function appends buffered ids and offsets of a key to its array files.
+
+        Args:
+            key (str): key of processed data
+        """
+        for name, dtype in (("tokens", TOKEN_DTYPE), ("tags", TAG_DTYPE), ("offsets", OFFSET_DTYPE)):
+            buffer = self._buffers[(key, name)]
+            np.asarray(buffer, dtype=dtype).tofile(self._files[(key, name)])
+            buffer.clear()
+
+    def close(self) -> dict:
+        """This function writes remaining ids and the vocabulary.
+
+        Returns:
+            dict: number of sentences of each key
+        """
+        for key in DATA_KEYS:
+            self._flush(key)
+        for f in self._files.values():
+            f.close()
+        with open(self._vocab_path, "w", encoding="utf-8") as f:
+            json.dump({"tokens": list(self.token_ids), "tags": list(self.tag_ids), "counts": self.counts}, f, ensure_ascii=False)
+        return self.counts
+
+    def abort(self) -> None:
+        """This function closes and removes array files without writing the vocabulary, so that
+        partially written data is not left behind.
+        """
+        for (key, name), f in self._files.items():
+            f.close()
+            path = _array_path(self.data_dir, key, name)
+            if os.path.exists(path):
+                os.remove(path)
+
+    def __enter__(self) -> "CompactDataWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        # data is only complete if writing was not stopped by an exception
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+def save_compact_data(processed_dicts: Iterable[dict], data_dir: str) -> dict:
+    """This function streams processed sentences to a directory in compact format.
+
+    Args:
+        processed_dicts (Iterable[dict]): processed sentences, dictionaries with "tokens" and "tags"
+        data_dir (str): directory of compact data
+
+    Returns:
+        dict: number of sentences of each key ("person" and "no_person")
+    """
+    with CompactDataWriter(data_dir) as writer:
+        for processed_dict in processed_dicts:
+            writer.add(processed_dict)
+    return writer.counts
+
+def _memmap(path: str, dtype: object) -> np.ndarray:
+    """This function memory maps an array file read-only (empty files can not be mapped).
+
+    Args:
+        path (str): path of the array file
+        dtype (object): numpy data type of the array
+
+    Returns:
+        np.ndarray: memory mapped array
+    """
+    if os.path.getsize(path) == 0:
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r")
+
+class CompactDataset(object):
+    """Processed data in compact format (see CompactDataWriter). Arrays are memory mapped, so only
+    the vocabulary is loaded into memory and each token string exists once. Sentences are
+    decoded into dictionaries of tokens and tags when they are accessed.
+    """
+    def __init__(self, data_dir: str) -> None:
+        """Initialize CompactDataset class.
+
+        Args:
+            data_dir (str): directory of compact data
+        """
+        self.data_dir = data_dir
+        with open(os.path.join(data_dir, "vocab.json"), encoding="utf-8") as f:
+            vocab = json.load(f)
+        self.tokens = vocab["tokens"]
+        self.tags = vocab["tags"]
+        self.counts = vocab["counts"]
+        self._arrays = {
+            (key, name): _memmap(_array_path(data_dir, key, name), dtype)
+            for key in DATA_KEYS
+            for name, dtype in (("tokens", TOKEN_DTYPE), ("tags", TAG_DTYPE), ("offsets", OFFSET_DTYPE))}
+
+    def __len__(self) -> int:
+        return sum(self.counts.values())
+
+    def sentence(self, key: str, i: int) -> dict:
+        """This function decodes a sentence.
+
+        Args:
+            key (str): key of processed data, "person" or "no_person"
+            i (int): index of the sentence in the key
+
+        Returns:
+            dict: dictionary with "tokens" and "tags"
+        """
+        offsets = self._arrays[(key, "offsets")]
+        start, end = int(offsets[i]), int(offsets[i + 1])
+        tokens, tags = self.tokens, self.tags
+        return {
+            "tokens": [tokens[token_id] for token_id in self._arrays[(key, "tokens")][start:end].tolist()],
+            "tags": [tags[tag_id] for tag_id in self._arrays[(key, "tags")][start:end].tolist()],
+        }
+
+    def iter_sentences(self, key: str) -> Iterator[dict]:
+        """This function decodes sentences of a key in order.
+
+        Args:
+            key (str): key of processed data, "person" or "no_person"
+
+        Yields:
+            Iterator[dict]: dictionary with "tokens" and "tags"
+        """
+        for i in range(self.counts[key]):
+            yield self.sentence(key, i)
+
+    def sentences(self, key: str) -> "SentenceView":
+        """This function returns a lazy sequence of sentences of a key.
+
+        Args:
+            key (str): key of processed data, "person" or "no_person"
+
+        Returns:
+            SentenceView: sequence of sentences
+        """
+        n = self.counts[key]
+        return SentenceView([(self, key)], np.zeros(n, dtype=np.int32), np.arange(n, dtype=OFFSET_DTYPE))
+
+    def to_dict(self) -> dict:
+        """This function returns processed data in same format as process_text_data, with lazy
+        sequences in place of lists.
+
+        Returns:
+            dict: dictionary of "person" and "no_person" sentences
+        """
+        return {key: self.sentences(key) for key in DATA_KEYS}
+
+class SentenceView(Sequence):
+    """Lazy sequence of sentences of compact datasets. It keeps only references (source and row)
+    of sentences, so it can be concatenated (+) and subset (take) like lists without decoding them.
+    """
+    def __init__(self, sources: list, source_ids: np.ndarray, rows: np.ndarray) -> None:
+        """Initialize SentenceView class.
+
+        Args:
+            sources (list): list of (CompactDataset, key) tuples
+            source_ids (np.ndarray): index of source of each sentence
+            rows (np.ndarray): index of each sentence in its source
+        """
+        self.sources = sources
+        self.source_ids = source_ids
+        self.rows = rows
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __getitem__(self, i: int) -> dict:
+        if isinstance(i, slice):
+            return self.take(np.arange(len(self))[i])
+        dataset, key = self.sources[self.source_ids[i]]
+        return dataset.sentence(key, int(self.rows[i]))
+
+    def __iter__(self) -> Iterator[dict]:
+        for source_id, row in zip(self.source_ids.tolist(), self.rows.tolist()):
+            dataset, key = self.sources[source_id]
+            yield dataset.sentence(key, row)
+
+    def __add__(self, other: "SentenceView") -> "SentenceView":
+        return SentenceView(
+            self.sources + other.sources,
+            np.concatenate([self.source_ids, other.source_ids + len(self.sources)]).astype(np.int32),
+            np.concatenate([self.rows, other.rows]))
+
+    def take(self, positions: Iterable[int]) -> "SentenceView":
+        """This function returns sentences at given positions as a new view.
+
+        Args:
+            positions (Iterable[int]): positions of sentences in this view
+
+        Returns:
+            SentenceView: sequence of selected sentences
+        """
+        positions = np.asarray(positions, dtype=np.int64)
+        return SentenceView(self.sources, self.source_ids[positions], self.rows[positions])
+
+def processed_data_paths(data_format: str = cfg.PROCESSED_DATA_FORMAT) -> tuple:
+    """This function returns paths of processed data_1 and data_2 in a format.
+
+    Args:
+        data_format (str, optional): "compact" or "json". Defaults to cfg.PROCESSED_DATA_FORMAT.
+
+    Returns:
+        tuple: paths of processed data_1 and data_2
+    """
+    if data_format == "compact":
+        return (cfg.PROCESSED_DATA1_DIR, cfg.PROCESSED_DATA2_DIR)
+    return (cfg.PROCESSESED_DATA1_PATH, cfg.PROCESSESED_DATA2_PATH)
+
+def load_processed_data(data_path: str) -> dict:
+    """This function loads processed data, compact data from a directory or json from a file.
+
+    Args:
+        data_path (str): directory of compact data, or path of json data
+
+    Returns:
+        dict: dictionary of "person" and "no_person" sentences (lists for json, lazy sequences for compact data)
+    """
+    if os.path.isdir(data_path):
+        return CompactDataset(data_path).to_dict()
+    with open(data_path, encoding="utf-8") as f:
+        return json.load(f)
+
+def export_json(data_dir: str, json_save_path: str) -> dict:
+    """This function exports compact data as json, same file as saving processed data as json.
+
+    Args:
+        data_dir (str): directory of compact data
+        json_save_path (str): path to save json data
+
+    Returns:
+        dict: number of sentences of each key
+    """
+    from ..preprocessing.raw_data_processing import save_processed_data
+    dataset = CompactDataset(data_dir)
+    return save_processed_data(chain.from_iterable(dataset.iter_sentences(key) for key in DATA_KEYS), json_save_path)
+
+if __name__ == "__main__":
+    # create argument parser
+    parser = argparse.ArgumentParser(description='Export processed data in compact format as json.')
+    parser.add_argument('--data-dirs', nargs='+', default=processed_data_paths("compact"), help='directories of compact data.')
+    parser.add_argument('--json-paths', nargs='+', default=processed_data_paths("json"), help='paths to save json data, one per directory.')
+    # parse arguments
+    args = parser.parse_args()
+    for data_dir, json_path in zip(args.data_dirs, args.json_paths):
+        counts = export_json(data_dir, json_path)
+        print(f"Exported {sum(counts.values())} sentences : {data_dir} -> {json_path}")
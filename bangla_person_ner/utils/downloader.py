@@ -1,42 +1,238 @@
 import os
+import time
+import shutil
+import hashlib
 import requests
 import gdown
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 from ..config import config as cfg
 
-def download_data():
-    """This function downloads dataset using the links provided in the test description.
+# status codes of responses which are retried
+_RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+class IncompleteDownloadError(IOError):
+    """Raised when a response ends before all of its content is received."""
+
+def create_session(n_workers: int = cfg.DOWNLOAD_N_WORKERS) -> requests.Session:
+    """This function creates a session with a connection pool shared by download threads. Session
+    does not retry, failed requests are retried (and resumed) by download_file.
+
+    Args:
+        n_workers (int, optional): number of download threads, size of the connection pool. Defaults to cfg.DOWNLOAD_N_WORKERS.
+
+    Returns:
+        requests.Session: session for downloading
+    """
+    adapter = HTTPAdapter(pool_connections=n_workers, pool_maxsize=n_workers, max_retries=0)
+    session = requests.Session()
+    # ask for uncompressed content, so ranges and content length are in bytes of the file
+    session.headers["Accept-Encoding"] = "identity"
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+def _sha256(path: str) -> str:
+    """This function computes SHA-256 of a file.
+
+    Args:
+        path (str): path of the file
+
+    Returns:
+        str: hex digest
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _fetch(session: requests.Session, url: str, part_path: str, timeout: float) -> None:
+    """This function downloads a url to a partial file, continuing from its end with a range request
+    if it exists. If the server ignores the range, the file is downloaded from the start.
+
+    Args:
+        session (requests.Session): session for downloading
+        url (str): url of the file
+        part_path (str): path of the partial file
+        timeout (float): seconds to wait for connection and for each read
+
+    Raises:
+        requests.HTTPError: if the response has an error status
+        IncompleteDownloadError: if the response ends before all of its content is received
+    """
+    offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+    headers = {"Range": f"bytes={offset}-"} if offset else {}
+    with session.get(url, headers=headers, stream=True, timeout=timeout) as response:
+        if offset and response.status_code == 416:
+            # range starts at the end of the file, so the partial file is already complete
+            if response.headers.get("Content-Range", "") == f"bytes */{offset}":
+                return
+            # otherwise the partial file is stale, download from the start
+            os.remove(part_path)
+            return _fetch(session, url, part_path, timeout)
+        response.raise_for_status()
+        if response.status_code != 206:
+            offset = 0
+        expected = response.headers.get("Content-Length")
+        with open(part_path, "ab" if offset else "wb") as f:
+            for chunk in response.iter_content(chunk_size=1 << 16):
+                f.write(chunk)
+    if expected is not None and os.path.getsize(part_path) != offset + int(expected):
+        raise IncompleteDownloadError(f"Download of {url} ended after {os.path.getsize(part_path)} bytes.")
+
+def download_file(session: requests.Session, url: str, save_path: str, timeout: float = cfg.DOWNLOAD_TIMEOUT,
+                  retries: int = cfg.DOWNLOAD_RETRIES, backoff: float = cfg.DOWNLOAD_BACKOFF,
+                  checksums: dict = None) -> str:
+    """This function downloads a file unless it is already downloaded. Content is written to
+    save_path + ".part" and moved to save_path when complete and verified, so an interrupted
+    download resumes from the partial file. Failed connections, cut off responses and responses
+    with temporary error status are retried with exponential backoff.
+
+    Args:
+        session (requests.Session): session for downloading (see create_session)
+        url (str): url of the file
+        save_path (str): path to save the file
+        timeout (float, optional): seconds to wait for connection and for each read. Defaults to cfg.DOWNLOAD_TIMEOUT.
+        retries (int, optional): number of retries of a failed request. Defaults to cfg.DOWNLOAD_RETRIES.
+        backoff (float, optional): backoff factor in seconds. Defaults to cfg.DOWNLOAD_BACKOFF.
+        checksums (dict, optional): expected SHA-256 by url, files without an entry are not
+            verified. Defaults to None (no verification).
+
+    Raises:
+        requests.HTTPError: if the response has an error status which is not temporary, or retries are exhausted
+        ValueError: if SHA-256 of the downloaded file does not match its checksum
+
+    Returns:
+        str: path of the downloaded file
     """
-    # create data folders
-    os.makedirs(os.path.dirname(cfg.RAW_DATA1_FILE_PATH), exist_ok=True)
-    # url for data_1 (https://github.com/Rifat1493/Bengali-NER/tree/master/annotated%20data)
-    url_1 = 'https://raw.githubusercontent.com/Rifat1493/Bengali-NER/master/annotated%20data/'
-    # create an empty file
-    open(cfg.RAW_DATA1_FILE_PATH, "w")
-    # there is total 20 text file in the repository, we will download all of them using loop
-    for i in range(1,21):
-        # if i!=1:
-        #     continue
-        # create url for each file 
-        url = url_1 + str(i) + ".txt"
-        # get the data
-        res = requests.get(url)
-        # append the data to a text file
-        with open(cfg.RAW_DATA1_FILE_PATH, "a", encoding="utf-8") as file:
-            # take the text from the web response and remove first character which is an extra character
-            text_data = res.text
-            file.write(text_data[1:])
+    expected_sha256 = (checksums or {}).get(url)
+    if os.path.exists(save_path) and (expected_sha256 is None or _sha256(save_path) == expected_sha256):
+        return save_path
+    part_path = save_path + ".part"
+    for attempt in range(retries + 1):
+        try:
+            _fetch(session, url, part_path, timeout)
+            break
+        except requests.HTTPError as e:
+            # only temporary error status is retried
+            if e.response is None or e.response.status_code not in _RETRY_STATUSES or attempt == retries:
+                raise
+        except (IncompleteDownloadError, requests.ConnectionError, requests.Timeout,
+                requests.exceptions.ChunkedEncodingError):
+            # retry from the end of partial file
+            if attempt == retries:
+                raise
+        time.sleep(backoff * 2**attempt)
+    if expected_sha256 is not None and _sha256(part_path) != expected_sha256:
+        # corrupt content can not be resumed
+        os.remove(part_path)
+        raise ValueError(f"SHA-256 of {url} does not match its checksum.")
+    os.replace(part_path, save_path)
+    return save_path
+
+def download_files(urls: list, save_dir: str, session: requests.Session = None,
+                   n_workers: int = cfg.DOWNLOAD_N_WORKERS, **kwargs) -> list:
+    """This function downloads files concurrently with a bounded number of threads.
+
+    Args:
+        urls (list): urls of files
+        save_dir (str): directory to save files, file i is saved as "i" + extension of its url
+        session (requests.Session, optional): session for downloading. Defaults to None, a new session.
+        n_workers (int, optional): number of download threads. Defaults to cfg.DOWNLOAD_N_WORKERS.
+        kwargs: arguments of download_file
+
+    Returns:
+        list: paths of downloaded files, in order of urls
+    """
+    os.makedirs(save_dir, exist_ok=True)
+    session = session or create_session(n_workers)
+    save_paths = [os.path.join(save_dir, f"{i}{os.path.splitext(url)[1]}") for i, url in enumerate(urls)]
+    with ThreadPoolExecutor(max_workers=n_workers) as executor:
+        futures = [executor.submit(download_file, session, url, save_path, **kwargs)
+                   for url, save_path in zip(urls, save_paths)]
+        # results in order of urls, first error is raised after other downloads finish
+        return [future.result() for future in futures]
+
+def _write_atomic(save_path: str, write: object) -> None:
+    """This function writes a file through a temporary file, so save_path is never truncated.
+
+    Args:
+        save_path (str): path of the file
+        write (Callable): function writing content to an opened binary file
+    """
+    os.makedirs(os.path.dirname(save_path), exist_ok=True)
+    tmp_path = save_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        write(f)
+    os.replace(tmp_path, save_path)
+
+def download_data_1(base_url: str = cfg.DATA1_BASE_URL, n_files: int = cfg.DATA1_N_FILES,
+                    save_path: str = cfg.RAW_DATA1_FILE_PATH, download_dir: str = cfg.DOWNLOAD_DIR,
+                    session: requests.Session = None, n_workers: int = cfg.DOWNLOAD_N_WORKERS, checksums: dict = None):
+    """This function downloads data_1 (https://github.com/Rifat1493/Bengali-NER/tree/master/annotated%20data).
+
+    Args:
+        base_url (str, optional): url of directory of text files. Defaults to cfg.DATA1_BASE_URL.
+        n_files (int, optional): number of text files. Defaults to cfg.DATA1_N_FILES.
+        save_path (str, optional): path to save data_1. Defaults to cfg.RAW_DATA1_FILE_PATH.
+        download_dir (str, optional): directory of downloaded files. Defaults to cfg.DOWNLOAD_DIR.
+        session (requests.Session, optional): session for downloading. Defaults to None, a new session.
+        n_workers (int, optional): number of download threads. Defaults to cfg.DOWNLOAD_N_WORKERS.
+        checksums (dict, optional): expected SHA-256 of text files by url. Defaults to None (no verification).
+    """
+    # there is total 20 text file in the repository, we will download all of them at once
+    urls = [base_url + str(i) + ".txt" for i in range(1, n_files + 1)]
+    file_dir = os.path.join(download_dir, "data_1")
+    file_paths = download_files(urls, file_dir, session, n_workers, checksums=checksums)
+    def write(f):
+        # join files in order of their number
+        for file_path in file_paths:
+            with open(file_path, "rb") as text_file:
+                # remove first character which is an extra character
+                text_data = text_file.read().decode("utf-8", errors="replace")
             # add a new line character as this dataset contains sentences seperated with new line
-            file.write("\n")
-
-    # url for data_2 (https://raw.githubusercontent.com/banglakit/bengali-ner-data/master/main.jsonl)
-    url_2 = 'https://raw.githubusercontent.com/banglakit/bengali-ner-data/master/main.jsonl'
-    # get the data
-    res = requests.get(url_2)
-    # create data folders
-    os.makedirs(os.path.dirname(cfg.RAW_DATA2_FILE_PATH), exist_ok=True)
-    # write the data to a text file
-    with open(cfg.RAW_DATA2_FILE_PATH, "w", encoding="utf-8") as file:
-        file.write(res.text)
+            f.write((text_data[1:] + "\n").encode("utf-8"))
+    _write_atomic(save_path, write)
+    shutil.rmtree(file_dir)
+
+def download_data_2(url: str = cfg.DATA2_URL, save_path: str = cfg.RAW_DATA2_FILE_PATH,
+                    download_dir: str = cfg.DOWNLOAD_DIR, session: requests.Session = None, checksums: dict = None):
+    """This function downloads data_2 (https://raw.githubusercontent.com/banglakit/bengali-ner-data/master/main.jsonl).
+
+    Args:
+        url (str, optional): url of data_2. Defaults to cfg.DATA2_URL.
+        save_path (str, optional): path to save data_2. Defaults to cfg.RAW_DATA2_FILE_PATH.
+        download_dir (str, optional): directory of downloaded files. Defaults to cfg.DOWNLOAD_DIR.
+        session (requests.Session, optional): session for downloading. Defaults to None, a new session.
+        checksums (dict, optional): expected SHA-256 by url. Defaults to None (no verification).
+    """
+    file_dir = os.path.join(download_dir, "data_2")
+    file_path = download_files([url], file_dir, session, n_workers=1, checksums=checksums)[0]
+    def write(f):
+        with open(file_path, "rb") as jsonl_file:
+            f.write(jsonl_file.read().decode("utf-8", errors="replace").encode("utf-8"))
+    _write_atomic(save_path, write)
+    shutil.rmtree(file_dir)
+
+def download_data(missing_only: bool = False, n_workers: int = cfg.DOWNLOAD_N_WORKERS, checksums: dict = None):
+    """This function downloads dataset using the links provided in the test description.
+
+    Args:
+        missing_only (bool, optional): If set True only files which do not exist are downloaded. Defaults to False.
+        n_workers (int, optional): number of download threads. Defaults to cfg.DOWNLOAD_N_WORKERS.
+        checksums (dict, optional): expected SHA-256 of downloaded files by url. Defaults to None (no verification).
+    """
+    # one connection pool for both data
+    session = create_session(n_workers)
+    downloads = (
+        (cfg.RAW_DATA1_FILE_PATH, lambda: download_data_1(session=session, n_workers=n_workers, checksums=checksums)),
+        (cfg.RAW_DATA2_FILE_PATH, lambda: download_data_2(session=session, checksums=checksums)),
+    )
+    for data_path, download in downloads:
+        if missing_only and os.path.exists(data_path):
+            continue
+        download()
     # print a message after completion of downloading data
     print("Successfully downloaded data.")
 
@@ -49,4 +245,4 @@ def download_model():
 
 if __name__ == "__main__":
     # download pretrained model
-    download_model()
\ No newline at end of file
+    download_model()
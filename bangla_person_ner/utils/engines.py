@@ -0,0 +1,231 @@
+import os
+import argparse
+from ..config import config as cfg
+
+# inference engines that can be selected in BanglaPersorNer
+#   spacy     : stock pipeline, transformer runs in fp32 pytorch
+#   int8      : transformer linear layers are dynamically quantized to int8 with pytorch
+#   onnx      : transformer runs in onnxruntime from exported model (see export_onnx)
+#   onnx-int8 : same as onnx, using dynamically quantized int8 onnx model
+#   gazetteer : no model, known names are matched with rules (see utils.gazetteer)
+ENGINES = ("spacy", "int8", "onnx", "onnx-int8", "gazetteer")
+
+# input names of the exported transformer, in order of huggingface model forward arguments
+_ONNX_INPUT_NAMES = ["input_ids", "attention_mask", "token_type_ids"]
+
+def _iter_torch_shims(nlp: object) -> object:
+    """This function finds thinc pytorch shims which hold huggingface transformer of the pipeline.
+
+    Args:
+        nlp (object): Spacy Language object with a "transformer" component
+
+    Yields:
+        object: thinc PyTorchShim object, shim._model is the torch module
+    """
+    import torch
+    transformer = nlp.get_pipe("transformer")
+    for node in transformer.model.walk():
+        for shim in node.shims:
+            if isinstance(getattr(shim, "_model", None), torch.nn.Module):
+                yield shim
+
+def quantize_int8(nlp: object) -> object:
+    """This function replaces linear layers of the transformer with dynamically quantized int8
+    layers. Only works on CPU.
+
+    Args:
+        nlp (object): Spacy Language object with a "transformer" component
+
+    Returns:
+        object: same Spacy Language object with quantized transformer
+    """
+    import torch
+    for shim in _iter_torch_shims(nlp):
+        shim._model = torch.quantization.quantize_dynamic(shim._model, {torch.nn.Linear}, dtype=torch.qint8)
+    return nlp
+
+def export_onnx(nlp: object, onnx_path: str = cfg.ONNX_MODEL_PATH, quantize: bool = True) -> str:
+    """This function exports transformer of the pipeline to an onnx model. If quantize is True,
+    a dynamically quantized int8 model is also saved next to it with ".int8.onnx" suffix.
+
+    Args:
+        nlp (object): Spacy Language object with a "transformer" component
+        onnx_path (str, optional): path of the onnx model. Defaults to cfg.ONNX_MODEL_PATH.
+        quantize (bool, optional): If set True also saves int8 model. Defaults to True.
+
+    Returns:
+        str: path of the onnx model
+    """
+    import torch
+
+    class _LastHiddenState(torch.nn.Module):
+        """Wraps huggingface model so that exported graph returns only last hidden state.
+        """
+        def __init__(self, hf_model: torch.nn.Module) -> None:
+            super().__init__()
+            self.hf_model = hf_model
+
+        def forward(self, input_ids, attention_mask, token_type_ids):
+            return self.hf_model(
+                input_ids=input_ids, attention_mask=attention_mask, token_type_ids=token_type_ids).last_hidden_state
+
+    # get huggingface model of the pipeline
+    hf_model = next(_iter_torch_shims(nlp))._model.eval()
+    # dummy inputs, batch and sequence axes are dynamic
+    dummy_inputs = (
+        torch.ones((1, 8), dtype=torch.long),
+        torch.ones((1, 8), dtype=torch.long),
+        torch.zeros((1, 8), dtype=torch.long),
+    )
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in _ONNX_INPUT_NAMES}
+    dynamic_axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+    # create directories and export the model
+    os.makedirs(os.path.dirname(os.path.abspath(onnx_path)), exist_ok=True)
+    with torch.no_grad():
+        torch.onnx.export(
+            _LastHiddenState(hf_model), dummy_inputs, onnx_path, input_names=_ONNX_INPUT_NAMES,
+            output_names=["last_hidden_state"], dynamic_axes=dynamic_axes, opset_version=14)
+    # save int8 model
+    if quantize:
+        from onnxruntime.quantization import quantize_dynamic, QuantType
+        quantize_dynamic(onnx_path, _int8_onnx_path(onnx_path), weight_type=QuantType.QInt8)
+    return onnx_path
+
+def _int8_onnx_path(onnx_path: str) -> str:
+    """This function returns path of the int8 onnx model for an onnx model path.
+
+    Args:
+        onnx_path (str): path of the onnx model
+
+    Returns:
+        str: path of the int8 onnx model
+    """
+    return os.path.splitext(onnx_path)[0] + ".int8.onnx"
+
+def attach_onnx(nlp: object, onnx_path: str = cfg.ONNX_MODEL_PATH) -> object:
+    """This function replaces torch transformer of the pipeline with an onnxruntime session
+    of the exported model. Rest of the pipeline (tokenization, span handling, NER head) is not changed.
+
+    Args:
+        nlp (object): Spacy Language object with a "transformer" component
+        onnx_path (str, optional): path of the onnx model. Defaults to cfg.ONNX_MODEL_PATH.
+
+    Returns:
+        object: same Spacy Language object running transformer with onnxruntime
+    """
+    import torch
+    import onnxruntime
+    from transformers.modeling_outputs import BaseModelOutput
+
+    class _OnnxTransformer(torch.nn.Module):
+        """Torch module with huggingface model interface which runs an onnxruntime session.
+        """
+        def __init__(self, session: object, config: object) -> None:
+            super().__init__()
+            self.session = session
+            self.config = config
+            self.input_names = [model_input.name for model_input in session.get_inputs()]
+            # pytorch shim reads device from parameters, so keep a tiny one on cpu
+            self._device_anchor = torch.nn.Parameter(torch.zeros(1), requires_grad=False)
+
+        def forward(self, input_ids=None, attention_mask=None, token_type_ids=None, **kwargs):
+            inputs = {"input_ids": input_ids, "attention_mask": attention_mask, "token_type_ids": token_type_ids}
+            # token_type_ids is optional in huggingface models
+            if inputs["token_type_ids"] is None:
+                inputs["token_type_ids"] = torch.zeros_like(input_ids)
+            feeds = {name: inputs[name].cpu().numpy() for name in self.input_names}
+            last_hidden_state = self.session.run(["last_hidden_state"], feeds)[0]
+            return BaseModelOutput(last_hidden_state=torch.from_numpy(last_hidden_state))
+
+    session = onnxruntime.InferenceSession(onnx_path, providers=["CPUExecutionProvider"])
+    for shim in _iter_torch_shims(nlp):
+        shim._model = _OnnxTransformer(session, shim._model.config)
+    return nlp
+
+def add_doc_cleaner(nlp: object) -> object:
+    """This function adds spacy "doc_cleaner" component at the end of the pipeline, which drops
+    tensors and transformer output (cfg.LEAN_CLEANED_ATTRS) from each Doc after prediction, so
+    that activations of a batch are released as soon as the batch is done.
+
+    Args:
+        nlp (object): Spacy Language object
+
+    Returns:
+        object: same Spacy Language object with "doc_cleaner" component
+    """
+    if "doc_cleaner" not in nlp.pipe_names:
+        # silent, as models without transformer (i.e. student model) do not have "_.trf_data"
+        nlp.add_pipe("doc_cleaner", config={"attrs": dict(cfg.LEAN_CLEANED_ATTRS), "silent": True})
+    return nlp
+
+def load_model(engine: str = "spacy", model_dir: str = cfg.MODEL_DIR, lean: bool = False,
+               basic_tokenizer: bool = cfg.USE_BASIC_TOKENIZER, snapshot: bool = cfg.USE_MODEL_SNAPSHOT) -> object:
+    """This function loads the model for the given inference engine.
+
+    Args:
+        engine (str, optional): one of ENGINES. Defaults to "spacy".
+        model_dir (str, optional): directory of the spacy model. Defaults to cfg.MODEL_DIR.
+        lean (bool, optional): If set True, Docs returned by the model do not keep tensors and
+            transformer output (see add_doc_cleaner). Defaults to False.
+        basic_tokenizer (bool, optional): If set True, the model tokenizes with BasicTokenizer
+            like training data (see utils.spacy_tokenizer). Defaults to cfg.USE_BASIC_TOKENIZER.
+        snapshot (bool, optional): If set True, the model is loaded from its snapshot when it is
+            up to date, with memory mapped weights (see utils.snapshot). Defaults to cfg.USE_MODEL_SNAPSHOT.
+
+    Returns:
+        object: Spacy Language object (or, GazetteerModel object for "gazetteer" engine)
+    """
+    # rule based engine does not need the model and has no activations
+    if engine == "gazetteer":
+        from .gazetteer import GazetteerModel
+        return GazetteerModel.from_file(cfg.GAZETTEER_PATH)
+    import spacy
+    # registers BasicTokenizer, which models trained with it reference in their config
+    from .spacy_tokenizer import use_basic_tokenizer
+    from .snapshot import snapshot_dir_for, is_snapshot_fresh, load_snapshot
+    # Load the model (from its snapshot if it is up to date) and convert it to run on the engine
+    snapshot_dir = snapshot_dir_for(model_dir)
+    if snapshot and is_snapshot_fresh(snapshot_dir, model_dir):
+        nlp = load_snapshot(snapshot_dir)
+    else:
+        nlp = spacy.load(model_dir)
+    nlp = apply_engine(nlp, engine)
+    if basic_tokenizer:
+        use_basic_tokenizer(nlp)
+    return add_doc_cleaner(nlp) if lean else nlp
+
+def apply_engine(nlp: object, engine: str = "spacy", onnx_path: str = cfg.ONNX_MODEL_PATH) -> object:
+    """This function converts a loaded pipeline to run on the given inference engine.
+
+    Args:
+        nlp (object): Spacy Language object
+        engine (str, optional): one of ENGINES. Defaults to "spacy".
+        onnx_path (str, optional): path of the onnx model (for onnx engines). Defaults to cfg.ONNX_MODEL_PATH.
+
+    Raises:
+        ValueError: if engine is not one of ENGINES (or, is "gazetteer" which does not use the model)
+
+    Returns:
+        object: Spacy Language object running on the engine
+    """
+    if engine not in ENGINES or engine == "gazetteer":
+        raise ValueError(f"Engine {engine!r} can not be applied to a spacy pipeline.")
+    if engine == "int8":
+        return quantize_int8(nlp)
+    if engine == "onnx":
+        return attach_onnx(nlp, onnx_path)
+    if engine == "onnx-int8":
+        return attach_onnx(nlp, _int8_onnx_path(onnx_path))
+    return nlp
+
+if __name__ == "__main__":
+    import spacy
+    # create argument parser
+    parser = argparse.ArgumentParser(description='Export transformer of the model to onnx (and, int8 onnx).')
+    parser.add_argument('-o', '--output', type=str, default=cfg.ONNX_MODEL_PATH, help='path of the onnx model.')
+    parser.add_argument('--no-quantize', action='store_true', help='do not save int8 onnx model.')
+    # parse arguments
+    args = parser.parse_args()
+    # load stock pipeline and export its transformer
+    onnx_path = export_onnx(spacy.load(cfg.MODEL_DIR), onnx_path=args.output, quantize=not args.no_quantize)
+    print(f"Exported onnx model to : {onnx_path}")
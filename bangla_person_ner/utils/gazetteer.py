@@ -0,0 +1,120 @@
+import os
+import json
+import argparse
+from typing import Iterable, Iterator
+from .lexicon import iter_person_spans_from_processed, iter_person_spans_from_docbin
+from ..config import config as cfg
+
+class GazetteerModel(object):
+    """Rule based name extraction engine. Text is tokenized with BasicTokenizer (same as training
+    data) and known names (token sequences of PERSON entities in training data) are found with
+    spacy PhraseMatcher. It has the parts of spacy Language interface used by BanglaPersorNer
+    (__call__, pipe, make_doc), so it can be used in place of the model.
+    """
+    def __init__(self, name_spans: Iterable[list], label: str = "PERSON") -> None:
+        """Initialize GazetteerModel class.
+
+        Args:
+            name_spans (Iterable[list]): lists of tokens of known names
+            label (str, optional): label of matched entities. Defaults to "PERSON".
+        """
+        import spacy
+        from spacy.matcher import PhraseMatcher
+        from spacy.tokens import Doc
+        from .spacy_tokenizer import SpacyBasicTokenizer
+        self.nlp = spacy.blank("bn")
+        self.vocab = self.nlp.vocab
+        self.label = label
+        self._tokenizer = SpacyBasicTokenizer(self.vocab)
+        # compile unique names into phrase matcher
+        self.names = sorted({tuple(tokens) for tokens in name_spans if tokens})
+        self._matcher = PhraseMatcher(self.vocab)
+        self._matcher.add(label, [Doc(self.vocab, words=list(tokens)) for tokens in self.names])
+
+    @classmethod
+    def from_file(cls, gazetteer_path: str = cfg.GAZETTEER_PATH) -> "GazetteerModel":
+        """This function creates the engine from names saved with save_gazetteer.
+
+        Args:
+            gazetteer_path (str, optional): path of the gazetteer file. Defaults to cfg.GAZETTEER_PATH.
+
+        Returns:
+            GazetteerModel: gazetteer engine
+        """
+        with open(gazetteer_path, encoding="utf-8") as f:
+            return cls(json.loads(line) for line in f if line.strip())
+
+    def make_doc(self, text: str) -> object:
+        """This function tokenizes text with BasicTokenizer and creates a Doc object.
+
+        Args:
+            text (str): text to tokenize
+
+        Returns:
+            object: Spacy.tokens.Doc object
+        """
+        return self._tokenizer(text)
+
+    def __call__(self, text: str) -> object:
+        """This function finds known names in text.
+
+        Args:
+            text (str): text to be inferenced on
+
+        Returns:
+            object: Spacy.tokens.Doc object with names as entities
+        """
+        from spacy.util import filter_spans
+        doc = self.make_doc(text)
+        # keep longest match where matches overlap
+        doc.ents = filter_spans(self._matcher(doc, as_spans=True))
+        return doc
+
+    def pipe(self, texts: Iterable, as_tuples: bool = False, batch_size: int = None, n_process: int = 1) -> Iterator:
+        """This function finds known names in each text, same interface as spacy Language.pipe.
+        batch_size and n_process are accepted for compatibility and ignored.
+
+        Args:
+            texts (Iterable): texts, or (text, context) tuples if as_tuples is True
+            as_tuples (bool, optional): If set True yields (Doc, context) tuples. Defaults to False.
+            batch_size (int, optional): ignored. Defaults to None.
+            n_process (int, optional): ignored. Defaults to 1.
+
+        Yields:
+            Iterator: Spacy.tokens.Doc objects, or (Doc, context) tuples
+        """
+        if as_tuples:
+            for text, context in texts:
+                yield (self(text), context)
+        else:
+            for text in texts:
+                yield self(text)
+
+def save_gazetteer(name_spans: Iterable[list], gazetteer_path: str = cfg.GAZETTEER_PATH) -> int:
+    """This function saves unique names as json lines, one token list per line.
+
+    Args:
+        name_spans (Iterable[list]): lists of tokens of names
+        gazetteer_path (str, optional): path of the gazetteer file. Defaults to cfg.GAZETTEER_PATH.
+
+    Returns:
+        int: number of saved names
+    """
+    names = sorted({tuple(tokens) for tokens in name_spans if tokens})
+    os.makedirs(os.path.dirname(gazetteer_path), exist_ok=True)
+    with open(gazetteer_path, "w", encoding="utf-8") as f:
+        for tokens in names:
+            f.write(json.dumps(list(tokens), ensure_ascii=False) + "\n")
+    return len(names)
+
+if __name__ == "__main__":
+    # create argument parser
+    parser = argparse.ArgumentParser(description='Build name gazetteer from PERSON entities of processed data.')
+    parser.add_argument('-o', '--output', type=str, default=cfg.GAZETTEER_PATH, help='path of the gazetteer file.')
+    parser.add_argument('--from-docbin', type=str, default="", help='build from spacy binary data (i.e. train.spacy) instead.')
+    # parse arguments
+    args = parser.parse_args()
+    # collect names and save
+    spans = iter_person_spans_from_docbin(args.from_docbin) if args.from_docbin else iter_person_spans_from_processed()
+    n_names = save_gazetteer(spans, args.output)
+    print(f"Saved {n_names} names at : {args.output}")
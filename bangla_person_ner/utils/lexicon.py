@@ -0,0 +1,118 @@
+import os
+import argparse
+from typing import Iterable, Iterator
+from .compact_data import load_processed_data, processed_data_paths
+from ..config import config as cfg
+
+def biluo_to_spans(tags: list) -> list:
+    """This function finds entity spans in a list of BILUO tags.
+
+    Args:
+        tags (list): list of BILUO tags, i.e. ["B-PERSON", "L-PERSON", "O"]
+
+    Returns:
+        list: list of (label, start, end) tuples, end is exclusive
+    """
+    spans = []
+    start = None
+    for i, tag in enumerate(tags):
+        prefix, _, label = tag.partition("-")
+        # single token entity
+        if prefix == "U":
+            spans.append((label, i, i + 1))
+            start = None
+        # start of a multi token entity
+        elif prefix == "B":
+            start = i
+        # end of a multi token entity
+        elif prefix == "L" and start is not None:
+            spans.append((label, start, i + 1))
+            start = None
+        # outside of entity
+        elif prefix == "O":
+            start = None
+    return spans
+
+def iter_person_spans_from_processed(data_paths: Iterable[str] = None) -> Iterator[list]:
+    """This function yields tokens of each PERSON entity in processed data (output of raw_data_processing).
+
+    Args:
+        data_paths (Iterable[str], optional): paths of processed json data (or, directories of compact data).
+            Defaults to None, paths of processed data in cfg.PROCESSED_DATA_FORMAT.
+
+    Yields:
+        Iterator[list]: list of tokens of an entity
+    """
+    if data_paths is None:
+        data_paths = processed_data_paths()
+    for data_path in data_paths:
+        processed_data = load_processed_data(data_path)
+        # only sentences with person tag have entities
+        for processed_dict in processed_data["person"]:
+            tokens = processed_dict["tokens"]
+            for label, start, end in biluo_to_spans(processed_dict["tags"]):
+                if label == "PERSON":
+                    yield tokens[start:end]
+
+def iter_person_spans_from_docbin(data_path: str = cfg.TRAIN_DATA_PATH) -> Iterator[list]:
+    """This function yields tokens of each PERSON entity in spacy binary data.
+
+    Args:
+        data_path (str, optional): path of spacy binary data. Defaults to cfg.TRAIN_DATA_PATH.
+
+    Yields:
+        Iterator[list]: list of tokens of an entity
+    """
+    import spacy
+    from spacy.tokens import DocBin
+    vocab = spacy.blank("bn").vocab
+    for doc in DocBin().from_disk(data_path).get_docs(vocab):
+        for entity in doc.ents:
+            if entity.label_ == "PERSON":
+                yield [token.text for token in entity]
+
+def build_name_lexicon(spans: Iterable[list], min_length: int = cfg.LEXICON_MIN_TOKEN_LENGTH) -> set:
+    """This function builds a lexicon of tokens which appear in person names.
+
+    Args:
+        spans (Iterable[list]): lists of tokens of entities
+        min_length (int, optional): tokens shorter than this are not added. Defaults to cfg.LEXICON_MIN_TOKEN_LENGTH.
+
+    Returns:
+        set: set of name tokens
+    """
+    return {token for tokens in spans for token in tokens if len(token) >= min_length}
+
+def save_lexicon(lexicon: Iterable[str], lexicon_path: str = cfg.NAME_LEXICON_PATH) -> None:
+    """This function saves a lexicon as text file, one token per line.
+
+    Args:
+        lexicon (Iterable[str]): tokens
+        lexicon_path (str, optional): path of the lexicon file. Defaults to cfg.NAME_LEXICON_PATH.
+    """
+    os.makedirs(os.path.dirname(lexicon_path), exist_ok=True)
+    with open(lexicon_path, "w", encoding="utf-8") as f:
+        f.write("\n".join(sorted(lexicon)))
+
+def load_lexicon(lexicon_path: str = cfg.NAME_LEXICON_PATH) -> set:
+    """This function loads a lexicon saved with save_lexicon.
+
+    Args:
+        lexicon_path (str, optional): path of the lexicon file. Defaults to cfg.NAME_LEXICON_PATH.
+
+    Returns:
+        set: set of tokens
+    """
+    with open(lexicon_path, encoding="utf-8") as f:
+        return {line for line in f.read().split("\n") if line}
+
+if __name__ == "__main__":
+    # create argument parser
+    parser = argparse.ArgumentParser(description='Build name lexicon from PERSON entities of processed data.')
+    parser.add_argument('-o', '--output', type=str, default=cfg.NAME_LEXICON_PATH, help='path of the lexicon file.')
+    # parse arguments
+    args = parser.parse_args()
+    # build and save lexicon
+    lexicon = build_name_lexicon(iter_person_spans_from_processed())
+    save_lexicon(lexicon, args.output)
+    print(f"Saved {len(lexicon)} name tokens at : {args.output}")
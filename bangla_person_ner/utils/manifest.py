@@ -0,0 +1,188 @@
+import os
+import json
+import hashlib
+from typing import Callable
+from ..config import config as cfg
+
+def file_sha256(path: str, chunk_size: int = 1 << 20) -> str:
+    """This function computes SHA-256 of a file, reading it in chunks.
+
+    Args:
+        path (str): path of the file
+        chunk_size (int, optional): number of bytes read at a time. Defaults to 1 << 20.
+
+    Returns:
+        str: hex digest
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _iter_files(path: str) -> list:
+    """This function lists a file, or all files under a directory in sorted order.
+
+    Args:
+        path (str): path of a file or directory
+
+    Returns:
+        list: paths of files
+    """
+    if not os.path.isdir(path):
+        return [path]
+    files = []
+    for root, dirs, names in os.walk(path):
+        dirs.sort()
+        files.extend(os.path.join(root, name) for name in sorted(names))
+    return files
+
+def code_version(*modules: object) -> str:
+    """This function computes a version of code as SHA-256 of source files of modules, so that a
+    stage is rebuilt when its code changes.
+
+    Args:
+        modules (object): python modules (or, paths of source files)
+
+    Returns:
+        str: hex digest
+    """
+    digest = hashlib.sha256()
+    for module in modules:
+        path = module if isinstance(module, str) else module.__file__
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+class StageManifest(object):
+    """Manifest of pipeline stages saved as json. For each stage it records SHA-256 of its input
+    and output files, its parameters (config values) and version of its code. A stage is up to
+    date when none of these changed and its outputs are still the recorded files. Hashes are
+    cached by file size and modification time, so unchanged files are not read again.
+    """
+    def __init__(self, manifest_path: str = cfg.MANIFEST_PATH) -> None:
+        """Initialize StageManifest class.
+
+        Args:
+            manifest_path (str, optional): path of the manifest file. Defaults to cfg.MANIFEST_PATH.
+        """
+        self.manifest_path = manifest_path
+        # paths are recorded relative to directory of the manifest, so the project can be moved
+        self._base_dir = os.path.dirname(os.path.abspath(manifest_path))
+        self.stages = {}
+        if os.path.exists(manifest_path):
+            with open(manifest_path, encoding="utf-8") as f:
+                self.stages = json.load(f)
+        # absolute path to {"size", "mtime_ns", "sha256"} of files hashed in this run or recorded before
+        self._hash_cache = {
+            os.path.normpath(os.path.join(self._base_dir, path)): entry for record in self.stages.values()
+            for files in (record.get("inputs", {}), record.get("outputs", {}))
+            for path, entry in files.items() if entry is not None}
+
+    def hash_file(self, path: str) -> dict:
+        """This function returns hash entry of a file, reusing cached hash if size and
+        modification time did not change.
+
+        Args:
+            path (str): path of the file
+
+        Returns:
+            dict: {"size", "mtime_ns", "sha256"}, None if the file does not exist
+        """
+        path = os.path.abspath(path)
+        if not os.path.exists(path):
+            return None
+        stat = os.stat(path)
+        entry = self._hash_cache.get(path)
+        if entry is None or entry["size"] != stat.st_size or entry["mtime_ns"] != stat.st_mtime_ns:
+            entry = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": file_sha256(path)}
+            self._hash_cache[path] = entry
+        return entry
+
+    def hash_paths(self, paths: list) -> dict:
+        """This function hashes files, directories are expanded to the files under them.
+
+        Args:
+            paths (list): paths of files or directories
+
+        Returns:
+            dict: file path (relative to directory of the manifest) to hash entry (None for missing files)
+        """
+        return {
+            os.path.relpath(os.path.abspath(file_path), self._base_dir): self.hash_file(file_path)
+            for path in paths for file_path in _iter_files(path)}
+
+    def is_up_to_date(self, stage: str, inputs: list, outputs: list, params: dict, code: str) -> bool:
+        """This function checks whether a stage has to be run.
+
+        Args:
+            stage (str): name of the stage
+            inputs (list): paths of input files (or, directories)
+            outputs (list): paths of output files (or, directories)
+            params (dict): config values used by the stage, must be json serializable
+            code (str): version of code of the stage (see code_version)
+
+        Returns:
+            bool: True if the stage was run before with same inputs, params and code, and its outputs are unchanged
+        """
+        record = self.stages.get(stage)
+        if record is None or record["code"] != code or record["params"] != json.loads(json.dumps(params)):
+            return False
+        for recorded, current in ((record["inputs"], self.hash_paths(inputs)), (record["outputs"], self.hash_paths(outputs))):
+            if set(recorded) != set(current):
+                return False
+            if any(entry is None or recorded[path] is None or entry["sha256"] != recorded[path]["sha256"]
+                   for path, entry in current.items()):
+                return False
+        return True
+
+    def record(self, stage: str, inputs: list, outputs: list, params: dict, code: str) -> None:
+        """This function records a successful run of a stage and saves the manifest.
+
+        Args:
+            stage (str): name of the stage
+            inputs (list): paths of input files (or, directories)
+            outputs (list): paths of output files (or, directories)
+            params (dict): config values used by the stage
+            code (str): version of code of the stage
+        """
+        self.stages[stage] = {
+            "inputs": self.hash_paths(inputs),
+            "outputs": self.hash_paths(outputs),
+            "params": params,
+            "code": code,
+        }
+        self.save()
+
+    def save(self) -> None:
+        """This function writes the manifest, replacing the old file atomically.
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(self.manifest_path)), exist_ok=True)
+        tmp_path = self.manifest_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.stages, f, ensure_ascii=False, indent=4)
+        os.replace(tmp_path, self.manifest_path)
+
+    def run_stage(self, stage: str, func: Callable[[], None], inputs: list, outputs: list, params: dict,
+                  code: str, force: bool = False) -> bool:
+        """This function runs a stage if it is not up to date and records it.
+
+        Args:
+            stage (str): name of the stage
+            func (Callable[[], None]): function running the stage, writes the outputs
+            inputs (list): paths of input files (or, directories)
+            outputs (list): paths of output files (or, directories)
+            params (dict): config values used by the stage
+            code (str): version of code of the stage
+            force (bool, optional): If set True runs the stage even if it is up to date. Defaults to False.
+
+        Returns:
+            bool: True if the stage was run, False if it was skipped
+        """
+        if not force and self.is_up_to_date(stage, inputs, outputs, params, code):
+            print(f"Stage {stage} : up to date, skipped")
+            return False
+        print(f"Stage {stage} : running")
+        func()
+        self.record(stage, inputs, outputs, params, code)
+        return True
@@ -0,0 +1,322 @@
+import time
+import threading
+from bisect import bisect_left
+from itertools import islice
+from typing import Callable, Iterable, Iterator
+from ..config import config as cfg
+
+class Histogram(object):
+    """Cumulative histogram with fixed upper bounds, same as Prometheus histograms. Quantiles are
+    estimated by linear interpolation inside buckets.
+    """
+    def __init__(self, buckets: list) -> None:
+        """Initialize Histogram class.
+
+        Args:
+            buckets (list): sorted upper bounds of buckets, an infinite bucket is added at the end
+        """
+        self.buckets = list(buckets) + [float("inf")]
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """This function adds a value to the histogram.
+
+        Args:
+            value (float): observed value
+        """
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> float:
+        """This function estimates a quantile of observed values.
+
+        Args:
+            q (float): quantile between 0 and 1, i.e. 0.99 for p99
+
+        Returns:
+            float: estimated quantile, 0.0 if nothing is observed
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        cumulative = 0
+        for i, count in enumerate(self.counts):
+            if count and cumulative + count >= rank:
+                lower = self.buckets[i - 1] if i else 0.0
+                upper = self.buckets[i]
+                # values above the last bound can not be interpolated
+                if upper == float("inf"):
+                    return lower
+                return lower + (upper - lower) * (rank - cumulative) / count
+            cumulative += count
+        return self.buckets[-2]
+
+class InferenceMetrics(object):
+    """Opt-in latency metrics of inference. Keeps histograms of seconds spent in each stage
+    (tokenizer, each pipeline component, postprocess) per call and per batch, and of input
+    lengths. Metrics can be exported in Prometheus text format, and each observation can be
+    forwarded to a callback (i.e. statsd client).
+    """
+    def __init__(self, callback: Callable[[str, str, float], None] = None,
+                 latency_buckets: list = cfg.METRICS_LATENCY_BUCKETS, length_buckets: list = cfg.METRICS_LENGTH_BUCKETS) -> None:
+        """Initialize InferenceMetrics class.
+
+        Args:
+            callback (Callable[[str, str, float], None], optional): called with stage, mode ("call"
+                or "batch") and seconds of each observation. Defaults to None.
+            latency_buckets (list, optional): upper bounds of latency buckets in seconds.
+                Defaults to cfg.METRICS_LATENCY_BUCKETS.
+            length_buckets (list, optional): upper bounds of input length buckets in characters.
+                Defaults to cfg.METRICS_LENGTH_BUCKETS.
+        """
+        self.callback = callback
+        self.latency_buckets = latency_buckets
+        self.input_length = Histogram(length_buckets)
+        # (stage, mode) to histogram of seconds
+        self.latency = {}
+        self.n_texts = 0
+        self.n_batches = 0
+        # functions returning extra gauges, i.e. cache statistics
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def observe(self, stage: str, seconds: float, mode: str = "call") -> None:
+        """This function records seconds spent in a stage.
+
+        Args:
+            stage (str): name of the stage, i.e. "tokenizer", "transformer", "ner"
+            seconds (float): seconds spent
+            mode (str, optional): "call" for a single text, "batch" for a batch. Defaults to "call".
+        """
+        with self._lock:
+            histogram = self.latency.get((stage, mode))
+            if histogram is None:
+                histogram = self.latency[(stage, mode)] = Histogram(self.latency_buckets)
+            histogram.observe(seconds)
+        if self.callback is not None:
+            self.callback(stage, mode, seconds)
+
+    def observe_inputs(self, texts: list, mode: str = "call") -> None:
+        """This function records lengths of input texts.
+
+        Args:
+            texts (list): input texts of a call or a batch
+            mode (str, optional): "call" for a single text, "batch" for a batch. Defaults to "call".
+        """
+        with self._lock:
+            for text in texts:
+                self.input_length.observe(len(text))
+            self.n_texts += len(texts)
+            self.n_batches += mode == "batch"
+
+    def add_collector(self, collector: Callable[[], dict]) -> None:
+        """This function adds a function whose returned values are exported as gauges.
+
+        Args:
+            collector (Callable[[], dict]): function returning dictionary of name to number
+        """
+        self._collectors.append(collector)
+
+    def summary(self) -> dict:
+        """This function returns count, mean, p50, p95 and p99 of each stage.
+
+        Returns:
+            dict: dictionary of "stage/mode" to statistics
+        """
+        with self._lock:
+            return {
+                f"{stage}/{mode}": {
+                    "count": histogram.count,
+                    "mean": histogram.sum / histogram.count,
+                    "p50": histogram.quantile(0.50),
+                    "p95": histogram.quantile(0.95),
+                    "p99": histogram.quantile(0.99),
+                }
+                for (stage, mode), histogram in sorted(self.latency.items())
+            }
+
+    def to_prometheus(self, prefix: str = "bangla_ner") -> str:
+        """This function exports metrics in Prometheus text exposition format.
+
+        Args:
+            prefix (str, optional): prefix of metric names. Defaults to "bangla_ner".
+
+        Returns:
+            str: metrics as text
+        """
+        lines = []
+        with self._lock:
+            lines.append(f"# TYPE {prefix}_stage_seconds histogram")
+            for (stage, mode), histogram in sorted(self.latency.items()):
+                lines.extend(_histogram_lines(f"{prefix}_stage_seconds", histogram, f'stage="{stage}",mode="{mode}"'))
+            lines.append(f"# TYPE {prefix}_input_length_chars histogram")
+            lines.extend(_histogram_lines(f"{prefix}_input_length_chars", self.input_length, ""))
+            lines.append(f"# TYPE {prefix}_texts_total counter")
+            lines.append(f"{prefix}_texts_total {self.n_texts}")
+            lines.append(f"# TYPE {prefix}_batches_total counter")
+            lines.append(f"{prefix}_batches_total {self.n_batches}")
+        for collector in self._collectors:
+            for name, value in collector().items():
+                lines.append(f"# TYPE {prefix}_{name} gauge")
+                lines.append(f"{prefix}_{name} {value}")
+        return "\n".join(lines) + "\n"
+
+def _histogram_lines(name: str, histogram: Histogram, labels: str) -> list:
+    """This function formats a histogram as Prometheus bucket, sum and count lines.
+
+    Args:
+        name (str): metric name
+        histogram (Histogram): histogram to format
+        labels (str): labels of the metric without braces, can be empty
+
+    Returns:
+        list: list of lines
+    """
+    separator = "," if labels else ""
+    lines = []
+    cumulative = 0
+    for bound, count in zip(histogram.buckets, histogram.counts):
+        cumulative += count
+        le = "+Inf" if bound == float("inf") else repr(bound)
+        lines.append(f'{name}_bucket{{{labels}{separator}le="{le}"}} {cumulative}')
+    suffix = f"{{{labels}}}" if labels else ""
+    lines.append(f"{name}_sum{suffix} {histogram.sum}")
+    lines.append(f"{name}_count{suffix} {histogram.count}")
+    return lines
+
+class InstrumentedModel(object):
+    """Wrapper of a spacy Language object which runs pipeline components one by one and records
+    seconds spent in tokenizer and each component. It has the parts of spacy Language interface
+    used by BanglaPersorNer (__call__, pipe, make_doc). Models without pipeline components
+    (i.e. GazetteerModel) are timed as a single "model" stage.
+    """
+    def __init__(self, nlp: object, metrics: InferenceMetrics) -> None:
+        """Initialize InstrumentedModel class.
+
+        Args:
+            nlp (object): Spacy Language object
+            metrics (InferenceMetrics): metrics to record into
+        """
+        self.nlp = nlp
+        self.metrics = metrics
+
+    def make_doc(self, text: str) -> object:
+        return self.nlp.make_doc(text)
+
+    def __call__(self, text: str) -> object:
+        """This function runs the model on a text and records time of each stage.
+
+        Args:
+            text (str): text to be inferenced on
+
+        Returns:
+            object: Spacy.tokens.Doc object
+        """
+        self.metrics.observe_inputs([text])
+        return self._run([text], "call")[0]
+
+    def pipe(self, texts: Iterable, as_tuples: bool = False, batch_size: int = cfg.BATCH_SIZE,
+             n_process: int = 1) -> Iterator:
+        """This function runs the model on batches of texts and records time of each stage per batch,
+        same interface as spacy Language.pipe. With multiple processes components can not be
+        timed, texts are sent to one spacy pipe (so one process pool is used for all of them) and
+        time spent waiting for each batch_size docs is recorded as "model" stage.
+
+        Args:
+            texts (Iterable): texts, or (text, context) tuples if as_tuples is True
+            as_tuples (bool, optional): If set True yields (Doc, context) tuples. Defaults to False.
+            batch_size (int, optional): number of texts in each batch. Defaults to cfg.BATCH_SIZE.
+            n_process (int, optional): number of processes used for inference. Defaults to 1.
+
+        Yields:
+            Iterator: Spacy.tokens.Doc objects, or (Doc, context) tuples
+        """
+        if n_process > 1:
+            yield from self._pipe_multiprocess(texts, as_tuples, batch_size, n_process)
+            return
+        texts = iter(texts)
+        while True:
+            batch = list(islice(texts, batch_size))
+            if not batch:
+                break
+            batch_texts = [text for text, _ in batch] if as_tuples else batch
+            self.metrics.observe_inputs(batch_texts, "batch")
+            docs = self._run(batch_texts, "batch")
+            if as_tuples:
+                yield from zip(docs, (context for _, context in batch))
+            else:
+                yield from docs
+
+    def _pipe_multiprocess(self, texts: Iterable, as_tuples: bool, batch_size: int, n_process: int) -> Iterator:
+        """This function is the version of pipe used with multiple processes. Time spent in the
+        consumer of yielded docs is not recorded.
+
+        Args:
+            texts (Iterable): texts, or (text, context) tuples if as_tuples is True
+            as_tuples (bool): If set True yields (Doc, context) tuples
+            batch_size (int): number of texts in each batch
+            n_process (int): number of processes used for inference
+
+        Yields:
+            Iterator: Spacy.tokens.Doc objects, or (Doc, context) tuples
+        """
+        def observed_texts() -> Iterator:
+            # record input lengths of each batch as it is read by spacy
+            items = iter(texts)
+            while True:
+                batch = list(islice(items, batch_size))
+                if not batch:
+                    return
+                self.metrics.observe_inputs([text for text, _ in batch] if as_tuples else batch, "batch")
+                yield from batch
+
+        outputs = iter(self.nlp.pipe(observed_texts(), as_tuples=as_tuples, batch_size=batch_size, n_process=n_process))
+        seconds, n_docs = 0.0, 0
+        while True:
+            start = time.perf_counter()
+            try:
+                output = next(outputs)
+            except StopIteration:
+                break
+            seconds += time.perf_counter() - start
+            n_docs += 1
+            if n_docs == batch_size:
+                self.metrics.observe("model", seconds, "batch")
+                seconds, n_docs = 0.0, 0
+            yield output
+        if n_docs:
+            self.metrics.observe("model", seconds, "batch")
+
+    def _run(self, texts: list, mode: str) -> list:
+        """This function runs tokenizer and pipeline components on texts, timing each of them.
+
+        Args:
+            texts (list): texts to be inferenced on
+            mode (str): "call" or "batch"
+
+        Returns:
+            list: Spacy.tokens.Doc object of each text
+        """
+        observe = self.metrics.observe
+        total_start = start = time.perf_counter()
+        # models without components are timed as a whole
+        if not hasattr(self.nlp, "pipeline"):
+            docs = list(self.nlp.pipe(texts, batch_size=len(texts)))
+            observe("model", time.perf_counter() - start, mode)
+            return docs
+        docs = [self.nlp.make_doc(text) for text in texts]
+        now = time.perf_counter()
+        observe("tokenizer", now - start, mode)
+        for name, component in self.nlp.pipeline:
+            start = now
+            if hasattr(component, "pipe"):
+                docs = list(component.pipe(docs, batch_size=len(docs)))
+            else:
+                docs = [component(doc) for doc in docs]
+            now = time.perf_counter()
+            observe(name, now - start, mode)
+        observe("model", now - total_start, mode)
+        return docs
@@ -0,0 +1,100 @@
+import os
+import re
+import threading
+from .tokenizer import BasicTokenizer
+from .lexicon import load_lexicon
+from ..config import config as cfg
+
+# any character of bangla unicode block
+BANGLA_CHAR_RE = re.compile(r"[\u0980-\u09FF]")
+
+class NameGate(object):
+    """Cheap check which decides whether a text could contain a person name, so that texts
+    without any cue (i.e. tables, prices, scores) can skip the model. A text passes if it has a
+    bangla character and one of its tokens is an honorific cue or a known name token
+    (optionally after removing a common suffix). Counters are updated under a lock, so one gate
+    can be shared by threads (i.e. executor threads of the server).
+    """
+    def __init__(self, lexicon: set = None, cues: list = cfg.GATE_HONORIFIC_CUES,
+                 suffixes: list = cfg.GATE_NAME_SUFFIXES, require_bangla: bool = True) -> None:
+        """Initialize NameGate class.
+
+        Args:
+            lexicon (set, optional): name tokens, i.e. built with utils.lexicon.build_name_lexicon.
+                Defaults to None (only cues are used).
+            cues (list, optional): honorific tokens which usually come with a name. Defaults to cfg.GATE_HONORIFIC_CUES.
+            suffixes (list, optional): suffixes removed from tokens before lexicon lookup. Defaults to cfg.GATE_NAME_SUFFIXES.
+            require_bangla (bool, optional): If set True texts without bangla characters are skipped. Defaults to True.
+        """
+        self.cue_tokens = set(cues) | set(lexicon or ())
+        # longest suffix first, so that most specific one is removed
+        self.suffixes = sorted(suffixes, key=len, reverse=True)
+        self.require_bangla = require_bangla
+        self._tokenizer = BasicTokenizer()
+        # counters
+        self.passed = 0
+        self.skipped = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_lexicon_file(cls, lexicon_path: str = cfg.NAME_LEXICON_PATH) -> "NameGate":
+        """This function creates a gate using lexicon saved by utils.lexicon. If lexicon file
+        does not exist, only honorific cues are used.
+
+        Args:
+            lexicon_path (str, optional): path of the lexicon file. Defaults to cfg.NAME_LEXICON_PATH.
+
+        Returns:
+            NameGate: gate object
+        """
+        lexicon = load_lexicon(lexicon_path) if os.path.exists(lexicon_path) else None
+        return cls(lexicon=lexicon)
+
+    def could_contain_name(self, text: str) -> bool:
+        """This function checks whether text could contain a person name.
+
+        Args:
+            text (str): text to check
+
+        Returns:
+            bool: False if no cue is found and model can be skipped, True otherwise
+        """
+        result = self._check(text)
+        with self._lock:
+            if result:
+                self.passed += 1
+            else:
+                self.skipped += 1
+        return result
+
+    def _check(self, text: str) -> bool:
+        """This function checks whether text has a cue, without updating counters.
+
+        Args:
+            text (str): text to check
+
+        Returns:
+            bool: True if text has a cue
+        """
+        # no bangla character, no bangla name
+        if self.require_bangla and not BANGLA_CHAR_RE.search(text):
+            return False
+        # look for cue tokens, also without common suffixes (i.e. "আলমের" -> "আলম")
+        for token in self._tokenizer.tokenize(text):
+            if token in self.cue_tokens:
+                return True
+            for suffix in self.suffixes:
+                if token.endswith(suffix) and token[:-len(suffix)] in self.cue_tokens:
+                    return True
+        return False
+
+    def stats(self) -> dict:
+        """This function returns gate statistics.
+
+        Returns:
+            dict: dictionary with passed, skipped and skip_rate
+        """
+        with self._lock:
+            passed, skipped = self.passed, self.skipped
+        total = passed + skipped
+        return {"passed": passed, "skipped": skipped, "skip_rate": skipped / total if total else 0.0}
@@ -0,0 +1,52 @@
+import multiprocessing
+from collections import deque
+from itertools import islice
+from typing import Callable, Iterable, Iterator
+
+def iter_chunks(items: Iterable, chunk_size: int) -> Iterator[list]:
+    """This function groups items into lists of chunk_size items (last one can be shorter).
+
+    Args:
+        items (Iterable): items to group
+        chunk_size (int): number of items in a chunk
+
+    Yields:
+        Iterator[list]: chunk of items
+    """
+    items = iter(items)
+    while True:
+        chunk = list(islice(items, chunk_size))
+        if not chunk:
+            break
+        yield chunk
+
+def map_chunks(func: Callable[[list], list], items: Iterable, n_workers: int = 1, chunk_size: int = 1000) -> Iterator:
+    """This function applies func to chunks of items in a process pool and yields results in
+    input order, so output is same as the serial path. At most 2 chunks per worker are in flight,
+    so memory use does not depend on number of items.
+
+    Args:
+        func (Callable[[list], list]): picklable (module level) function taking a chunk of items
+            and returning a list of results
+        items (Iterable): items to process
+        n_workers (int, optional): number of worker processes. Items are processed in this
+            process if 1. Defaults to 1.
+        chunk_size (int, optional): number of items sent to a worker at once. Defaults to 1000.
+
+    Yields:
+        Iterator: results of func, in input order
+    """
+    chunks = iter_chunks(items, chunk_size)
+    if n_workers <= 1:
+        for chunk in chunks:
+            yield from func(chunk)
+        return
+    with multiprocessing.Pool(n_workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.apply_async(func, (chunk,)))
+            # wait for the oldest chunk before reading more input
+            if len(pending) >= 2 * n_workers:
+                yield from pending.popleft().get()
+        while pending:
+            yield from pending.popleft().get()
@@ -0,0 +1,173 @@
+import json
+from typing import BinaryIO, Iterable
+
+# orjson is optional, it is used for faster json lines serialization if available
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# message used as extracted names when no name is found in a text
+NO_NAME_FOUND = "কোন নাম খুঁজে পাওয়া যায় নি/No name is found"
+
+# fields of compact result, parallel lists of entity attributes
+ENTITY_FIELDS = ("names", "labels", "starts", "ends", "start_chars", "end_chars")
+
+class ExtractionResult(object):
+    """Compact name extraction result of a text. Entities are stored as parallel lists
+    (one item per entity), so a text without names simply has empty lists.
+    """
+    __slots__ = ("text",) + ENTITY_FIELDS
+
+    def __init__(self, text: str, names: list = None, labels: list = None, starts: list = None,
+                 ends: list = None, start_chars: list = None, end_chars: list = None) -> None:
+        """Initialize ExtractionResult class.
+
+        Args:
+            text (str): text on which name extraction was done
+            names (list, optional): text of each name. Defaults to None (no name).
+            labels (list, optional): label of each name. Defaults to None (no name).
+            starts (list, optional): start token index of each name. Defaults to None (no name).
+            ends (list, optional): end token index of each name. Defaults to None (no name).
+            start_chars (list, optional): start character offset of each name. Defaults to None (no name).
+            end_chars (list, optional): end character offset of each name. Defaults to None (no name).
+        """
+        self.text = text
+        self.names = names if names is not None else []
+        self.labels = labels if labels is not None else []
+        self.starts = starts if starts is not None else []
+        self.ends = ends if ends is not None else []
+        self.start_chars = start_chars if start_chars is not None else []
+        self.end_chars = end_chars if end_chars is not None else []
+
+    @classmethod
+    def from_entities(cls, text: str, entities: tuple) -> "ExtractionResult":
+        """This function creates a result from entity tuples.
+
+        Args:
+            text (str): text on which name extraction was done
+            entities (tuple): tuple of (name, label, start, end, start_char, end_char) tuples
+
+        Returns:
+            ExtractionResult: compact result
+        """
+        # no entity, all lists are empty
+        if not entities:
+            return cls(text)
+        # transpose entity tuples into parallel lists
+        return cls(text, *(list(column) for column in zip(*entities)))
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ExtractionResult):
+            return NotImplemented
+        return all(getattr(self, field) == getattr(other, field) for field in self.__slots__)
+
+    def __repr__(self) -> str:
+        return f"ExtractionResult(text={self.text!r}, names={self.names!r})"
+
+    def to_record(self) -> dict:
+        """This function returns the result as a flat dictionary, suitable for serialization.
+
+        Returns:
+            dict: dictionary with "text" and parallel lists of entity attributes
+        """
+        return {field: getattr(self, field) for field in self.__slots__}
+
+    def to_dict(self) -> dict:
+        """This function returns the result in format of BanglaPersorNer.extract_person_name.
+
+        Returns:
+            dict: dictionary in format
+                    {
+                        "sentence" : text,
+                        "extracted_names" : [
+                            {
+                                "name": entity_text,
+                                "label": entity_label,
+                                "start": entity_start,
+                                "end": entity_end
+                            }
+                        ]
+                    }
+        """
+        # if no name found then add "no name is found" as extracted names
+        if not self.names:
+            return {"sentence": self.text, "extracted_names": NO_NAME_FOUND}
+        # add entity details to extracted names
+        return {
+            "sentence": self.text,
+            "extracted_names": [
+                {"name": name, "label": label, "start": start, "end": end}
+                for name, label, start, end in zip(self.names, self.labels, self.starts, self.ends)
+            ],
+        }
+
+def dumps_jsonl_line(record: dict) -> bytes:
+    """This function serializes a dictionary as a utf-8 json line.
+
+    Args:
+        record (dict): dictionary to serialize
+
+    Returns:
+        bytes: json line ending with new line character
+    """
+    # use orjson if available
+    if orjson is not None:
+        return orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+
+def write_jsonl(results: Iterable[ExtractionResult], file: BinaryIO) -> int:
+    """This function writes compact results as json lines to a binary file object.
+
+    Args:
+        results (Iterable[ExtractionResult]): results to write
+        file (BinaryIO): binary file object to write to
+
+    Returns:
+        int: number of written results
+    """
+    n_written = 0
+    for result in results:
+        file.write(dumps_jsonl_line(result.to_record()))
+        n_written += 1
+    return n_written
+
+def to_arrow_table(results: Iterable[ExtractionResult]) -> object:
+    """This function converts compact results to an Arrow table with one row per text and a
+    list column for each entity attribute. Requires pyarrow.
+
+    Args:
+        results (Iterable[ExtractionResult]): results to convert
+
+    Returns:
+        object: pyarrow.Table object
+    """
+    import pyarrow as pa
+    # concatenate entity attributes of all results into flat columns with shared offsets
+    texts, offsets = [], [0]
+    columns = {field: [] for field in ENTITY_FIELDS}
+    for result in results:
+        texts.append(result.text)
+        for field in ENTITY_FIELDS:
+            columns[field].extend(getattr(result, field))
+        offsets.append(offsets[-1] + len(result))
+    # build list arrays from flat values and offsets without creating python lists per row
+    offsets = pa.array(offsets, type=pa.int32())
+    arrays = {"text": pa.array(texts, type=pa.string())}
+    for field in ENTITY_FIELDS:
+        value_type = pa.string() if field in ("names", "labels") else pa.int32()
+        arrays[field] = pa.ListArray.from_arrays(offsets, pa.array(columns[field], type=value_type))
+    return pa.table(arrays)
+
+def write_arrow(results: Iterable[ExtractionResult], path: str) -> None:
+    """This function writes compact results as an Arrow IPC (feather) file. Requires pyarrow.
+
+    Args:
+        results (Iterable[ExtractionResult]): results to write
+        path (str): path of the output file
+    """
+    import pyarrow.feather as feather
+    feather.write_feather(to_arrow_table(results), path)
@@ -0,0 +1,271 @@
+import os
+import sys
+import json
+import pickle
+import argparse
+import numpy as np
+from importlib import metadata
+from ..config import config as cfg
+
+# files of a snapshot
+#   pipeline.pkl : the loaded pipeline pickled without its weights
+#   weights.bin  : all weight arrays back to back, each aligned to _ALIGNMENT bytes
+#   weights.json : index of arrays in weights.bin and the model the snapshot was made from
+_PIPELINE_FILE = "pipeline.pkl"
+_WEIGHTS_FILE = "weights.bin"
+_INDEX_FILE = "weights.json"
+_ALIGNMENT = 64
+# libraries whose objects are pickled in a snapshot, snapshot is not used if any version changes
+_PICKLED_PACKAGES = ("numpy", "spacy", "thinc", "torch", "transformers", "spacy-transformers")
+
+def snapshot_dir_for(model_dir: str) -> str:
+    """This function returns snapshot directory of a model, next to the model directory.
+
+    Args:
+        model_dir (str): directory of the spacy model
+
+    Returns:
+        str: directory of the snapshot
+    """
+    return os.path.normpath(model_dir) + cfg.MODEL_SNAPSHOT_SUFFIX
+
+def _model_fingerprint(model_dir: str) -> dict:
+    """This function describes files of a model by size and modification time, so that a snapshot
+    made from older model files is not used. Files are not read, so it is cheap at startup.
+
+    Args:
+        model_dir (str): directory of the spacy model
+
+    Returns:
+        dict: relative file path to [size, mtime_ns]
+    """
+    fingerprint = {}
+    for root, dirs, names in os.walk(model_dir):
+        dirs.sort()
+        for name in sorted(names):
+            path = os.path.join(root, name)
+            stat = os.stat(path)
+            fingerprint[os.path.relpath(path, model_dir)] = [stat.st_size, stat.st_mtime_ns]
+    return fingerprint
+
+def _versions() -> dict:
+    """This function returns versions of libraries whose objects are pickled in a snapshot. They
+    are read from package metadata, so libraries are not imported.
+
+    Returns:
+        dict: library name to version (None if not installed)
+    """
+    versions = {"python": sys.version.split()[0]}
+    for package in _PICKLED_PACKAGES:
+        try:
+            versions[package] = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            versions[package] = None
+    return versions
+
+class _WeightsPickler(pickle.Pickler):
+    """Pickles a pipeline, writing numpy arrays and torch tensors to weights file instead of the
+    pickle. Each array is written once, however many objects refer to it.
+    """
+    def __init__(self, file: object, weights_file: object) -> None:
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.weights_file = weights_file
+        self.arrays = []
+        # id of written objects to their index, objects are kept so that ids are not reused
+        self._written = {}
+
+    def _write_array(self, array: np.ndarray) -> int:
+        """This function appends an array to weights file.
+
+        Args:
+            array (np.ndarray): array to write
+
+        Returns:
+            int: index of the array in the index file
+        """
+        offset = -self.weights_file.tell() % _ALIGNMENT + self.weights_file.tell()
+        self.weights_file.seek(offset)
+        self.weights_file.write(np.ascontiguousarray(array).tobytes())
+        self.arrays.append({"offset": offset, "dtype": array.dtype.str, "shape": list(array.shape)})
+        return len(self.arrays) - 1
+
+    def persistent_id(self, obj: object) -> tuple:
+        if id(obj) in self._written:
+            return self._written[id(obj)][1]
+        if isinstance(obj, np.ndarray) and obj.dtype.kind in "biufc" and obj.size:
+            pid = ("numpy", self._write_array(obj))
+        elif "torch" in sys.modules and isinstance(obj, sys.modules["torch"].Tensor):
+            try:
+                array = obj.detach().cpu().numpy()
+            except (TypeError, RuntimeError):
+                # quantized and bfloat16 tensors have no numpy equivalent, they are pickled
+                return None
+            is_parameter = isinstance(obj, sys.modules["torch"].nn.Parameter)
+            pid = ("torch", self._write_array(array), is_parameter, obj.requires_grad)
+        else:
+            return None
+        self._written[id(obj)] = (obj, pid)
+        return pid
+
+class _WeightsUnpickler(pickle.Unpickler):
+    """Unpickles a pipeline, reading arrays and tensors as views of the memory mapped weights file.
+    """
+    def __init__(self, file: object, weights: np.ndarray, arrays: list) -> None:
+        super().__init__(file)
+        self.weights = weights
+        self.arrays = arrays
+
+    def persistent_load(self, pid: tuple) -> object:
+        entry = self.arrays[pid[1]]
+        dtype = np.dtype(entry["dtype"])
+        count = int(np.prod(entry["shape"], dtype=np.int64))
+        array = self.weights[entry["offset"]:entry["offset"] + count * dtype.itemsize].view(dtype).reshape(entry["shape"])
+        if pid[0] == "numpy":
+            # plain array view, it keeps the memory map open
+            return array.view(np.ndarray)
+        import torch
+        tensor = torch.from_numpy(array)
+        _, _, is_parameter, requires_grad = pid
+        return torch.nn.Parameter(tensor, requires_grad=requires_grad) if is_parameter else tensor.requires_grad_(requires_grad)
+
+def save_snapshot(nlp: object, snapshot_dir: str, model_dir: str = None) -> str:
+    """This function saves a loaded pipeline as a snapshot. Weights (numpy arrays of thinc models
+    and torch tensors of the transformer) are written to one flat file, the rest of the pipeline
+    is pickled. Pipeline must be on CPU and not converted to an engine (see utils.engines).
+
+    Args:
+        nlp (object): Spacy Language object
+        snapshot_dir (str): directory to save the snapshot
+        model_dir (str, optional): directory the pipeline was loaded from, snapshot is used only
+            while it is unchanged. Defaults to None.
+
+    Returns:
+        str: directory of the snapshot
+    """
+    os.makedirs(snapshot_dir, exist_ok=True)
+    # index is written last, so a snapshot without index (i.e. interrupted) is never loaded
+    index_path = os.path.join(snapshot_dir, _INDEX_FILE)
+    if os.path.exists(index_path):
+        os.remove(index_path)
+    with open(os.path.join(snapshot_dir, _PIPELINE_FILE), "wb") as f, \
+         open(os.path.join(snapshot_dir, _WEIGHTS_FILE), "wb") as weights_file:
+        pickler = _WeightsPickler(f, weights_file)
+        pickler.dump(nlp)
+        weights_size = weights_file.tell()
+    index = {
+        "versions": _versions(),
+        "model_dir": os.path.abspath(model_dir) if model_dir else None,
+        "model_fingerprint": _model_fingerprint(model_dir) if model_dir else None,
+        "weights_size": weights_size,
+        "arrays": pickler.arrays,
+    }
+    with open(index_path, "w", encoding="utf-8") as f:
+        json.dump(index, f)
+    return snapshot_dir
+
+def _read_index(snapshot_dir: str) -> dict:
+    """This function reads index of a snapshot.
+
+    Args:
+        snapshot_dir (str): directory of the snapshot
+
+    Returns:
+        dict: index, None if the snapshot does not exist
+    """
+    index_path = os.path.join(snapshot_dir, _INDEX_FILE)
+    if not os.path.exists(index_path):
+        return None
+    with open(index_path, encoding="utf-8") as f:
+        return json.load(f)
+
+def is_snapshot_fresh(snapshot_dir: str, model_dir: str) -> bool:
+    """This function checks whether a snapshot can be used in place of loading a model, i.e. it
+    was made from same model files with same library versions.
+
+    Args:
+        snapshot_dir (str): directory of the snapshot
+        model_dir (str): directory of the spacy model
+
+    Returns:
+        bool: True if the snapshot is up to date
+    """
+    index = _read_index(snapshot_dir)
+    if index is None or index["versions"] != _versions():
+        return False
+    return os.path.isdir(model_dir) and index["model_fingerprint"] == _model_fingerprint(model_dir)
+
+def load_snapshot(snapshot_dir: str) -> object:
+    """This function loads a pipeline from a snapshot. Weights file is memory mapped copy on write,
+    so weights are read from disk when they are first used and their pages are shared by all
+    processes loading the snapshot (or, forked after loading it) until a process writes them.
+    Snapshots are pickles, only load snapshots you created.
+
+    Args:
+        snapshot_dir (str): directory of the snapshot
+
+    Raises:
+        FileNotFoundError: if the snapshot does not exist
+
+    Returns:
+        object: Spacy Language object
+    """
+    index = _read_index(snapshot_dir)
+    if index is None:
+        raise FileNotFoundError(f"No snapshot at {snapshot_dir}.")
+    # registers BasicTokenizer and other functions pickled objects refer to
+    from . import spacy_tokenizer
+    if index["weights_size"]:
+        weights = np.memmap(os.path.join(snapshot_dir, _WEIGHTS_FILE), dtype=np.uint8, mode="c")
+    else:
+        weights = np.zeros(0, dtype=np.uint8)
+    with open(os.path.join(snapshot_dir, _PIPELINE_FILE), "rb") as f:
+        return _WeightsUnpickler(f, weights, index["arrays"]).load()
+
+def weights_memory(pid: int = None) -> dict:
+    """This function reports memory of a process (linux only): RSS, PSS (shared pages divided by
+    number of processes sharing them) and memory mapped from snapshot weights files.
+
+    Args:
+        pid (int, optional): process id. Defaults to None (this process).
+
+    Returns:
+        dict: "rss_mib", "pss_mib", "shared_mib", and "weights_rss_mib" / "weights_pss_mib" of weights files
+    """
+    report = dict.fromkeys(["rss_mib", "pss_mib", "shared_mib", "weights_rss_mib", "weights_pss_mib"], 0.0)
+    in_weights = False
+    with open(f"/proc/{pid or 'self'}/smaps", encoding="utf-8") as f:
+        for line in f:
+            fields = line.split()
+            # mapping header lines start with an address range
+            if "-" in fields[0] and not fields[0].endswith(":"):
+                in_weights = fields[-1].endswith(os.sep + _WEIGHTS_FILE)
+                continue
+            name = fields[0]
+            if name not in ("Rss:", "Pss:", "Shared_Clean:", "Shared_Dirty:"):
+                continue
+            # values are in kB
+            value = int(fields[1]) / 1024
+            if name == "Rss:":
+                report["rss_mib"] += value
+                if in_weights:
+                    report["weights_rss_mib"] += value
+            elif name == "Pss:":
+                report["pss_mib"] += value
+                if in_weights:
+                    report["weights_pss_mib"] += value
+            elif name in ("Shared_Clean:", "Shared_Dirty:"):
+                report["shared_mib"] += value
+    return report
+
+if __name__ == "__main__":
+    import spacy
+    # create argument parser
+    parser = argparse.ArgumentParser(description='Save a snapshot of the model for fast loading with memory mapped weights.')
+    parser.add_argument('-m', '--model-dir', type=str, default=cfg.MODEL_DIR, help='directory of the spacy model.')
+    parser.add_argument('-o', '--output', type=str, default=None, help='directory of the snapshot. Defaults to model directory + MODEL_SNAPSHOT_SUFFIX.')
+    # parse arguments
+    args = parser.parse_args()
+    # registers BasicTokenizer which models trained with it reference in their config
+    from . import spacy_tokenizer
+    snapshot_dir = save_snapshot(spacy.load(args.model_dir), args.output or snapshot_dir_for(args.model_dir), args.model_dir)
+    print(f"Saved snapshot at : {snapshot_dir}")
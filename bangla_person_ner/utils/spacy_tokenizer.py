@@ -0,0 +1,121 @@
+import re
+import spacy
+from spacy.tokens import Doc
+from .tokenizer import BasicTokenizer
+from ..config import config as cfg
+
+# text between tokens is split into runs of whitespace and runs of removed (control) characters
+_GAP_PATTERN = re.compile(r"\s+|\S+")
+
+class SpacyBasicTokenizer(object):
+    """Spacy tokenizer which splits text into same tokens as BasicTokenizer (used to tokenize
+    training data), so that tokens seen by the model at inference match tokens it was trained on.
+    Doc objects are built directly from token spans, whitespace between tokens is kept (as
+    token spaces, or whitespace tokens like spacy tokenizer) so that doc.text is the input text.
+    """
+    def __init__(self, vocab: object) -> None:
+        """Initialize SpacyBasicTokenizer class.
+
+        Args:
+            vocab (object): Spacy Vocab object
+        """
+        self.vocab = vocab
+        self._tokenizer = BasicTokenizer()
+
+    def __call__(self, text: str) -> object:
+        """This function tokenizes a text.
+
+        Args:
+            text (str): text to tokenize
+
+        Returns:
+            object: Spacy.tokens.Doc object
+        """
+        words = []
+        spaces = []
+        position = 0
+        for start, end in self._tokenizer.tokenize_with_offsets(text):
+            if start > position:
+                self._add_gap(text[position:start], words, spaces)
+            words.append(text[start:end])
+            spaces.append(False)
+            position = end
+        if position < len(text):
+            self._add_gap(text[position:], words, spaces)
+        return Doc(self.vocab, words=words, spaces=spaces)
+
+    @staticmethod
+    def _add_gap(gap: str, words: list, spaces: list) -> None:
+        """This function adds text between two tokens (whitespace and removed characters). A single
+        space after a token becomes its space, rest of the text becomes tokens.
+
+        Args:
+            gap (str): text between tokens
+            words (list): words of the Doc, updated in place
+            spaces (list): spaces of the Doc, updated in place
+        """
+        for piece in _GAP_PATTERN.findall(gap):
+            if words and piece[0] == " ":
+                spaces[-1] = True
+                piece = piece[1:]
+            if piece:
+                words.append(piece)
+                spaces.append(False)
+
+    def pipe(self, texts, batch_size: int = 1000):
+        """This function tokenizes a stream of texts.
+
+        Args:
+            texts (Iterable): texts to tokenize
+            batch_size (int, optional): ignored, kept for compatibility with spacy Tokenizer. Defaults to 1000.
+
+        Yields:
+            Iterator: Spacy.tokens.Doc objects
+        """
+        for text in texts:
+            yield self(text)
+
+    # tokenizer has no data of its own, serialization is a no-op so that models can be saved and loaded
+    def to_bytes(self, **kwargs) -> bytes:
+        return b""
+
+    def from_bytes(self, bytes_data: bytes, **kwargs) -> "SpacyBasicTokenizer":
+        return self
+
+    def to_disk(self, path, **kwargs) -> None:
+        pass
+
+    def from_disk(self, path, **kwargs) -> "SpacyBasicTokenizer":
+        return self
+
+@spacy.registry.tokenizers(cfg.SPACY_TOKENIZER_NAME)
+def create_basic_tokenizer():
+    """This function is referenced from training configs ([nlp] tokenizer) to use SpacyBasicTokenizer.
+
+    Returns:
+        Callable: function creating the tokenizer for a Language object
+    """
+    def create_tokenizer(nlp: object) -> SpacyBasicTokenizer:
+        return SpacyBasicTokenizer(nlp.vocab)
+    return create_tokenizer
+
+def use_basic_tokenizer(nlp: object) -> object:
+    """This function replaces tokenizer of a loaded pipeline with SpacyBasicTokenizer.
+
+    Args:
+        nlp (object): Spacy Language object
+
+    Returns:
+        object: same Spacy Language object
+    """
+    if not isinstance(nlp.tokenizer, SpacyBasicTokenizer):
+        nlp.tokenizer = SpacyBasicTokenizer(nlp.vocab)
+    return nlp
+
+def blank_pipeline() -> object:
+    """This function creates a blank bangla pipeline with SpacyBasicTokenizer.
+
+    Returns:
+        object: Spacy Language object
+    """
+    return spacy.blank("bn", config={"nlp": {"tokenizer": {"@tokenizers": cfg.SPACY_TOKENIZER_NAME}}})
@@ -16,6 +16,7 @@
 
 # this script is taken and modified from "https://github.com/google-research/bert/blob/master/tokenization.py"
 
+import re
 import unicodedata
 import six
 from ..config import config as cfg
@@ -43,6 +44,57 @@ def whitespace_tokenize(text):
   tokens = text.split()
   return tokens
 
+# classes of characters used by the table driven tokenizer
+#   x : removed (null, replacement character and control characters)
+#   " " : whitespace
+#   p : punctuation (split into its own token)
+#   w : any other character, part of a word
+_REMOVED, _SPACE, _PUNC, _WORD = "x", " ", "p", "w"
+
+def _char_class(char):
+  """Returns class of a character, same decisions as `_clean_text` and `_run_split_on_punc`."""
+  cp = ord(char)
+  if cp == 0 or cp == 0xfffd or _is_control(char):
+    return _REMOVED
+  # str.split also splits on line and paragraph separators, which are not cleaned
+  if _is_whitespace(char) or char.isspace():
+    return _SPACE
+  if _is_punctuation(char):
+    return _PUNC
+  return _WORD
+
+class _CharTable(dict):
+  """Translation table for `str.translate` which is filled lazily. Each character is classified
+  with `unicodedata` once, the first time it is seen."""
+
+  def __init__(self, values):
+    """Constructs a _CharTable.
+
+    Args:
+      values: dictionary of character class to translation, a callable taking the character
+        is called for classes which are not in it.
+    """
+    super().__init__()
+    self._values = values
+
+  def __missing__(self, cp):
+    char = chr(cp)
+    value = self._values[_char_class(char)]
+    if callable(value):
+      value = value(char)
+    self[cp] = value
+    return value
+
+# removes invalid characters, cleans whitespace and surrounds punctuation with spaces,
+# so that str.split gives the tokens
+_TOKENIZE_TABLE = _CharTable({
+    _REMOVED: None, _SPACE: " ", _PUNC: lambda char: " " + char + " ", _WORD: lambda char: char})
+# maps each character to its class, keeping length (and so offsets) of the text
+_CLASS_TABLE = _CharTable({_REMOVED: _REMOVED, _SPACE: _SPACE, _PUNC: _PUNC, _WORD: _WORD})
+# a token is a punctuation character, or a run of word characters (removed characters
+# inside the run are part of the token, as they are dropped without splitting it)
+_TOKEN_PATTERN = re.compile(r"p|w(?:x*w)*")
+
 class BasicTokenizer(object):
   """Runs basic tokenization (punctuation splitting, lower casing, etc.)."""
 
@@ -52,7 +104,26 @@ class BasicTokenizer(object):
     """
 
   def tokenize(self, text):
-    """Tokenizes a piece of text."""
+    """Tokenizes a piece of text.
+
+    Each character is translated with a lazily filled table (invalid characters removed,
+    whitespace cleaned, spaces around punctuation) and the result is split on whitespace.
+    Output is identical to `tokenize_reference`.
+    """
+    text = convert_to_unicode(text)
+    return text.translate(_TOKENIZE_TABLE).split()
+
+  def tokenize_with_offsets(self, text):
+    """Tokenizes a piece of text and returns (start, end) character spans of tokens instead of
+    copies of them. Spans are tight around tokens and `text[start:end]` is the token, unless
+    removed (control) characters are inside it.
+    """
+    text = convert_to_unicode(text)
+    return [match.span() for match in _TOKEN_PATTERN.finditer(text.translate(_CLASS_TABLE))]
+
+  def tokenize_reference(self, text):
+    """Tokenizes a piece of text character by character. This is the original implementation,
+    kept to check that `tokenize` gives same output."""
     text = convert_to_unicode(text)
     text = self._clean_text(text)
     orig_tokens = whitespace_tokenize(text)
@@ -0,0 +1,49 @@
+import os
+import json
+from ..config import config as cfg
+
+# settings read from tuned config, others are kept only as report of the tuning run
+TUNED_SETTINGS = ("batch_size", "n_process", "torch_threads")
+
+def read_tuned_config(tuned_config_path: str = cfg.TUNED_CONFIG_PATH) -> dict:
+    """This function reads settings saved by autotune. Missing file (or, empty path) means
+    nothing is tuned.
+
+    Args:
+        tuned_config_path (str, optional): path of tuned config. Defaults to cfg.TUNED_CONFIG_PATH.
+
+    Returns:
+        dict: dictionary with tuned batch_size, n_process and torch_threads (only those present)
+    """
+    if not tuned_config_path or not os.path.exists(tuned_config_path):
+        return {}
+    with open(tuned_config_path, encoding="utf-8") as f:
+        tuned_config = json.load(f)
+    return {name: tuned_config[name] for name in TUNED_SETTINGS if tuned_config.get(name) is not None}
+
+def write_tuned_config(tuned_config: dict, tuned_config_path: str = cfg.TUNED_CONFIG_PATH) -> None:
+    """This function saves tuned settings as json.
+
+    Args:
+        tuned_config (dict): tuned settings and report of the tuning run
+        tuned_config_path (str, optional): path of tuned config. Defaults to cfg.TUNED_CONFIG_PATH.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(tuned_config_path)), exist_ok=True)
+    with open(tuned_config_path, "w", encoding="utf-8") as f:
+        json.dump(tuned_config, f, indent=4)
+
+def set_torch_threads(n_threads: int) -> bool:
+    """This function sets number of threads used by pytorch for intra-op parallelism.
+
+    Args:
+        n_threads (int): number of threads
+
+    Returns:
+        bool: False if pytorch is not installed, True otherwise
+    """
+    try:
+        import torch
+    except ImportError:
+        return False
+    torch.set_num_threads(n_threads)
+    return True
@@ -0,0 +1,88 @@
+import random
+
+# sample bangla sentences used to build synthetic corpora for benchmarks
+SAMPLE_SENTENCES = [
+    "ডা. মো. শরিফুল ইসলাম, শহীদ সোহরাওয়ার্দী মেডিকেল, কলেজ ও হাসপাতাল।",
+    "মো. আলমের কাছ থেকে ১৫ লাখ টাকা আদায় করা হয়।",
+    "এতিমখানার কর্মকর্তা-শিক্ষার্থীরা কমিটি ও চুক্তির বিরুদ্ধে আন্দোলন শুরু করে।",
+    "আগামীকাল পরীক্ষা আছে।",
+    "প্রধানমন্ত্রী শেখ হাসিনা আজ সকালে গণভবনে সংবাদ সম্মেলন করেন।",
+    "চালের দাম কেজিপ্রতি ৫ টাকা বেড়েছে।",
+    "বাংলাদেশ দল ৭ উইকেটে ২৪৫ রান করেছে।",
+    "জনাব রহিম উদ্দিন বলেন, আমরা দ্রুত কাজ শেষ করব।",
+]
+
+def synthetic_sentences(n: int, seed: int = 0) -> list:
+    """This function builds a synthetic corpus by sampling sentences from SAMPLE_SENTENCES.
+
+    Args:
+        n (int): number of sentences in the corpus
+        seed (int, optional): seed of the random generator. Defaults to 0.
+
+    Returns:
+        list: list of sentences
+    """
+    # create a seeded random generator so that corpus is reproducible
+    rng = random.Random(seed)
+    # sample sentences
+    return [rng.choice(SAMPLE_SENTENCES) for _ in range(n)]
+
+def mixed_length_texts(n: int, seed: int = 0) -> list:
+    """This function builds a synthetic corpus with realistic mix of lengths: short headlines,
+    single sentences and paragraphs of several sentences.
+
+    Args:
+        n (int): number of texts in the corpus
+        seed (int, optional): seed of the random generator. Defaults to 0.
+
+    Returns:
+        list: list of texts
+    """
+    rng = random.Random(seed)
+    texts = []
+    for _ in range(n):
+        kind = rng.random()
+        # headline, first few words of a sentence
+        if kind < 0.4:
+            texts.append(" ".join(rng.choice(SAMPLE_SENTENCES).split()[:rng.randint(2, 5)]))
+        # single sentence
+        elif kind < 0.75:
+            texts.append(rng.choice(SAMPLE_SENTENCES))
+        # paragraph, number of sentences has a long tail
+        else:
+            n_sentences = min(int(rng.lognormvariate(1.5, 0.6)) + 2, 25)
+            texts.append(" ".join(rng.choice(SAMPLE_SENTENCES) for _ in range(n_sentences)))
+    return texts
+
+# entity types of synthetic IOB tags, only PER is kept by preprocessing
+_SYNTHETIC_ENTITY_TYPES = ["PER", "PER", "LOC", "ORG"]
+
+def synthetic_tagged_sentences(n: int, seed: int = 0) -> list:
+    """This function builds a synthetic tagged corpus in raw data format: tokens of sampled
+    sentences (tokenized with BasicTokenizer) with random valid IOB tags.
+
+    Args:
+        n (int): number of sentences in the corpus
+        seed (int, optional): seed of the random generator. Defaults to 0.
+
+    Returns:
+        list: list of (tokens, tags) tuples
+    """
+    from bangla_person_ner.utils.tokenizer import BasicTokenizer
+    tokenizer = BasicTokenizer()
+    tokenized = [tokenizer.tokenize(sentence) for sentence in SAMPLE_SENTENCES]
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(n):
+        tokens = rng.choice(tokenized)
+        tags = []
+        while len(tags) < len(tokens):
+            # start an entity of one to three tokens, or add an outside tag
+            if rng.random() < 0.2:
+                entity_type = rng.choice(_SYNTHETIC_ENTITY_TYPES)
+                length = min(rng.randint(1, 3), len(tokens) - len(tags))
+                tags.extend([f"B-{entity_type}"] + [f"I-{entity_type}"] * (length - 1))
+            else:
+                tags.append("O")
+        corpus.append((tokens, tags))
+    return corpus
@@ -0,0 +1,53 @@
+import time
+from bangla_person_ner.config import config as cfg
+
+def load_gold_docs(nlp: object, data_path: str = cfg.TEST_DATA_PATH) -> list:
+    """This function loads annotated Doc objects from spacy binary data.
+
+    Args:
+        nlp (object): Spacy Language object, its vocab is used to create Docs
+        data_path (str, optional): path of spacy binary data. Defaults to cfg.TEST_DATA_PATH.
+
+    Returns:
+        list: list of Spacy.tokens.Doc objects
+    """
+    from spacy.tokens import DocBin
+    return list(DocBin().from_disk(data_path).get_docs(nlp.vocab))
+
+def evaluate_ner(nlp: object, gold_docs: list, batch_size: int = cfg.BATCH_SIZE) -> dict:
+    """This function runs a pipeline on texts of annotated Docs and scores predicted entities.
+
+    Args:
+        nlp (object): Spacy Language object (or, any object with spacy compatible pipe method)
+        gold_docs (list): annotated Spacy.tokens.Doc objects
+        batch_size (int, optional): number of texts in each batch. Defaults to cfg.BATCH_SIZE.
+
+    Returns:
+        dict: precision, recall, f1 of entities and docs_per_sec
+    """
+    from spacy.scorer import get_ner_prf
+    from spacy.training import Example
+    # predict and measure throughput
+    texts = [doc.text for doc in gold_docs]
+    start = time.perf_counter()
+    pred_docs = list(nlp.pipe(texts, batch_size=batch_size))
+    elapsed = time.perf_counter() - start
+    # score predicted entities against annotations, tokenization may differ
+    scores = get_ner_prf([Example(pred, gold) for pred, gold in zip(pred_docs, gold_docs)])
+    return {
+        "precision": scores["ents_p"],
+        "recall": scores["ents_r"],
+        "f1": scores["ents_f"],
+        "docs_per_sec": len(texts) / elapsed if elapsed > 0 else float("inf"),
+    }
+
+def print_report(rows: dict) -> None:
+    """This function prints evaluation results as a table.
+
+    Args:
+        rows (dict): dictionary of row name to result of evaluate_ner
+    """
+    print(f"{'':<16}{'precision':>10}{'recall':>10}{'f1':>10}{'docs/sec':>12}")
+    print("-"*58)
+    for name, row in rows.items():
+        print(f"{name:<16}{row['precision']:>10.4f}{row['recall']:>10.4f}{row['f1']:>10.4f}{row['docs_per_sec']:>12.2f}")
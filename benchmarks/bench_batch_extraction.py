@@ -0,0 +1,56 @@
+import time
+import argparse
+from bangla_person_ner.bangla_person_ner import BanglaPersorNer
+from bangla_person_ner.config import config as cfg
+from ._corpus import synthetic_sentences
+
+def _docs_per_sec(n_docs: int, seconds: float) -> float:
+    """This function calculates throughput.
+
+    Args:
+        n_docs (int): number of processed documents
+        seconds (float): elapsed time in seconds
+
+    Returns:
+        float: documents per second
+    """
+    return n_docs / seconds if seconds > 0 else float("inf")
+
+def main() -> None:
+    """This function compares throughput of one-at-a-time extraction with batched extraction.
+    """
+    # create argument parser
+    parser = argparse.ArgumentParser(description='Benchmark batched name extraction against one-at-a-time loop.')
+    parser.add_argument('-n', '--n-docs', type=int, default=1000, help='number of synthetic documents.')
+    parser.add_argument('-b', '--batch-size', type=int, default=cfg.BATCH_SIZE, help='batch size for batched extraction.')
+    parser.add_argument('-p', '--n-process', type=int, default=cfg.N_PROCESS, help='number of processes for batched extraction.')
+    # parse arguments
+    args = parser.parse_args()
+    # create synthetic corpus
+    texts = synthetic_sentences(args.n_docs)
+    # load model and run one prediction so that loading cost is not measured
+    bp_ner = BanglaPersorNer()
+    bp_ner.extract_person_name(texts[0])
+
+    # measure one-at-a-time loop
+    start = time.perf_counter()
+    loop_results = [bp_ner.extract_person_name(text) for text in texts]
+    loop_time = time.perf_counter() - start
+
+    # measure batched extraction
+    start = time.perf_counter()
+    batch_results = bp_ner.extract_person_names_batch(texts, batch_size=args.batch_size, n_process=args.n_process)
+    batch_time = time.perf_counter() - start
+
+    # both paths must return same results
+    if loop_results != batch_results:
+        raise RuntimeError("Batched results do not match one-at-a-time results.")
+    # print the report
+    print(f"Documents : {args.n_docs}")
+    print(f"One-at-a-time : {_docs_per_sec(args.n_docs, loop_time):.2f} docs/sec")
+    print(f"Batched (batch_size={args.batch_size}, n_process={args.n_process}) : "
+          f"{_docs_per_sec(args.n_docs, batch_time):.2f} docs/sec")
+    print(f"Speedup : {loop_time / batch_time:.2f}x")
+
+if __name__ == "__main__":
+    main()
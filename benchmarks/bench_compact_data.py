@@ -0,0 +1,90 @@
+import os
+import sys
+import json
+import argparse
+import tempfile
+import subprocess
+from bangla_person_ner.preprocessing.raw_data_processing import iter_text_data, save_processed_data
+from bangla_person_ner.utils.compact_data import save_compact_data
+from ._corpus import synthetic_tagged_sentences
+from .microbench import _write_text_data
+
+# project directory, so that subprocesses can import the package
+_project_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# code run in a fresh interpreter to measure load time and peak RSS of processed data
+#   load    : json.load of the json file, or opening compact data (vocabulary and memory maps)
+#   split   : also splitting it into train, validation and test sets as train_data_processing does
+_LOAD_CODE = """
+import sys, json, time, resource
+from bangla_person_ner.utils.compact_data import load_processed_data
+from bangla_person_ner.preprocessing.train_data_processing import _split_train_val_test
+
+def peak_rss_mib():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, linux reports KiB
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+start_mib = peak_rss_mib()
+start = time.perf_counter()
+data = load_processed_data({data_path!r})
+load_seconds = time.perf_counter() - start
+load_mib = peak_rss_mib() - start_mib
+splits = _split_train_val_test(data["person"] + data["no_person"])
+print(json.dumps({{"load_seconds": load_seconds, "load_mib": load_mib, "split_mib": peak_rss_mib() - start_mib}}))
+"""
+
+def _disk_size(path: str) -> int:
+    """This function returns size of a file, or total size of files in a directory.
+
+    Args:
+        path (str): path of a file or directory
+
+    Returns:
+        int: size in bytes
+    """
+    if not os.path.isdir(path):
+        return os.path.getsize(path)
+    return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+
+def measure(data_path: str) -> dict:
+    """This function loads processed data in a fresh interpreter and returns load time and peak RSS growth.
+
+    Args:
+        data_path (str): path of json data, or directory of compact data
+
+    Returns:
+        dict: load seconds, peak RSS growth in MiB after loading and after splitting
+    """
+    output = subprocess.run(
+        [sys.executable, "-c", _LOAD_CODE.format(data_path=data_path)],
+        cwd=_project_dir, check=True, capture_output=True, text=True)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+def main() -> None:
+    """This function compares disk size, load time and peak RSS of processed data saved as json and
+    in compact format.
+    """
+    # create argument parser
+    parser = argparse.ArgumentParser(description='Compare disk size and load RSS of json and compact processed data.')
+    parser.add_argument('-n', '--n-sentences', type=int, nargs='+', default=[50000, 200000], help='corpus sizes.')
+    # parse arguments
+    args = parser.parse_args()
+    print(f"{'':<10}{'sentences':>12}{'disk MiB':>10}{'load sec':>10}{'load MiB':>10}{'split MiB':>11}")
+    print("-"*63)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for n in args.n_sentences:
+            # write synthetic raw data and save it processed in both formats
+            raw_path = os.path.join(tmp_dir, f"raw_{n}.txt")
+            _write_text_data(synthetic_tagged_sentences(n), raw_path)
+            paths = {"json": os.path.join(tmp_dir, f"processed_{n}.json"), "compact": os.path.join(tmp_dir, f"processed_{n}")}
+            save_processed_data(iter_text_data(raw_path), paths["json"])
+            save_compact_data(iter_text_data(raw_path), paths["compact"])
+            for data_format, data_path in paths.items():
+                result = measure(data_path)
+                disk_mib = _disk_size(data_path) / 1024 / 1024
+                print(f"{data_format:<10}{n:>12}{disk_mib:>10.1f}{result['load_seconds']:>10.2f}"
+                      f"{result['load_mib']:>10.1f}{result['split_mib']:>11.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+import os
+import time
+import random
+import hashlib
+import argparse
+import tempfile
+import requests
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from bangla_person_ner.utils.downloader import create_session, download_file, download_files, download_data_1
+from ._corpus import SAMPLE_SENTENCES
+
+class _FileHandler(BaseHTTPRequestHandler):
+    """Serves files of the server from memory with range requests, a fixed latency per request and
+    injected faults: first request of a "/flaky/" path gets 503, first response of a "/cut/" path
+    is cut off in the middle and every request of a "/down/" path gets 503.
+    """
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        time.sleep(server.latency)
+        name = self.path.rsplit("/", 1)[-1]
+        with server.lock:
+            server.requests.append(self.path)
+            first = server.requests.count(self.path) == 1
+        if name not in server.files:
+            self.send_error(404)
+            return
+        if (first and "/flaky/" in self.path) or "/down/" in self.path:
+            self.send_error(503)
+            return
+        content = server.files[name]
+        start = 0
+        range_header = self.headers.get("Range")
+        if range_header:
+            start = int(range_header.split("=")[1].rstrip("-"))
+            if start >= len(content):
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{len(content)}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{len(content) - 1}/{len(content)}")
+        else:
+            self.send_response(200)
+        body = content[start:]
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if first and "/cut/" in self.path:
+            # send half of the body and close the connection
+            self.wfile.write(body[:len(body) // 2])
+            self.wfile.flush()
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_server(files: dict, latency: float) -> ThreadingHTTPServer:
+    """This function starts a local http server standing in for the dataset host.
+
+    Args:
+        files (dict): file name to content (bytes)
+        latency (float): seconds to wait before answering a request
+
+    Returns:
+        ThreadingHTTPServer: running server, base url is http://127.0.0.1:{server.server_port}/
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FileHandler)
+    server.daemon_threads = True
+    server.files, server.latency, server.requests, server.lock = files, latency, [], threading.Lock()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def synthetic_files(n_files: int, size: int, seed: int = 0) -> dict:
+    """This function builds text files like data_1 files, starting with a byte order mark.
+
+    Args:
+        n_files (int): number of files, named 1.txt ... n_files.txt
+        size (int): approximate size of each file in bytes
+        seed (int, optional): seed of the random generator. Defaults to 0.
+
+    Returns:
+        dict: file name to content (bytes)
+    """
+    rng = random.Random(seed)
+    files = {}
+    for i in range(1, n_files + 1):
+        lines = []
+        while sum(map(len, lines)) < size // 3:
+            lines.append(rng.choice(SAMPLE_SENTENCES) + "\n")
+        files[f"{i}.txt"] = ("\ufeff" + "".join(lines)).encode("utf-8")
+    return files
+
+def expected_data_1(files: dict, n_files: int) -> bytes:
+    """This function joins files as the original sequential downloader did.
+
+    Args:
+        files (dict): file name to content (bytes)
+        n_files (int): number of files
+
+    Returns:
+        bytes: expected content of data_1
+    """
+    return "".join(files[f"{i}.txt"].decode("utf-8")[1:] + "\n" for i in range(1, n_files + 1)).encode("utf-8")
+
+def main() -> None:
+    """This function checks the downloader against a local http server (ordering, retry of error
+    status, resume of cut off responses, checksum verification) and compares download time of
+    data_1 with one and several threads.
+    """
+    # create argument parser
+    parser = argparse.ArgumentParser(description='Check and benchmark the dataset downloader against a local http server.')
+    parser.add_argument('-n', '--n-files', type=int, default=20, help='number of data_1 files.')
+    parser.add_argument('-s', '--size', type=int, default=200000, help='approximate size of each file in bytes.')
+    parser.add_argument('-l', '--latency', type=float, default=0.2, help='seconds of latency of each request.')
+    parser.add_argument('-w', '--workers', type=int, nargs='+', default=[1, 4, 8], help='numbers of download threads.')
+    # parse arguments
+    args = parser.parse_args()
+    files = synthetic_files(args.n_files, args.size)
+    expected = expected_data_1(files, args.n_files)
+    server = start_server(files, args.latency)
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    try:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            save_path = os.path.join(tmp_dir, "data1_raw.txt")
+            download_dir = os.path.join(tmp_dir, "downloads")
+            # every file fails once with 503 or a cut off response, output must still be complete and in order
+            for fault in ("flaky", "cut"):
+                download_data_1(f"{base_url}/{fault}/", args.n_files, save_path, download_dir, n_workers=4)
+                with open(save_path, "rb") as f:
+                    assert f.read() == expected, f"data_1 differs after {fault} responses"
+                assert not os.path.exists(download_dir + "/data_1"), "downloaded files were not removed"
+            print(f"Retried 503 responses and resumed cut off responses : same output as sequential download")
+            # a host which keeps failing is requested once plus number of retries, not more
+            url = f"{base_url}/down/1.txt"
+            try:
+                download_file(create_session(1), url, os.path.join(tmp_dir, "down.txt"), retries=3, backoff=0)
+                raise AssertionError("failing host did not raise")
+            except requests.HTTPError:
+                pass
+            n_requests = server.requests.count("/down/1.txt")
+            assert n_requests == 4, f"failing host was requested {n_requests} times, expected 4"
+            print(f"Failing host with 3 retries : {n_requests} requests")
+            # checksum verification
+            urls = [f"{base_url}/files/1.txt"]
+            session = create_session(1)
+            good = {urls[0]: hashlib.sha256(files["1.txt"]).hexdigest()}
+            download_files(urls, os.path.join(tmp_dir, "good"), session, 1, checksums=good)
+            try:
+                download_files(urls, os.path.join(tmp_dir, "bad"), session, 1, checksums={urls[0]: "0" * 64})
+                raise AssertionError("checksum mismatch was not detected")
+            except ValueError:
+                pass
+            assert not os.listdir(os.path.join(tmp_dir, "bad")), "file with wrong checksum was kept"
+            print("Checksum verification : ok\n")
+            # download time over numbers of threads
+            print(f"Files : {args.n_files}, size : {args.size} bytes, latency : {args.latency} s\n")
+            print(f"{'workers':>8}{'seconds':>10}{'speedup':>10}")
+            print("-"*28)
+            baseline = None
+            for n_workers in args.workers:
+                start = time.perf_counter()
+                download_data_1(f"{base_url}/files/", args.n_files, save_path, download_dir, n_workers=n_workers)
+                seconds = time.perf_counter() - start
+                with open(save_path, "rb") as f:
+                    assert f.read() == expected, f"data_1 differs with {n_workers} workers"
+                baseline = baseline or seconds
+                print(f"{n_workers:>8}{seconds:>10.2f}{baseline / seconds:>9.2f}x")
+    finally:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
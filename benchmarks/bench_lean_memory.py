@@ -0,0 +1,71 @@
+import os
+import sys
+import json
+import argparse
+import subprocess
+
+# project directory, so that subprocesses can import the package
+_project_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# code run in a fresh interpreter to measure peak RSS of a workload
+#   batch : results of batch extraction are kept
+#   docs  : Doc objects are kept (i.e. a job which collects Docs before writing them)
+_MEMORY_CODE = """
+import sys, json, resource
+from bangla_person_ner.bangla_person_ner import BanglaPersorNer
+from benchmarks._corpus import mixed_length_texts
+
+def peak_rss_mib():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, linux reports KiB
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+texts = mixed_length_texts({n_docs})
+bp_ner = BanglaPersorNer(lean={lean})
+bp_ner.warmup(batch_size={batch_size})
+warm = peak_rss_mib()
+if "{workload}" == "batch":
+    kept = bp_ner.extract_person_names_batch(texts, batch_size={batch_size})
+else:
+    kept = list(bp_ner.model.pipe(texts, batch_size={batch_size}))
+print(json.dumps({{"warm_mib": warm, "peak_mib": peak_rss_mib()}}))
+"""
+
+def measure(workload: str, lean: bool, n_docs: int, batch_size: int) -> dict:
+    """This function runs a workload in a fresh interpreter and returns its peak RSS.
+
+    Args:
+        workload (str): "batch" or "docs"
+        lean (bool): If set True lean mode is enabled
+        n_docs (int): number of synthetic documents
+        batch_size (int): number of texts in each model batch
+
+    Returns:
+        dict: peak RSS after warmup and after the workload in MiB
+    """
+    code = _MEMORY_CODE.format(workload=workload, lean=lean, n_docs=n_docs, batch_size=batch_size)
+    output = subprocess.run(
+        [sys.executable, "-c", code], cwd=_project_dir, check=True, capture_output=True, text=True)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+def main() -> None:
+    """This function compares peak RSS of batch jobs with and without lean mode.
+    """
+    # create argument parser
+    parser = argparse.ArgumentParser(description='Compare peak RSS with and without lean mode.')
+    parser.add_argument('-n', '--n-docs', type=int, default=10000, help='number of synthetic documents.')
+    parser.add_argument('-b', '--batch-size', type=int, default=32, help='number of texts in each model batch.')
+    parser.add_argument('-w', '--workloads', nargs='+', choices=["batch", "docs"], default=["batch", "docs"], help='workloads to measure.')
+    # parse arguments
+    args = parser.parse_args()
+    print(f"Documents : {args.n_docs}, peak RSS in MiB (growth is per {args.n_docs} documents)\n")
+    print(f"{'':<16}{'after warmup':>14}{'peak':>10}{'growth':>10}")
+    print("-"*50)
+    for workload in args.workloads:
+        for lean in (False, True):
+            result = measure(workload, lean, args.n_docs, args.batch_size)
+            name = f"{workload}{' lean' if lean else ''}"
+            print(f"{name:<16}{result['warm_mib']:>14.1f}{result['peak_mib']:>10.1f}{result['peak_mib'] - result['warm_mib']:>10.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+import time
+import argparse
+from bangla_person_ner.bangla_person_ner import BanglaPersorNer
+from bangla_person_ner.utils.batching import LengthBucketScheduler, estimate_wordpieces, padding_ratio
+from bangla_person_ner.config import config as cfg
+from ._corpus import mixed_length_texts
+
+def main() -> None:
+    """This function compares padding ratio (and, throughput) of fixed size batches in input order
+    with length bucketed batches on a corpus of mixed length texts.
+    """
+    # create argument parser
+    parser = argparse.ArgumentParser(description='Benchmark length bucketed batch scheduling.')
+    parser.add_argument('-n', '--n-docs', type=int, default=2000, help='number of synthetic documents.')
+    parser.add_argument('-b', '--batch-size', type=int, default=cfg.BATCH_SIZE, help='batch size of input order batching.')
+    parser.add_argument('--max-tokens', type=int, default=cfg.SCHEDULER_MAX_TOKENS, help='token budget of a scheduled batch.')
+    parser.add_argument('--with-model', action='store_true', help='also measure throughput with the model.')
+    # parse arguments
+    args = parser.parse_args()
+    # create synthetic corpus and estimate wordpieces of each text
+    texts = mixed_length_texts(args.n_docs)
+    lengths = [estimate_wordpieces(text) for text in texts]
+    scheduler = LengthBucketScheduler(max_tokens=args.max_tokens)
+    # batches in input order and scheduled batches
+    fixed_batches = [list(range(i, min(i + args.batch_size, len(texts)))) for i in range(0, len(texts), args.batch_size)]
+    scheduled_batches = scheduler.plan(texts)
+    # print padding report
+    print(f"Documents : {len(texts)}, estimated wordpieces min/mean/max : "
+          f"{min(lengths)}/{sum(lengths) / len(lengths):.1f}/{max(lengths)}\n")
+    print(f"{'':<24}{'batches':>10}{'padding ratio':>16}")
+    print("-"*50)
+    print(f"{'input order':<24}{len(fixed_batches):>10}{padding_ratio(lengths, fixed_batches):>16.4f}")
+    print(f"{'length bucketed':<24}{len(scheduled_batches):>10}{padding_ratio(lengths, scheduled_batches):>16.4f}")
+    if not args.with_model:
+        return
+    # measure throughput with and without scheduler, results must be same
+    rows = {}
+    results = {}
+    for name, bp_ner in (("input order", BanglaPersorNer()), ("length bucketed", BanglaPersorNer(scheduler=scheduler))):
+        bp_ner.warmup()
+        start = time.perf_counter()
+        results[name] = bp_ner.extract_person_names_batch(texts, batch_size=args.batch_size)
+        elapsed = time.perf_counter() - start
+        rows[name] = len(texts) / elapsed if elapsed > 0 else float("inf")
+    if results["input order"] != results["length bucketed"]:
+        raise RuntimeError("Scheduled results do not match input order results.")
+    print()
+    for name, docs_per_sec in rows.items():
+        print(f"{name:<24}{docs_per_sec:>12.2f} docs/sec")
+    print(f"Speedup : {rows['length bucketed'] / rows['input order']:.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import os
+import time
+import argparse
+import tempfile
+from bangla_person_ner.preprocessing.raw_data_processing import iter_text_data, iter_jsonl_data
+from bangla_person_ner.config import config as cfg
+from ._corpus import synthetic_tagged_sentences
+from .microbench import _write_text_data, _write_jsonl_data
+
+def default_workers() -> list:
+    """This function returns numbers of workers to try, powers of two up to cpu count and cpu count.
+
+    Returns:
+        list: numbers of workers
+    """
+    cpu_count = os.cpu_count() or 1
+    workers = [1]
+    while workers[-1] * 2 <= cpu_count:
+        workers.append(workers[-1] * 2)
+    if workers[-1] != cpu_count:
+        workers.append(cpu_count)
+    return workers
+
+def main() -> None:
+    """This function measures scaling of parallel raw data processing over numbers of workers and
+    checks that output is same as serial processing.
+    """
+    # create argument parser
+    parser = argparse.ArgumentParser(description='Benchmark parallel raw data processing over numbers of workers.')
+    parser.add_argument('-n', '--n-sentences', type=int, default=100000, help='number of synthetic sentences.')
+    parser.add_argument('-w', '--workers', type=int, nargs='+', default=default_workers(), help='numbers of workers to try.')
+    parser.add_argument('-c', '--chunk-size', type=int, default=cfg.PREPROCESS_CHUNK_SIZE, help='number of sentences sent to a worker at once.')
+    parser.add_argument('-f', '--formats', nargs='+', choices=["text", "jsonl"], default=["text", "jsonl"], help='raw data formats.')
+    # parse arguments
+    args = parser.parse_args()
+    corpus = synthetic_tagged_sentences(args.n_sentences)
+    print(f"Sentences : {args.n_sentences}, chunk size : {args.chunk_size}, cpu count : {os.cpu_count()}\n")
+    print(f"{'':<10}{'workers':>8}{'sentences/sec':>16}{'speedup':>10}")
+    print("-"*44)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for data_format in args.formats:
+            # write synthetic raw data
+            data_path = os.path.join(tmp_dir, "raw.txt" if data_format == "text" else "raw.jsonl")
+            (_write_text_data if data_format == "text" else _write_jsonl_data)(corpus, data_path)
+            iter_data = iter_text_data if data_format == "text" else iter_jsonl_data
+            # serial output and throughput are the reference
+            start = time.perf_counter()
+            serial_output = list(iter_data(data_path, 1, args.chunk_size))
+            serial_rate = args.n_sentences / (time.perf_counter() - start)
+            for n_workers in args.workers:
+                start = time.perf_counter()
+                output = list(iter_data(data_path, n_workers, args.chunk_size))
+                rate = args.n_sentences / (time.perf_counter() - start)
+                # output of every number of workers must be same as serial output
+                if output != serial_output:
+                    raise RuntimeError(f"Output with {n_workers} workers differs from serial output.")
+                print(f"{data_format:<10}{n_workers:>8}{rate:>16.0f}{rate / serial_rate:>9.2f}x")
+
+if __name__ == "__main__":
+    main()
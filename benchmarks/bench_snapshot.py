@@ -0,0 +1,167 @@
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import statistics
+import subprocess
+import multiprocessing
+from bangla_person_ner.config import config as cfg
+from ._corpus import synthetic_sentences
+
+# project directory, so that subprocesses can import the package
+_project_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# code run in a fresh interpreter to measure loading of the model, after spacy is imported
+#   spacy    : spacy.load of the model directory
+#   snapshot : load_snapshot of its snapshot
+_LOAD_CODE = """
+import time, json
+import spacy
+from bangla_person_ner.utils import spacy_tokenizer
+from bangla_person_ner.utils.snapshot import load_snapshot, weights_memory
+start = time.perf_counter()
+nlp = load_snapshot({snapshot_dir!r}) if "{loader}" == "snapshot" else spacy.load({model_dir!r})
+loaded = time.perf_counter()
+nlp("মো. আলমের কাছ থেকে ১৫ লাখ টাকা আদায় করা হয়।")
+first = time.perf_counter()
+print(json.dumps({{"load": loaded - start, "first_doc": first - loaded, **weights_memory()}}))
+"""
+
+# pipeline of this process, loaded before forking workers or by each spawned worker
+_nlp = None
+
+def _load(loader: str, model_dir: str, snapshot_dir: str) -> object:
+    """This function loads the model with spacy or from its snapshot.
+
+    Args:
+        loader (str): "spacy" or "snapshot"
+        model_dir (str): directory of the spacy model
+        snapshot_dir (str): directory of the snapshot
+
+    Returns:
+        object: Spacy Language object
+    """
+    import spacy
+    from bangla_person_ner.utils import spacy_tokenizer
+    from bangla_person_ner.utils.snapshot import load_snapshot
+    return load_snapshot(snapshot_dir) if loader == "snapshot" else spacy.load(model_dir)
+
+def _worker(loader: str, model_dir: str, snapshot_dir: str, n_docs: int, barrier: object, results: object) -> None:
+    """This function runs inference in a worker and reports its memory once all workers are warm.
+
+    Args:
+        loader (str): "spacy" or "snapshot"
+        model_dir (str): directory of the spacy model
+        snapshot_dir (str): directory of the snapshot
+        n_docs (int): number of documents processed by the worker
+        barrier (object): barrier of all workers
+        results (object): queue of memory reports
+    """
+    from bangla_person_ner.utils.snapshot import weights_memory
+    global _nlp
+    if _nlp is None:
+        _nlp = _load(loader, model_dir, snapshot_dir)
+    for _ in _nlp.pipe(synthetic_sentences(n_docs)):
+        pass
+    # all workers are alive while memory is read, so shared pages are divided between them
+    barrier.wait()
+    results.put(weights_memory())
+    barrier.wait()
+
+def run_workers(loader: str, start_method: str, n_workers: int, model_dir: str, snapshot_dir: str, n_docs: int) -> list:
+    """This function starts workers (forked after loading the model, or spawned and loading it
+    themselves) and returns their memory reports.
+
+    Args:
+        loader (str): "spacy" or "snapshot"
+        start_method (str): "fork" or "spawn"
+        n_workers (int): number of workers
+        model_dir (str): directory of the spacy model
+        snapshot_dir (str): directory of the snapshot
+        n_docs (int): number of documents processed by each worker
+
+    Returns:
+        list: memory report of each worker (see utils.snapshot.weights_memory)
+    """
+    global _nlp
+    if start_method == "fork":
+        _nlp = _load(loader, model_dir, snapshot_dir)
+    context = multiprocessing.get_context(start_method)
+    barrier, results = context.Barrier(n_workers), context.Queue()
+    workers = [context.Process(target=_worker, args=(loader, model_dir, snapshot_dir, n_docs, barrier, results))
+               for _ in range(n_workers)]
+    for worker in workers:
+        worker.start()
+    reports = [results.get() for _ in workers]
+    for worker in workers:
+        worker.join()
+    return reports
+
+def _run_python(args: list) -> dict:
+    """This function runs python in a fresh interpreter and returns the json it prints.
+
+    Args:
+        args (list): arguments of python
+
+    Returns:
+        dict: json printed by the code
+    """
+    output = subprocess.run(
+        [sys.executable] + args, cwd=_project_dir, check=True, capture_output=True, text=True)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+def main() -> None:
+    """This function compares cold start and per worker memory of loading the model with spacy
+    and from its snapshot, each in fresh interpreters.
+    """
+    # create argument parser
+    parser = argparse.ArgumentParser(description='Compare loading the model with spacy and from its snapshot.')
+    parser.add_argument('-m', '--model-dir', type=str, default=cfg.MODEL_DIR, help='directory of the spacy model.')
+    parser.add_argument('-r', '--repeat', type=int, default=5, help='number of fresh interpreters per cold start measurement.')
+    parser.add_argument('-w', '--workers', type=int, default=4, help='number of workers for memory report.')
+    parser.add_argument('-n', '--n-docs', type=int, default=200, help='number of documents processed by each worker.')
+    parser.add_argument('--run-workers', nargs=2, default=None, help=argparse.SUPPRESS)
+    parser.add_argument('--snapshot-dir', type=str, default=None, help=argparse.SUPPRESS)
+    # parse arguments
+    args = parser.parse_args()
+    # run workers of one configuration in this interpreter (called by main in a fresh interpreter)
+    if args.run_workers:
+        loader, start_method = args.run_workers
+        reports = run_workers(loader, start_method, args.workers, args.model_dir, args.snapshot_dir, args.n_docs)
+        print(json.dumps(reports))
+        return
+    with tempfile.TemporaryDirectory() as snapshot_dir:
+        # save a snapshot of the model
+        start = time.perf_counter()
+        import spacy
+        from bangla_person_ner.utils import spacy_tokenizer
+        from bangla_person_ner.utils.snapshot import save_snapshot
+        save_snapshot(spacy.load(args.model_dir), snapshot_dir, args.model_dir)
+        print(f"Saved snapshot in {time.perf_counter() - start:.1f} s, weights : "
+              f"{os.path.getsize(os.path.join(snapshot_dir, 'weights.bin')) / 1024 / 1024:.1f} MiB\n")
+        print("Cold start (median of fresh interpreters, after importing spacy)")
+        print(f"{'':<10}{'load ms':>10}{'first doc ms':>14}{'RSS MiB':>10}")
+        print("-"*44)
+        for loader in ("spacy", "snapshot"):
+            code = _LOAD_CODE.format(loader=loader, model_dir=args.model_dir, snapshot_dir=snapshot_dir)
+            runs = [_run_python(["-c", code]) for _ in range(args.repeat)]
+            load_ms = statistics.median(run["load"] for run in runs) * 1000
+            first_ms = statistics.median(run["first_doc"] for run in runs) * 1000
+            rss_mib = statistics.median(run["rss_mib"] for run in runs)
+            print(f"{loader:<10}{load_ms:>10.1f}{first_ms:>14.1f}{rss_mib:>10.1f}")
+        print(f"\nMemory of {args.workers} workers (mean per worker, MiB)")
+        print(f"{'':<20}{'RSS':>8}{'PSS':>8}{'shared':>8}{'weights RSS':>13}{'weights PSS':>13}")
+        print("-"*70)
+        for start_method in ("fork", "spawn"):
+            for loader in ("spacy", "snapshot"):
+                reports = _run_python([
+                    "-m", "benchmarks.bench_snapshot", "--run-workers", loader, start_method, "-m", args.model_dir,
+                    "-w", str(args.workers), "-n", str(args.n_docs), "--snapshot-dir", snapshot_dir])
+                mean = {key: statistics.mean(report[key] for report in reports) for key in reports[0]}
+                print(f"{loader + ' ' + start_method:<20}{mean['rss_mib']:>8.1f}{mean['pss_mib']:>8.1f}{mean['shared_mib']:>8.1f}"
+                      f"{mean['weights_rss_mib']:>13.1f}{mean['weights_pss_mib']:>13.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+import time
+import argparse
+import spacy
+from bangla_person_ner.utils.tokenizer import BasicTokenizer
+from bangla_person_ner.utils.spacy_tokenizer import blank_pipeline
+from ._corpus import mixed_length_texts
+
+# sentences where spacy bangla tokenizer and BasicTokenizer may disagree: abbreviations with
+# dots, currency, percentages, apostrophes, emails
+EDGE_SENTENCES = [
+    "এ.কে.এম. ফজলুল হক ১৯৫৪ সালে মুখ্যমন্ত্রী হন।",
+    "মো. আলম ও ডা. রহিম উদ্দিন বৈঠকে ছিলেন।",
+    "মূল্য ৳৫০০/- মাত্র।",
+    "চালের দাম ১৫% বেড়েছে।",
+    "রহিম'স দোকানে ভিড় ছিল।",
+    "ই-মেইল: info@example.com",
+    "তিনি বলেন, \"আমরা (১৫) জন ছিলাম।\"",
+    "ঢাকা-চট্টগ্রাম মহাসড়কে যানজট।",
+]
+
+def measure_pipe(nlp: object, texts: list, batch_size: int, repeat: int) -> float:
+    """This function measures throughput of tokenization inside nlp.pipe, best of repeat runs.
+
+    Args:
+        nlp (object): blank Spacy Language object (pipe only tokenizes)
+        texts (list): texts to tokenize
+        batch_size (int): number of texts in each batch
+        repeat (int): number of timed runs
+
+    Returns:
+        float: texts per second
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in nlp.pipe(texts, batch_size=batch_size):
+            pass
+        best = min(best, time.perf_counter() - start)
+    return len(texts) / best if best > 0 else float("inf")
+
+def parity(nlp: object, texts: list) -> float:
+    """This function finds fraction of texts whose tokens (whitespace tokens excluded) are same
+    as BasicTokenizer tokens, i.e. tokens of training data.
+
+    Args:
+        nlp (object): Spacy Language object
+        texts (list): texts to tokenize
+
+    Returns:
+        float: fraction of texts with same tokens
+    """
+    tokenizer = BasicTokenizer()
+    same = sum(
+        [token.text for token in doc if not token.is_space] == tokenizer.tokenize(text)
+        for doc, text in zip(nlp.pipe(texts), texts))
+    return same / len(texts)
+
+def main() -> None:
+    """This function compares spacy bangla tokenizer with BasicTokenizer registered as spacy
+    tokenizer, throughput inside nlp.pipe and parity with tokens of training data.
+    """
+    # create argument parser
+    parser = argparse.ArgumentParser(description='Benchmark BasicTokenizer as spacy tokenizer against spacy bangla tokenizer.')
+    parser.add_argument('-n', '--n-docs', type=int, default=5000, help='number of synthetic documents.')
+    parser.add_argument('-b', '--batch-size', type=int, default=256, help='number of texts in each batch.')
+    parser.add_argument('-r', '--repeat', type=int, default=5, help='number of timed runs, best is reported.')
+    # parse arguments
+    args = parser.parse_args()
+    texts = mixed_length_texts(args.n_docs)
+    pipelines = {"spacy bn tokenizer": spacy.blank("bn"), "BasicTokenizer": blank_pipeline()}
+    print(f"Documents : {len(texts)}, best of {args.repeat} runs\n")
+    print(f"{'':<24}{'docs/sec':>12}{'parity':>10}{'parity (edge cases)':>22}")
+    print("-"*68)
+    for name, nlp in pipelines.items():
+        docs_per_sec = measure_pipe(nlp, texts, args.batch_size, args.repeat)
+        print(f"{name:<24}{docs_per_sec:>12.0f}{parity(nlp, texts):>10.2%}{parity(nlp, EDGE_SENTENCES):>22.2%}")
+
+if __name__ == "__main__":
+    main()
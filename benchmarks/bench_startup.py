@@ -0,0 +1,95 @@
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+# project directory, so that subprocesses can import the package
+_project_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# modules whose import time is measured
+IMPORT_TARGETS = [
+    "bangla_person_ner",
+    "bangla_person_ner.utils.tokenizer",
+    "bangla_person_ner.bangla_person_ner",
+]
+
+# code run in a fresh interpreter to measure import time of a module
+_IMPORT_CODE = """
+import sys, time, json
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "spacy_imported": "spacy" in sys.modules}}))
+"""
+
+# code run in a fresh interpreter to measure cold start of the model
+_COLD_START_CODE = """
+import time, json
+start = time.perf_counter()
+from bangla_person_ner.bangla_person_ner import BanglaPersorNer
+bp_ner = BanglaPersorNer()
+created = time.perf_counter()
+bp_ner.warmup(batch_size=1)
+warm = time.perf_counter()
+bp_ner.extract_person_name("মো. আলমের কাছ থেকে ১৫ লাখ টাকা আদায় করা হয়।")
+first = time.perf_counter()
+print(json.dumps({"create": created - start, "warmup": warm - created, "first_request": first - warm}))
+"""
+
+def _run_python(code: str) -> dict:
+    """This function runs python code in a fresh interpreter and returns the json it prints.
+
+    Args:
+        code (str): python code to run
+
+    Returns:
+        dict: json printed by the code
+    """
+    output = subprocess.run(
+        [sys.executable, "-c", code], cwd=_project_dir, check=True, capture_output=True, text=True)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+def main() -> None:
+    """This function measures import time of package entry points and cold start time of
+    the model, each in fresh interpreters. It exits with non zero status if a limit is exceeded.
+    """
+    # create argument parser
+    parser = argparse.ArgumentParser(description='Benchmark import time and cold start of bangla_person_ner.')
+    parser.add_argument('-r', '--repeat', type=int, default=5, help='number of fresh interpreters per measurement.')
+    parser.add_argument('--max-import-ms', type=float, default=None, help='fail if median import time of any target exceeds this.')
+    parser.add_argument('--cold-start', action='store_true', help='also measure model loading and first request (needs model).')
+    # parse arguments
+    args = parser.parse_args()
+    failed = False
+
+    print("Import time (median of fresh interpreters)")
+    print("-"*30)
+    for module in IMPORT_TARGETS:
+        # measure import in fresh interpreters
+        runs = [_run_python(_IMPORT_CODE.format(module=module)) for _ in range(args.repeat)]
+        median_ms = statistics.median(run["seconds"] for run in runs) * 1000
+        spacy_imported = runs[0]["spacy_imported"]
+        print(f"{module} : {median_ms:.1f} ms (spacy imported: {spacy_imported})")
+        # importing the package must stay lazy
+        if spacy_imported:
+            print(f"  FAIL: {module} imports spacy at import time")
+            failed = True
+        if args.max_import_ms is not None and median_ms > args.max_import_ms:
+            print(f"  FAIL: exceeds {args.max_import_ms} ms")
+            failed = True
+
+    if args.cold_start:
+        print("\nCold start (median of fresh interpreters)")
+        print("-"*30)
+        runs = [_run_python(_COLD_START_CODE) for _ in range(args.repeat)]
+        for stage in ["create", "warmup", "first_request"]:
+            print(f"{stage} : {statistics.median(run[stage] for run in runs) * 1000:.1f} ms")
+
+    # exit with error status if any check failed
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
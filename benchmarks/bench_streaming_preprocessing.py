@@ -0,0 +1,78 @@
+import os
+import sys
+import json
+import argparse
+import tempfile
+import subprocess
+from ._corpus import synthetic_tagged_sentences
+from .microbench import _write_text_data, _write_jsonl_data
+
+# project directory, so that subprocesses can import the package
+_project_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# code run in a fresh interpreter to measure peak RSS of processing a raw data file
+#   memory    : process_*_data keeps processed data in memory and writes it at once
+#   streaming : iter_*_data streams processed sentences to disk with save_processed_data
+_MEMORY_CODE = """
+import sys, json, time, resource
+from bangla_person_ner.preprocessing import raw_data_processing as rdp
+
+def peak_rss_mib():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, linux reports KiB
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+start_mib = peak_rss_mib()
+start = time.perf_counter()
+if "{mode}" == "memory":
+    process = rdp.process_text_data if "{data_format}" == "text" else rdp.process_jsonl_data
+    process({data_path!r}, print_summary=False, save_path={save_path!r})
+else:
+    iter_data = rdp.iter_text_data if "{data_format}" == "text" else rdp.iter_jsonl_data
+    rdp.save_processed_data(iter_data({data_path!r}), {save_path!r})
+print(json.dumps({{"seconds": time.perf_counter() - start, "growth_mib": peak_rss_mib() - start_mib}}))
+"""
+
+def measure(mode: str, data_format: str, data_path: str, save_path: str) -> dict:
+    """This function processes a raw data file in a fresh interpreter and returns time and peak RSS growth.
+
+    Args:
+        mode (str): "memory" or "streaming"
+        data_format (str): "text" (data_1 format) or "jsonl" (data_2 format)
+        data_path (str): path of the raw data file
+        save_path (str): path of the processed json file
+
+    Returns:
+        dict: seconds and peak RSS growth in MiB
+    """
+    code = _MEMORY_CODE.format(mode=mode, data_format=data_format, data_path=data_path, save_path=save_path)
+    output = subprocess.run(
+        [sys.executable, "-c", code], cwd=_project_dir, check=True, capture_output=True, text=True)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+def main() -> None:
+    """This function compares peak RSS of in-memory and streaming raw data processing for growing
+    corpus sizes, streaming should stay flat.
+    """
+    # create argument parser
+    parser = argparse.ArgumentParser(description='Compare peak RSS of in-memory and streaming raw data processing.')
+    parser.add_argument('-n', '--n-sentences', type=int, nargs='+', default=[20000, 80000], help='corpus sizes.')
+    parser.add_argument('-f', '--formats', nargs='+', choices=["text", "jsonl"], default=["text", "jsonl"], help='raw data formats.')
+    # parse arguments
+    args = parser.parse_args()
+    print(f"{'':<24}{'sentences':>12}{'seconds':>10}{'RSS growth MiB':>16}")
+    print("-"*62)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for data_format in args.formats:
+            for n in args.n_sentences:
+                # write synthetic raw data
+                data_path = os.path.join(tmp_dir, f"raw_{n}.{'txt' if data_format == 'text' else 'jsonl'}")
+                write = _write_text_data if data_format == "text" else _write_jsonl_data
+                write(synthetic_tagged_sentences(n), data_path)
+                for mode in ("memory", "streaming"):
+                    result = measure(mode, data_format, data_path, os.path.join(tmp_dir, "processed.json"))
+                    name = f"{data_format} {mode}"
+                    print(f"{name:<24}{n:>12}{result['seconds']:>10.2f}{result['growth_mib']:>16.1f}")
+
+if __name__ == "__main__":
+    main()
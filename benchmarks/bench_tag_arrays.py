@@ -0,0 +1,101 @@
+import time
+import random
+import argparse
+import numpy as np
+from spacy.training.iob_utils import iob_to_biluo
+from bangla_person_ner.preprocessing.raw_data_processing import _remove_unwanted_tags, _data_key
+from bangla_person_ner.preprocessing.tag_arrays import (
+    encode_tags, decode_tags, filter_tags, iob_to_biluo_ids, single_tag_mask)
+from ._corpus import synthetic_tagged_sentences
+
+# tags which exercise every branch: kept and removed tags of both datasets, lower case tags, BILUO
+# tags kept as they are, "I-"/"L-" without a "B-" and tags continuing another label
+_EDGE_TAGS = ["O", "B-PER", "I-PER", "B-PERSON", "I-PERSON", "L-PERSON", "U-PERSON", "b-per", "i-Per",
+              "B-LOC", "I-LOC", "B-ORG", "U-ORG", "L-PER", "O", "O", "O"]
+
+def random_tag_lists(n: int, seed: int = 0) -> list:
+    """This function builds random tag lists mixing edge case tags, including empty lists.
+
+    Args:
+        n (int): number of tag lists
+        seed (int, optional): seed of the random generator. Defaults to 0.
+
+    Returns:
+        list: list of tag lists
+    """
+    rng = random.Random(seed)
+    return [[rng.choice(_EDGE_TAGS) for _ in range(rng.randint(0, 12))] for _ in range(n)]
+
+def reference(tag_lists: list) -> tuple:
+    """This function processes tags one sentence at a time with string functions.
+
+    Args:
+        tag_lists (list): list of tags of each sentence
+
+    Returns:
+        tuple: BILUO tags of each sentence and indices of sentences with and without person tag
+    """
+    biluo_lists = [iob_to_biluo(_remove_unwanted_tags(tags)) for tags in tag_lists]
+    keys = [_data_key(tags) for tags in biluo_lists]
+    person = [i for i, key in enumerate(keys) if key == "person"]
+    no_person = [i for i, key in enumerate(keys) if key == "no_person"]
+    return (biluo_lists, person, no_person)
+
+def vectorized(tag_lists: list) -> tuple:
+    """This function processes tags of all sentences at once as an array of tag ids.
+
+    Args:
+        tag_lists (list): list of tags of each sentence
+
+    Returns:
+        tuple: BILUO tags of each sentence and indices of sentences with and without person tag
+    """
+    ids, offsets, vocab = encode_tags(tag_lists)
+    ids, vocab = filter_tags(ids, vocab)
+    ids, vocab = iob_to_biluo_ids(ids, offsets, vocab)
+    no_person = single_tag_mask(ids, offsets)
+    return (decode_tags(ids, offsets, vocab), np.flatnonzero(~no_person).tolist(), np.flatnonzero(no_person).tolist())
+
+def timed(func, tag_lists: list) -> tuple:
+    """This function runs a tag pipeline and measures its time.
+
+    Args:
+        func (Callable): reference or vectorized
+        tag_lists (list): list of tags of each sentence
+
+    Returns:
+        tuple: output of func and seconds
+    """
+    start = time.perf_counter()
+    output = func(tag_lists)
+    return (output, time.perf_counter() - start)
+
+def main() -> None:
+    """This function checks that vectorized tag pipeline gives same output as string functions and
+    compares their throughput.
+    """
+    # create argument parser
+    parser = argparse.ArgumentParser(description='Compare vectorized tag pipeline with string functions.')
+    parser.add_argument('-n', '--n-sentences', type=int, default=1000000, help='number of synthetic sentences.')
+    parser.add_argument('--n-random', type=int, default=100000, help='number of random edge case tag lists to check.')
+    # parse arguments
+    args = parser.parse_args()
+    # outputs must be same on edge cases
+    edge_lists = random_tag_lists(args.n_random)
+    assert vectorized(edge_lists) == reference(edge_lists), "vectorized output differs on edge cases"
+    print(f"Checked {args.n_random} random edge case tag lists : same output")
+    tag_lists = [tags for _, tags in synthetic_tagged_sentences(args.n_sentences)]
+    n_tags = sum(len(tags) for tags in tag_lists)
+    print(f"Sentences : {args.n_sentences}, tags : {n_tags}\n")
+    expected, reference_seconds = timed(reference, tag_lists)
+    output, vectorized_seconds = timed(vectorized, tag_lists)
+    assert output == expected, "vectorized output differs on synthetic corpus"
+    del expected, output
+    print(f"{'':<12}{'seconds':>10}{'tags/sec':>14}")
+    print("-"*36)
+    print(f"{'reference':<12}{reference_seconds:>10.2f}{n_tags / reference_seconds:>14.0f}")
+    print(f"{'vectorized':<12}{vectorized_seconds:>10.2f}{n_tags / vectorized_seconds:>14.0f}")
+    print(f"\nSpeedup : {reference_seconds / vectorized_seconds:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+import time
+import random
+import argparse
+from bangla_person_ner.utils.tokenizer import BasicTokenizer, _char_class
+from ._corpus import SAMPLE_SENTENCES, mixed_length_texts
+
+# characters which exercise every branch of the tokenizer: whitespace (ascii, no-break, ideographic,
+# line separator), removed characters (null, replacement, control, zero width joiners), punctuation
+# (ascii, dari, skipped "."), bangla letters, signs and digits
+_EDGE_CHARS = list(" \t\n\r\xa0\u3000\u2028\x00\ufffd\x1c\x0b\x85\x7f\u200c\u200d.,-!?\"'()[]`^$\u0964\u0965"
+                   "abcZ\u0995\u0996\u0997\u09be\u09bf\u09c1\u09cd\u09e7\u09e8")
+
+def random_texts(n: int, seed: int = 0) -> list:
+    """This function builds random texts mixing edge case characters with random code points.
+
+    Args:
+        n (int): number of texts
+        seed (int, optional): seed of the random generator. Defaults to 0.
+
+    Returns:
+        list: list of texts
+    """
+    rng = random.Random(seed)
+    texts = []
+    for _ in range(n):
+        chars = []
+        for _ in range(rng.randint(0, 40)):
+            if rng.random() < 0.8:
+                chars.append(rng.choice(_EDGE_CHARS))
+            else:
+                # surrogates can not be encoded, they are replaced like in text read from a file
+                chars.append(chr(rng.randrange(0x110000)).encode("utf-8", "replace").decode("utf-8"))
+        texts.append("".join(chars))
+    return texts
+
+def check_equivalence(tokenizer: BasicTokenizer, texts: list) -> int:
+    """This function checks that tokenize and tokenize_with_offsets agree with reference
+    implementation on each text.
+
+    Args:
+        tokenizer (BasicTokenizer): tokenizer to check
+        texts (list): texts to tokenize
+
+    Raises:
+        AssertionError: If outputs differ on a text
+
+    Returns:
+        int: number of checked texts
+    """
+    for text in texts:
+        expected = tokenizer.tokenize_reference(text)
+        tokens = tokenizer.tokenize(text)
+        assert tokens == expected, f"tokenize differs on {text!r}: {tokens} != {expected}"
+        # a span without its removed characters must be the token
+        spans = tokenizer.tokenize_with_offsets(text)
+        span_tokens = ["".join(char for char in text[start:end] if _char_class(char) != "x") for start, end in spans]
+        assert span_tokens == expected, f"tokenize_with_offsets differs on {text!r}: {spans} != {expected}"
+    return len(texts)
+
+def measure(func, texts: list, repeat: int) -> float:
+    """This function measures throughput of a tokenize function, best of repeat runs.
+
+    Args:
+        func (Callable): function taking a text
+        texts (list): texts to tokenize
+        repeat (int): number of timed runs
+
+    Returns:
+        float: texts per second
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in texts:
+            func(text)
+        best = min(best, time.perf_counter() - start)
+    return len(texts) / best if best > 0 else float("inf")
+
+def main() -> None:
+    """This function checks that fast tokenizer gives same output as reference implementation
+    and compares their throughput.
+    """
+    # create argument parser
+    parser = argparse.ArgumentParser(description='Check and benchmark table driven BasicTokenizer against reference implementation.')
+    parser.add_argument('-n', '--n-docs', type=int, default=5000, help='number of synthetic documents.')
+    parser.add_argument('--n-random', type=int, default=100000, help='number of random texts used for equivalence check.')
+    parser.add_argument('-r', '--repeat', type=int, default=5, help='number of timed runs, best is reported.')
+    # parse arguments
+    args = parser.parse_args()
+    tokenizer = BasicTokenizer()
+    texts = mixed_length_texts(args.n_docs)
+    # check equivalence on realistic and random texts
+    n_checked = check_equivalence(tokenizer, SAMPLE_SENTENCES + texts + random_texts(args.n_random))
+    print(f"Equivalence : OK on {n_checked} texts\n")
+    # measure throughput
+    rows = {
+        "reference": measure(tokenizer.tokenize_reference, texts, args.repeat),
+        "tokenize": measure(tokenizer.tokenize, texts, args.repeat),
+        "tokenize_with_offsets": measure(tokenizer.tokenize_with_offsets, texts, args.repeat),
+    }
+    print(f"Documents : {len(texts)}, best of {args.repeat} runs\n")
+    print(f"{'':<24}{'docs/sec':>12}{'speedup':>10}")
+    print("-"*46)
+    for name, docs_per_sec in rows.items():
+        print(f"{name:<24}{docs_per_sec:>12.0f}{docs_per_sec / rows['reference']:>9.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+import argparse
+from bangla_person_ner.bangla_person_ner import BanglaPersorNer
+from bangla_person_ner.utils.engines import ENGINES
+from bangla_person_ner.config import config as cfg
+from ._evaluation import load_gold_docs, evaluate_ner, print_report
+
+def main() -> None:
+    """This function compares F1 and throughput of inference engines on test data.
+    onnx engines need the model exported first (python -m bangla_person_ner.utils.engines).
+    """
+    # create argument parser
+    parser = argparse.ArgumentParser(description='Compare F1 and docs/sec of inference engines.')
+    parser.add_argument('-e', '--engines', nargs='+', choices=ENGINES, default=list(ENGINES), help='engines to compare.')
+    parser.add_argument('-d', '--data', type=str, default=cfg.TEST_DATA_PATH, help='spacy binary test data.')
+    parser.add_argument('-b', '--batch-size', type=int, default=cfg.BATCH_SIZE, help='batch size.')
+    # parse arguments
+    args = parser.parse_args()
+    rows = {}
+    gold_docs = None
+    for engine in args.engines:
+        # load and warm up the model on the engine
+        bp_ner = BanglaPersorNer(engine=engine)
+        bp_ner.warmup()
+        if gold_docs is None:
+            gold_docs = load_gold_docs(bp_ner.model, args.data)
+        rows[engine] = evaluate_ner(bp_ner.model, gold_docs, batch_size=args.batch_size)
+    # print results
+    print(f"Test data : {args.data} ({len(gold_docs)} docs)\n")
+    print_report(rows)
+
+if __name__ == "__main__":
+    main()
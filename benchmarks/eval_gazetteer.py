@@ -0,0 +1,66 @@
+import time
+import argparse
+from bangla_person_ner.config import config as cfg
+from bangla_person_ner.utils.gazetteer import GazetteerModel
+from bangla_person_ner.utils.lexicon import iter_person_spans_from_docbin
+from ._corpus import synthetic_sentences
+from ._evaluation import load_gold_docs, evaluate_ner, print_report
+
+def measure_throughput(nlp: object, texts: list, batch_size: int = cfg.BATCH_SIZE) -> float:
+    """This function measures texts per second of a pipeline.
+
+    Args:
+        nlp (object): Spacy Language object (or, any object with spacy compatible pipe method)
+        texts (list): texts to run on
+        batch_size (int, optional): number of texts in each batch. Defaults to cfg.BATCH_SIZE.
+
+    Returns:
+        float: texts per second
+    """
+    start = time.perf_counter()
+    for _ in nlp.pipe(texts, batch_size=batch_size):
+        pass
+    elapsed = time.perf_counter() - start
+    return len(texts) / elapsed if elapsed > 0 else float("inf")
+
+def main() -> None:
+    """This function reports accuracy and throughput of the gazetteer engine. By default gazetteer
+    is built from train data, so that names of test data are not known to it.
+    """
+    # create argument parser
+    parser = argparse.ArgumentParser(description='Report F1 and throughput of the gazetteer engine.')
+    parser.add_argument('-d', '--data', type=str, default=cfg.TEST_DATA_PATH, help='spacy binary test data.')
+    parser.add_argument('--gazetteer-data', type=str, default=cfg.TRAIN_DATA_PATH, help='spacy binary data to build gazetteer from.')
+    parser.add_argument('--gazetteer', type=str, default="", help='use a saved gazetteer file instead of building one.')
+    parser.add_argument('-n', '--n-texts', type=int, default=10000, help='number of texts in synthetic corpus for throughput.')
+    parser.add_argument('-b', '--batch-size', type=int, default=cfg.BATCH_SIZE, help='batch size.')
+    parser.add_argument('--with-model', action='store_true', help='also evaluate the model to compare.')
+    # parse arguments
+    args = parser.parse_args()
+    # build or load gazetteer
+    if args.gazetteer:
+        gazetteer = GazetteerModel.from_file(args.gazetteer)
+    else:
+        gazetteer = GazetteerModel(iter_person_spans_from_docbin(args.gazetteer_data))
+    engines = {"gazetteer": gazetteer}
+    if args.with_model:
+        from bangla_person_ner.utils.engines import load_model
+        engines["model"] = load_model(model_dir=cfg.MODEL_DIR)
+    # evaluate on test data and measure throughput on synthetic corpus
+    gold_docs = load_gold_docs(gazetteer, args.data)
+    texts = synthetic_sentences(args.n_texts)
+    rows, throughputs = {}, {}
+    for name, nlp in engines.items():
+        rows[name] = evaluate_ner(nlp, gold_docs, batch_size=args.batch_size)
+        throughputs[name] = measure_throughput(nlp, texts, batch_size=args.batch_size)
+    # print results
+    print(f"Test data : {args.data} ({len(gold_docs)} docs), gazetteer size : {len(gazetteer.names)} names\n")
+    print_report(rows)
+    print(f"\nThroughput on {len(texts)} synthetic texts :")
+    for name, throughput in throughputs.items():
+        print(f"  {name:<14}{throughput:>12.0f} texts/sec")
+    if "model" in throughputs:
+        print(f"  speedup       {throughputs['gazetteer'] / throughputs['model']:>12.1f}x")
+
+if __name__ == "__main__":
+    main()
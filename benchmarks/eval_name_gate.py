@@ -0,0 +1,66 @@
+import time
+import argparse
+from bangla_person_ner.config import config as cfg
+from bangla_person_ner.utils.name_gate import NameGate
+from bangla_person_ner.utils.lexicon import build_name_lexicon, iter_person_spans_from_docbin, load_lexicon
+
+def evaluate_gate(gate: NameGate, gold_docs: list) -> dict:
+    """This function measures how many texts a gate skips and how many names it loses.
+
+    Args:
+        gate (NameGate): gate to evaluate
+        gold_docs (list): annotated Spacy.tokens.Doc objects
+
+    Returns:
+        dict: skip rate, recall of texts with names, recall of names and gate checks per second
+    """
+    n_skipped = n_docs_with_names = n_docs_with_names_passed = n_names = n_names_passed = 0
+    start = time.perf_counter()
+    passed = [gate.could_contain_name(doc.text) for doc in gold_docs]
+    elapsed = time.perf_counter() - start
+    for doc, doc_passed in zip(gold_docs, passed):
+        names = [entity for entity in doc.ents if entity.label_ == "PERSON"]
+        n_skipped += not doc_passed
+        n_names += len(names)
+        n_names_passed += len(names) if doc_passed else 0
+        if names:
+            n_docs_with_names += 1
+            n_docs_with_names_passed += doc_passed
+    return {
+        "skip_rate": n_skipped / len(gold_docs),
+        "text_recall": n_docs_with_names_passed / n_docs_with_names if n_docs_with_names else 1.0,
+        "name_recall": n_names_passed / n_names if n_names else 1.0,
+        "checks_per_sec": len(gold_docs) / elapsed if elapsed > 0 else float("inf"),
+    }
+
+def main() -> None:
+    """This function reports share of skipped texts and recall lost by the name gate on test data.
+    By default lexicon is built from train data, so that names of test data are not known to the gate.
+    """
+    import spacy
+    from spacy.tokens import DocBin
+    # create argument parser
+    parser = argparse.ArgumentParser(description='Report skip rate and recall cost of the name gate.')
+    parser.add_argument('-d', '--data', type=str, default=cfg.TEST_DATA_PATH, help='spacy binary test data.')
+    parser.add_argument('--lexicon-data', type=str, default=cfg.TRAIN_DATA_PATH, help='spacy binary data to build lexicon from.')
+    parser.add_argument('--lexicon', type=str, default="", help='use a saved lexicon file instead of building one.')
+    # parse arguments
+    args = parser.parse_args()
+    # load test data
+    gold_docs = list(DocBin().from_disk(args.data).get_docs(spacy.blank("bn").vocab))
+    # build or load lexicon
+    lexicon = load_lexicon(args.lexicon) if args.lexicon else build_name_lexicon(iter_person_spans_from_docbin(args.lexicon_data))
+    # evaluate gate with and without lexicon
+    rows = {
+        "cues only": evaluate_gate(NameGate(), gold_docs),
+        "cues + lexicon": evaluate_gate(NameGate(lexicon=lexicon), gold_docs),
+    }
+    # print results
+    print(f"Test data : {args.data} ({len(gold_docs)} docs), lexicon size : {len(lexicon)}\n")
+    print(f"{'':<16}{'skip rate':>10}{'text recall':>13}{'name recall':>13}{'checks/sec':>12}")
+    print("-"*64)
+    for name, row in rows.items():
+        print(f"{name:<16}{row['skip_rate']:>10.4f}{row['text_recall']:>13.4f}{row['name_recall']:>13.4f}{row['checks_per_sec']:>12.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+import argparse
+from bangla_person_ner.bangla_person_ner import BanglaPersorNer
+from bangla_person_ner.config import config as cfg
+from ._evaluation import load_gold_docs, evaluate_ner, print_report
+
+def main() -> None:
+    """This function compares F1 and throughput of the transformer teacher and the distilled
+    student model on test data.
+    """
+    # create argument parser
+    parser = argparse.ArgumentParser(description='Compare F1 and docs/sec of teacher and student models.')
+    parser.add_argument('--teacher', type=str, default=cfg.MODEL_DIR, help='directory of the teacher model.')
+    parser.add_argument('--student', type=str, default=cfg.STUDENT_MODEL_DIR, help='directory of the student model.')
+    parser.add_argument('-d', '--data', type=str, default=cfg.TEST_DATA_PATH, help='spacy binary test data.')
+    parser.add_argument('-b', '--batch-size', type=int, default=cfg.BATCH_SIZE, help='batch size.')
+    # parse arguments
+    args = parser.parse_args()
+    rows = {}
+    gold_docs = None
+    for name, model_dir in (("teacher", args.teacher), ("student", args.student)):
+        # load and warm up the model
+        bp_ner = BanglaPersorNer(model_dir=model_dir)
+        bp_ner.warmup()
+        if gold_docs is None:
+            gold_docs = load_gold_docs(bp_ner.model, args.data)
+        rows[name] = evaluate_ner(bp_ner.model, gold_docs, batch_size=args.batch_size)
+    # print results
+    print(f"Test data : {args.data} ({len(gold_docs)} docs)\n")
+    print_report(rows)
+    print(f"\nstudent speedup : {rows['student']['docs_per_sec'] / rows['teacher']['docs_per_sec']:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+import json
+import time
+import asyncio
+import argparse
+import statistics
+from ._corpus import synthetic_sentences
+
+async def _read_response(reader: asyncio.StreamReader) -> tuple:
+    """This function reads a HTTP response.
+
+    Args:
+        reader (asyncio.StreamReader): reader of the connection
+
+    Returns:
+        tuple: tuple of status code and body
+    """
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    status = int(lines[0].split(" ")[1])
+    headers = dict(line.split(":", 1) for line in lines[1:] if ":" in line)
+    headers = {name.strip().lower(): value.strip() for name, value in headers.items()}
+    body = await reader.readexactly(int(headers.get("content-length", 0)))
+    return (status, body)
+
+async def _client(host: str, port: int, texts: list, latencies: list, statuses: dict) -> None:
+    """This function sends requests one after another over a keep-alive connection.
+
+    Args:
+        host (str): server host
+        port (int): server port
+        texts (list): texts to send, one request per text
+        latencies (list): list to append request latencies to
+        statuses (dict): dictionary to count response status codes in
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    for text in texts:
+        body = json.dumps({"text": text}, ensure_ascii=False).encode("utf-8")
+        request = (
+            f"POST /extract HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n"
+        ).encode("latin-1") + body
+        start = time.perf_counter()
+        writer.write(request)
+        await writer.drain()
+        status, _ = await _read_response(reader)
+        latencies.append(time.perf_counter() - start)
+        statuses[status] = statuses.get(status, 0) + 1
+    writer.close()
+
+def _percentile(values: list, percent: float) -> float:
+    """This function returns percentile of values using nearest rank.
+
+    Args:
+        values (list): list of numbers
+        percent (float): percentile in range 0 to 100
+
+    Returns:
+        float: percentile value
+    """
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(percent / 100 * (len(values) - 1))))]
+
+async def run_load(host: str, port: int, concurrency: int, n_requests: int) -> dict:
+    """This function sends n_requests extraction requests using concurrency connections.
+
+    Args:
+        host (str): server host
+        port (int): server port
+        concurrency (int): number of concurrent connections
+        n_requests (int): total number of requests
+
+    Returns:
+        dict: throughput, latency percentiles (ms) and status code counts
+    """
+    texts = synthetic_sentences(n_requests)
+    latencies, statuses = [], {}
+    start = time.perf_counter()
+    await asyncio.gather(*[
+        _client(host, port, texts[i::concurrency], latencies, statuses) for i in range(concurrency)])
+    elapsed = time.perf_counter() - start
+    return {
+        "requests_per_sec": n_requests / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": _percentile(latencies, 95) * 1000,
+        "p99_ms": _percentile(latencies, 99) * 1000,
+        "statuses": statuses,
+    }
+
+def main() -> None:
+    """This function runs the load generator against a running inference server.
+    """
+    # create argument parser
+    parser = argparse.ArgumentParser(description='Async load generator for bangla_person_ner.server.')
+    parser.add_argument('--host', type=str, default="127.0.0.1", help='server host.')
+    parser.add_argument('--port', type=int, default=8000, help='server port.')
+    parser.add_argument('-c', '--concurrency', type=int, default=32, help='number of concurrent connections.')
+    parser.add_argument('-n', '--n-requests', type=int, default=2000, help='total number of requests.')
+    # parse arguments
+    args = parser.parse_args()
+    report = asyncio.run(run_load(args.host, args.port, args.concurrency, args.n_requests))
+    print(json.dumps(report, indent=4))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+import tracemalloc
+from ._corpus import SAMPLE_SENTENCES, synthetic_tagged_sentences
+
+# project directory, so that subprocesses can import the package
+_project_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# default baseline file used by --save-baseline and --baseline
+DEFAULT_BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "microbench_baseline.json")
+
+def _write_text_data(corpus: list, path: str) -> None:
+    """This function writes a tagged corpus in format of data_1 (token and tag separated by tab,
+    sentences separated by empty line).
+
+    Args:
+        corpus (list): list of (tokens, tags) tuples
+        path (str): path of the file
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n\n".join("\n".join(f"{token}\t{tag}" for token, tag in zip(tokens, tags)) for tokens, tags in corpus))
+
+def _write_jsonl_data(corpus: list, path: str) -> None:
+    """This function writes a tagged corpus in format of data_2 ([sentence, tags] per line).
+
+    Args:
+        corpus (list): list of (tokens, tags) tuples
+        path (str): path of the file
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(json.dumps([" ".join(tokens), tags], ensure_ascii=False) for tokens, tags in corpus))
+
+def _setup_tokenize(n: int, tmp_dir: str) -> tuple:
+    """Setup of benchmark of BasicTokenizer.tokenize on sample sentences."""
+    from bangla_person_ner.utils.tokenizer import BasicTokenizer
+    tokenizer = BasicTokenizer()
+    texts = [SAMPLE_SENTENCES[i % len(SAMPLE_SENTENCES)] for i in range(n)]
+    return (lambda: [tokenizer.tokenize(text) for text in texts]), n
+
+def _setup_tokenize_with_offsets(n: int, tmp_dir: str) -> tuple:
+    """Setup of benchmark of BasicTokenizer.tokenize_with_offsets on sample sentences."""
+    from bangla_person_ner.utils.tokenizer import BasicTokenizer
+    tokenizer = BasicTokenizer()
+    texts = [SAMPLE_SENTENCES[i % len(SAMPLE_SENTENCES)] for i in range(n)]
+    return (lambda: [tokenizer.tokenize_with_offsets(text) for text in texts]), n
+
+def _setup_process_text_data(n: int, tmp_dir: str) -> tuple:
+    """Setup of benchmark of process_text_data on a synthetic data_1 file."""
+    from bangla_person_ner.preprocessing.raw_data_processing import process_text_data
+    path = os.path.join(tmp_dir, "data1_raw.txt")
+    _write_text_data(synthetic_tagged_sentences(n), path)
+    return (lambda: process_text_data(path, print_summary=False)), n
+
+def _setup_process_jsonl_data(n: int, tmp_dir: str) -> tuple:
+    """Setup of benchmark of process_jsonl_data on a synthetic data_2 file."""
+    from bangla_person_ner.preprocessing.raw_data_processing import process_jsonl_data
+    path = os.path.join(tmp_dir, "data2_raw.jsonl")
+    _write_jsonl_data(synthetic_tagged_sentences(n), path)
+    return (lambda: process_jsonl_data(path, print_summary=False)), n
+
+def _setup_remove_unwanted_tags(n: int, tmp_dir: str) -> tuple:
+    """Setup of benchmark of _remove_unwanted_tags on synthetic IOB tags."""
+    from bangla_person_ner.preprocessing.raw_data_processing import _remove_unwanted_tags
+    tag_lists = [tags for _, tags in synthetic_tagged_sentences(n)]
+    return (lambda: [_remove_unwanted_tags(tags) for tags in tag_lists]), n
+
+def _setup_iob_to_biluo(n: int, tmp_dir: str) -> tuple:
+    """Setup of benchmark of iob_to_biluo on filtered synthetic IOB tags."""
+    from spacy.training.iob_utils import iob_to_biluo
+    from bangla_person_ner.preprocessing.raw_data_processing import _remove_unwanted_tags
+    tag_lists = [_remove_unwanted_tags(tags) for _, tags in synthetic_tagged_sentences(n)]
+    return (lambda: [iob_to_biluo(tags) for tags in tag_lists]), n
+
+def _setup_tag_arrays(n: int, tmp_dir: str) -> tuple:
+    """Setup of benchmark of vectorized tag filtering and IOB to BILUO conversion on synthetic IOB tags."""
+    from .bench_tag_arrays import vectorized
+    tag_lists = [tags for _, tags in synthetic_tagged_sentences(n)]
+    return (lambda: vectorized(tag_lists)), n
+
+def _setup_convert_save_spacy_binary(n: int, tmp_dir: str) -> tuple:
+    """Setup of benchmark of _convert_save_spacy_binary on processed synthetic data."""
+    from bangla_person_ner.preprocessing.raw_data_processing import process_text_data
+    from bangla_person_ner.preprocessing.train_data_processing import _convert_save_spacy_binary
+    path = os.path.join(tmp_dir, "data1_raw.txt")
+    _write_text_data(synthetic_tagged_sentences(n), path)
+    processed_data = process_text_data(path, print_summary=False)
+    data = processed_data["person"] + processed_data["no_person"]
+    save_path = os.path.join(tmp_dir, "train.spacy")
+    return (lambda: _convert_save_spacy_binary(data, save_path)), len(data)
+
+def _setup_blank_pipeline(n: int, tmp_dir: str) -> tuple:
+    """Setup of benchmark of inference with a blank bangla pipeline."""
+    import spacy
+    # blank bangla pipeline stands in for the model, so tokenization and Doc creation is measured
+    nlp = spacy.blank("bn")
+    texts = [SAMPLE_SENTENCES[i % len(SAMPLE_SENTENCES)] for i in range(n)]
+    return (lambda: list(nlp.pipe(texts, batch_size=256))), n
+
+# benchmarks, name to setup function. a setup function prepares data in a temporary directory
+# and returns the function to measure with number of items it processes.
+BENCHMARKS = {
+    "tokenize": _setup_tokenize,
+    "tokenize_with_offsets": _setup_tokenize_with_offsets,
+    "process_text_data": _setup_process_text_data,
+    "process_jsonl_data": _setup_process_jsonl_data,
+    "remove_unwanted_tags": _setup_remove_unwanted_tags,
+    "iob_to_biluo": _setup_iob_to_biluo,
+    "tag_arrays": _setup_tag_arrays,
+    "convert_save_spacy_binary": _setup_convert_save_spacy_binary,
+    "blank_pipeline": _setup_blank_pipeline,
+}
+
+def _peak_rss_kib() -> float:
+    """This function returns peak resident set size of this process.
+
+    Returns:
+        float: peak RSS in KiB
+    """
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, linux reports KiB
+    return peak / 1024 if sys.platform == "darwin" else peak
+
+def run_benchmark(name: str, n: int, repeat: int) -> dict:
+    """This function runs one benchmark in this process. Time is best of repeat runs, allocations
+    are measured in a separate run with tracemalloc, as tracing slows down the code.
+
+    Args:
+        name (str): name of the benchmark, key of BENCHMARKS
+        n (int): size of synthetic corpus
+        repeat (int): number of timed runs
+
+    Returns:
+        dict: ops_per_sec, peak_rss_kib and alloc_peak_kib
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        func, n_ops = BENCHMARKS[name](n, tmp_dir)
+        # warm up (imports, caches) and time
+        func()
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            best = min(best, time.perf_counter() - start)
+        # measure allocations
+        tracemalloc.start()
+        func()
+        _, alloc_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return {
+        "ops_per_sec": n_ops / best if best > 0 else float("inf"),
+        "peak_rss_kib": _peak_rss_kib(),
+        "alloc_peak_kib": alloc_peak / 1024,
+    }
+
+def run_isolated(name: str, n: int, repeat: int) -> dict:
+    """This function runs one benchmark in a fresh interpreter, so that peak RSS belongs to it only.
+
+    Args:
+        name (str): name of the benchmark, key of BENCHMARKS
+        n (int): size of synthetic corpus
+        repeat (int): number of timed runs
+
+    Returns:
+        dict: result of run_benchmark
+    """
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.microbench", "--run-one", name, "-n", str(n), "-r", str(repeat)],
+        cwd=_project_dir, check=True, capture_output=True, text=True)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+def compare_with_baseline(results: dict, baseline: dict, tolerance: float) -> list:
+    """This function finds benchmarks which are slower than baseline by more than tolerance.
+
+    Args:
+        results (dict): benchmark name to result
+        baseline (dict): benchmark name to baseline result
+        tolerance (float): allowed relative slowdown, i.e. 0.1 for 10%
+
+    Returns:
+        list: list of (name, relative change of ops/sec) tuples of regressed benchmarks
+    """
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        change = result["ops_per_sec"] / baseline[name]["ops_per_sec"] - 1
+        if change < -tolerance:
+            regressions.append((name, change))
+    return regressions
+
+def main() -> None:
+    """This function runs micro benchmarks of hot paths on synthetic data, each in a fresh
+    interpreter, and compares them with a baseline. It exits with non zero status if a benchmark
+    is slower than baseline by more than tolerance.
+    """
+    # create argument parser
+    parser = argparse.ArgumentParser(description='Micro benchmarks of tokenizer, preprocessing and conversion hot paths.')
+    parser.add_argument('-b', '--benchmarks', nargs='+', choices=list(BENCHMARKS), default=list(BENCHMARKS), help='benchmarks to run.')
+    parser.add_argument('-n', '--n-items', type=int, default=2000, help='size of synthetic corpus.')
+    parser.add_argument('-r', '--repeat', type=int, default=5, help='number of timed runs, best is reported.')
+    parser.add_argument('--save-baseline', nargs='?', const=DEFAULT_BASELINE_PATH, default=None, help='save results as baseline.')
+    parser.add_argument('--baseline', nargs='?', const=DEFAULT_BASELINE_PATH, default=None, help='compare results with baseline.')
+    parser.add_argument('--tolerance', type=float, default=0.10, help='allowed relative slowdown against baseline.')
+    parser.add_argument('--run-one', type=str, default="", help=argparse.SUPPRESS)
+    # parse arguments
+    args = parser.parse_args()
+    # run a single benchmark in this interpreter (used by run_isolated)
+    if args.run_one:
+        print(json.dumps(run_benchmark(args.run_one, args.n_items, args.repeat)))
+        return
+    # fail before running benchmarks if there is no baseline to compare with
+    if args.baseline and not os.path.exists(args.baseline):
+        parser.error(f"baseline {args.baseline} does not exist, create it on this machine with "
+                     f"'python -m benchmarks.microbench --save-baseline {args.baseline}'")
+    results = {name: run_isolated(name, args.n_items, args.repeat) for name in args.benchmarks}
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+    # print results
+    print(f"Synthetic corpus : {args.n_items} items, best of {args.repeat} runs\n")
+    print(f"{'':<28}{'ops/sec':>12}{'vs base':>10}{'peak RSS MiB':>14}{'alloc peak MiB':>16}")
+    print("-"*80)
+    for name, result in results.items():
+        change = ""
+        if baseline is not None and name in baseline:
+            change = f"{result['ops_per_sec'] / baseline[name]['ops_per_sec'] - 1:+.1%}"
+        print(f"{name:<28}{result['ops_per_sec']:>12.0f}{change:>10}{result['peak_rss_kib'] / 1024:>14.1f}"
+              f"{result['alloc_peak_kib'] / 1024:>16.2f}")
+    # save baseline
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump({"n_items": args.n_items, "repeat": args.repeat, "results": results}, f, indent=4)
+        print(f"\nSaved baseline at : {args.save_baseline}")
+    # flag regressions
+    if baseline is not None:
+        regressions = compare_with_baseline(results, baseline, args.tolerance)
+        for name, change in regressions:
+            print(f"FAIL: {name} is {-change:.1%} slower than baseline")
+        if regressions:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
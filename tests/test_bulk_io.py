@@ -0,0 +1,66 @@
+import io
+import json
+import pytest
+from bangla_person_ner.bangla_person_ner import run_bulk_extraction
+from bangla_person_ner.utils.bulk_io import iter_corpus_texts, read_checkpoint
+from test_cache_offsets import make_extractor
+
+# jsonl corpus with a blank line, a whitespace-only line and a trailing empty line
+CORPUS = (
+    '{"text": "মো. আলমের কাছ থেকে আলম টাকা আদায় করেন।"}\n'
+    '\n'
+    '"আলম"\n'
+    '  \t\r\n'
+    '{"text": "আলম ও আলম"}\n'
+    '{"text": ""}\n'
+    '\n'
+).encode("utf-8")
+
+def test_blank_lines_are_skipped_and_counted():
+    items = list(iter_corpus_texts(io.BytesIO(CORPUS), input_format="jsonl"))
+    assert [text for text, _, _ in items] == ["মো. আলমের কাছ থেকে আলম টাকা আদায় করেন।", "আলম", "আলম ও আলম", ""]
+    assert [n_lines for _, _, n_lines in items] == [1, 2, 2, 1]
+    # only the trailing empty line is not counted with a text
+    assert sum(n_bytes for _, n_bytes, _ in items) == len(CORPUS) - 1
+
+def test_blank_line_is_a_text_in_plain_text_corpus():
+    items = list(iter_corpus_texts(io.BytesIO(b"a\n\nb\n"), input_format="text"))
+    assert items == [("a", 2, 1), ("", 1, 1), ("b", 2, 1)]
+
+def test_resumed_run_matches_single_run(tmp_path):
+    input_path = tmp_path / "corpus.jsonl"
+    input_path.write_bytes(CORPUS)
+    expected_path = tmp_path / "expected.jsonl"
+    assert run_bulk_extraction(make_extractor(0), str(input_path), str(expected_path), input_format="jsonl") == 4
+
+    # stop the first run after two results
+    bp_ner = make_extractor(0)
+    extract_stream = bp_ner.extract_person_names_stream
+
+    def interrupted_stream(*args, **kwargs):
+        for i, res in enumerate(extract_stream(*args, **kwargs)):
+            if i == 2:
+                raise KeyboardInterrupt
+            yield res
+
+    bp_ner.extract_person_names_stream = interrupted_stream
+    output_path, checkpoint_path = tmp_path / "output.jsonl", tmp_path / "checkpoint.json"
+    with pytest.raises(KeyboardInterrupt):
+        run_bulk_extraction(bp_ner, str(input_path), str(output_path), input_format="jsonl",
+                            checkpoint_path=str(checkpoint_path), checkpoint_every=1)
+    checkpoint = read_checkpoint(str(checkpoint_path))
+    # second text is after a blank line
+    assert checkpoint["lines"] == 3
+    assert CORPUS[checkpoint["input_offset"]:].startswith(b"  \t\r\n")
+
+    # resume from the checkpoint
+    assert run_bulk_extraction(make_extractor(0), str(input_path), str(output_path), input_format="jsonl",
+                               checkpoint_path=str(checkpoint_path), checkpoint_every=1) == 2
+    assert output_path.read_bytes() == expected_path.read_bytes()
+    assert len([json.loads(line) for line in output_path.read_bytes().splitlines()]) == 4
+    # nothing is left after the final checkpoint except the trailing empty line
+    checkpoint = read_checkpoint(str(checkpoint_path))
+    assert (checkpoint["lines"], checkpoint["input_offset"]) == (6, len(CORPUS) - 1)
+    assert run_bulk_extraction(make_extractor(0), str(input_path), str(output_path), input_format="jsonl",
+                               checkpoint_path=str(checkpoint_path)) == 0
+    assert output_path.read_bytes() == expected_path.read_bytes()
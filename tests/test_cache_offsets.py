@@ -0,0 +1,106 @@
+import spacy
+import pytest
+from bangla_person_ner.bangla_person_ner import BanglaPersorNer
+from bangla_person_ner.utils import cache
+from bangla_person_ner.utils.cache import LRUCache
+from bangla_person_ner.utils.spacy_tokenizer import SpacyBasicTokenizer
+
+# same sentence with leading, repeated and trailing whitespace, and in normalized form
+TEXTS = [
+    "  মো. আলমের কাছ থেকে আলম ১৫ লাখ টাকা আদায় করেন।",
+    "মো. আলমের কাছ থেকে আলম   ১৫ লাখ টাকা আদায় করেন। ",
+    "মো. আলমের কাছ থেকে আলম ১৫ লাখ টাকা আদায় করেন।",
+    "\tআলম\n\nআলম",
+    "",
+]
+
+def make_extractor(cache_size: int) -> BanglaPersorNer:
+    """This function creates an extractor whose model is a blank pipeline with BasicTokenizer
+    and an entity ruler, so that predictions do not need a trained model.
+    """
+    nlp = spacy.blank("bn")
+    nlp.tokenizer = SpacyBasicTokenizer(nlp.vocab)
+    nlp.add_pipe("entity_ruler").add_patterns([{"label": "PERSON", "pattern": "আলম"}])
+    bp_ner = BanglaPersorNer(cache_size=cache_size, tuned_config_path="")
+    bp_ner._model = nlp
+    return bp_ner
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_cache_does_not_change_results(compact):
+    uncached = make_extractor(0)
+    cached = make_extractor(100)
+    expected = [uncached.extract_person_name(text, compact=compact) for text in TEXTS]
+    # twice, so that second pass is served from the cache where possible
+    for _ in range(2):
+        assert [cached.extract_person_name(text, compact=compact) for text in TEXTS] == expected
+        assert cached.extract_person_names_batch(TEXTS + TEXTS, compact=compact) == expected + expected
+
+def test_compact_offsets_point_into_text():
+    bp_ner = make_extractor(100)
+    for _ in range(2):
+        for result in bp_ner.extract_person_names_batch(TEXTS, compact=True):
+            assert result.names or not result.text
+            for name, start_char, end_char in zip(result.names, result.start_chars, result.end_chars):
+                assert result.text[start_char:end_char] == name
+
+class FakeClock(object):
+    """Replacement of time.monotonic which only moves when told to."""
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+def test_lru_cache_ttl_expiry(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(cache.time, "monotonic", clock)
+    lru = LRUCache(maxsize=10, ttl=5)
+    lru.put("a", 1)
+    clock.now += 4.9
+    assert lru.get("a") == 1
+    # a hit does not extend time-to-live
+    clock.now += 0.1
+    assert lru.get("a") is None
+    assert len(lru) == 0
+    # updating an entry restarts its time-to-live
+    lru.put("b", 1)
+    clock.now += 3
+    lru.put("b", 2)
+    clock.now += 3
+    assert lru.get("b") == 2
+    assert lru.stats()["expirations"] == 1
+    assert (lru.stats()["hits"], lru.stats()["misses"]) == (2, 1)
+
+def test_lru_cache_without_ttl_never_expires(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(cache.time, "monotonic", clock)
+    lru = LRUCache(maxsize=10)
+    lru.put("a", 1)
+    clock.now += 10 ** 9
+    assert lru.get("a") == 1
+
+def test_lru_cache_evicts_least_recently_used():
+    lru = LRUCache(maxsize=3)
+    for key in "abc":
+        lru.put(key, key)
+    # "a" becomes most recently used, so "b" is evicted first
+    assert lru.get("a") == "a"
+    lru.put("d", "d")
+    assert lru.get("b") is None
+    # updating "c" also marks it as recently used
+    lru.put("c", "C")
+    lru.put("e", "e")
+    assert lru.get("a") is None
+    assert [lru.get(key) for key in "cde"] == ["C", "d", "e"]
+    assert lru.stats()["evictions"] == 2
+    assert len(lru) == 3
+
+def test_zero_cache_size_disables_cache():
+    bp_ner = make_extractor(0)
+    assert bp_ner._cache is None
+    assert bp_ner.cache_stats() is None
+    expected = [make_extractor(100).extract_person_name(text) for text in TEXTS]
+    for _ in range(2):
+        assert [bp_ner.extract_person_name(text) for text in TEXTS] == expected
+        assert bp_ner.extract_person_names_batch(TEXTS) == expected
+    assert bp_ner._cache is None
@@ -0,0 +1,65 @@
+import pytest
+from bangla_person_ner.utils.chunker import split_sentences, make_windows, merge_spans
+from test_cache_offsets import make_extractor
+
+# four sentences, second one is shared by first two windows when max_chars is 40
+TEXT = "রহিম ভাত খায়। করিম আলম বাজারে যায়। সে ফিরে আসে। রহিম আলম ঘুমায়।"
+
+# texts without a sentence terminator
+UNTERMINATED_TEXTS = [
+    "  একটি লাইন  ",
+    "রহিম ভাত খায় করিম আলম বাজারে যায় সে ফিরে আসে",
+    "ক" * 25,
+]
+
+@pytest.mark.parametrize("max_chars", [10, 15, 30, 40, 100])
+@pytest.mark.parametrize("text", [TEXT] + UNTERMINATED_TEXTS)
+def test_windows_cover_text_within_max_chars(text, max_chars):
+    windows = make_windows(text, max_chars=max_chars)
+    assert all(0 < end - start <= max_chars for start, end in windows)
+    # windows move forward and leave only whitespace between them
+    for (start, end), (next_start, next_end) in zip(windows, windows[1:]):
+        assert start < next_start <= end or not text[end:next_start].strip()
+        assert next_end > end
+    assert not text[:windows[0][0]].strip() and not text[windows[-1][1]:].strip()
+
+def test_overlapping_windows_share_sentences():
+    sentences = split_sentences(TEXT)
+    assert make_windows(TEXT, max_chars=40, overlap_sentences=1) == [
+        (sentences[0][0], sentences[1][1]), (sentences[1][0], sentences[2][1]), (sentences[2][0], sentences[3][1])]
+    assert make_windows(TEXT, max_chars=40, overlap_sentences=0) == [
+        (sentences[0][0], sentences[1][1]), (sentences[2][0], sentences[3][1])]
+
+def test_text_without_sentence_terminator():
+    # short text is a single window without surrounding whitespace
+    assert make_windows(UNTERMINATED_TEXTS[0], max_chars=100) == [(2, 11)]
+    # long text is split at whitespace, so words are not cut
+    text = UNTERMINATED_TEXTS[1]
+    windows = make_windows(text, max_chars=15)
+    assert [word for start, end in windows for word in text[start:end].split()] == text.split()
+    # a word longer than a window is cut at max_chars
+    assert make_windows(UNTERMINATED_TEXTS[2], max_chars=10) == [(0, 10), (10, 20), (20, 25)]
+    assert make_windows("", max_chars=10) == []
+
+def test_merge_spans_removes_duplicates_of_overlapping_windows():
+    spans = [(15, 23, "PERSON"), (0, 4, "PERSON"), (15, 23, "PERSON"), (50, 58, "PERSON"), (15, 23, "PERSON")]
+    assert merge_spans(spans) == [(0, 4, "PERSON"), (15, 23, "PERSON"), (50, 58, "PERSON")]
+
+def test_merge_spans_keeps_longest_of_overlapping_spans():
+    # a window cut through the name, next window sees all of it
+    assert merge_spans([(20, 23, "PERSON"), (15, 23, "PERSON")]) == [(15, 23, "PERSON")]
+    # first one is kept if spans have same length, touching spans do not overlap
+    assert merge_spans([(12, 20, "PERSON"), (10, 18, "PERSON"), (20, 24, "PERSON")]) == [(10, 18, "PERSON"), (20, 24, "PERSON")]
+    assert merge_spans([]) == []
+
+def test_entity_crossing_window_boundary_is_found_once():
+    bp_ner = make_extractor(0)
+    bp_ner._model.get_pipe("entity_ruler").add_patterns([{"label": "PERSON", "pattern": "করিম আলম"}])
+    # name is in the sentence shared by first two windows, first window ends right after it
+    windows = make_windows(TEXT, max_chars=40)
+    name_start = TEXT.index("করিম আলম")
+    assert windows[0][0] <= name_start < windows[0][1] and windows[1][0] <= name_start < windows[1][1]
+    doc = bp_ner.get_long_doc(TEXT, max_chars=40)
+    expected = [(ent.start_char, ent.end_char, ent.text) for ent in bp_ner._model(TEXT).ents]
+    assert [(ent.start_char, ent.end_char, ent.text) for ent in doc.ents] == expected
+    assert [ent.text for ent in doc.ents].count("করিম আলম") == 1
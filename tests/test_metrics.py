@@ -0,0 +1,55 @@
+import spacy
+from bangla_person_ner.utils.metrics import InferenceMetrics, InstrumentedModel
+from bangla_person_ner.utils.spacy_tokenizer import SpacyBasicTokenizer
+
+TEXTS = [f"মো. আলম {i} টাকা আদায় করেন।" if i % 3 else f"আজ {i} তারিখ।" for i in range(25)]
+
+class CountingModel(object):
+    """Spacy Language object which counts calls of pipe, each call with n_process > 1 starts a
+    process pool.
+    """
+    def __init__(self, nlp: object) -> None:
+        self.nlp = nlp
+        self.pipe_calls = 0
+
+    def pipe(self, *args, **kwargs):
+        self.pipe_calls += 1
+        return self.nlp.pipe(*args, **kwargs)
+
+def make_nlp() -> object:
+    """This function creates a blank pipeline with BasicTokenizer and an entity ruler."""
+    nlp = spacy.blank("bn")
+    nlp.tokenizer = SpacyBasicTokenizer(nlp.vocab)
+    nlp.add_pipe("entity_ruler").add_patterns([{"label": "PERSON", "pattern": "আলম"}])
+    return nlp
+
+def entities(docs: list) -> list:
+    return [[(entity.text, entity.start_char, entity.end_char) for entity in doc.ents] for doc in docs]
+
+def test_pipe_with_processes_uses_one_pool():
+    nlp = make_nlp()
+    expected = entities(nlp.pipe(TEXTS))
+    metrics = InferenceMetrics()
+    model = CountingModel(nlp)
+    docs = list(InstrumentedModel(model, metrics).pipe(TEXTS, batch_size=4, n_process=2))
+    assert entities(docs) == expected
+    assert model.pipe_calls == 1
+    # one observation of inputs and of "model" stage per batch_size texts
+    assert metrics.n_texts == len(TEXTS)
+    assert metrics.n_batches == 7
+    assert metrics.latency[("model", "batch")].count == 7
+
+def test_pipe_with_processes_keeps_context():
+    nlp = make_nlp()
+    tuples = [(text, i) for i, text in enumerate(TEXTS)]
+    outputs = list(InstrumentedModel(nlp, InferenceMetrics()).pipe(tuples, as_tuples=True, batch_size=4, n_process=2))
+    assert [context for _, context in outputs] == list(range(len(TEXTS)))
+    assert [doc.text for doc, _ in outputs] == TEXTS
+
+def test_pipe_in_process_times_components():
+    nlp = make_nlp()
+    metrics = InferenceMetrics()
+    docs = list(InstrumentedModel(nlp, metrics).pipe(TEXTS, batch_size=10))
+    assert entities(docs) == entities(nlp.pipe(TEXTS))
+    assert {stage for stage, _ in metrics.latency} == {"tokenizer", "entity_ruler", "model"}
+    assert metrics.latency[("model", "batch")].count == 3
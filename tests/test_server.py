@@ -0,0 +1,80 @@
+import time
+import json
+import asyncio
+import pytest
+from bangla_person_ner.server import MicroBatcher, InferenceServer, QueueFullError
+
+class FakeExtractor(object):
+    """Stands in for BanglaPersorNer, records batches and takes a fixed time for each of them."""
+    def __init__(self, seconds: float = 0.0) -> None:
+        self.seconds = seconds
+        self.batches = []
+        self.metrics = None
+
+    def extract_person_names_batch(self, texts, batch_size=None, n_process=None):
+        self.batches.append(list(texts))
+        time.sleep(self.seconds)
+        return [{"sentence": text, "extracted_names": []} for text in texts]
+
+    def warmup(self):
+        pass
+
+def dispatch(body) -> tuple:
+    async def run():
+        batcher = MicroBatcher(FakeExtractor(), max_batch_size=4, max_wait_ms=1, max_queue_size=16)
+        server = InferenceServer(batcher)
+        batcher.start()
+        await server.warmup()
+        try:
+            return await server._dispatch("POST", "/extract", body if isinstance(body, bytes) else json.dumps(body).encode())
+        finally:
+            await batcher.stop()
+    return asyncio.run(run())
+
+@pytest.mark.parametrize("body", [
+    {"texts": "আমি"}, {"texts": {"a": "b"}}, {"texts": 5}, {"texts": []}, {"texts": ["a", 1]},
+    {"text": 5}, ["text"], "text", {}, b"not json",
+])
+def test_invalid_body_gets_400(body):
+    status, _ = dispatch(body)
+    assert status == 400
+
+def test_valid_bodies():
+    assert dispatch({"text": "আমি"}) == (200, {"sentence": "আমি", "extracted_names": []})
+    status, payload = dispatch({"texts": [str(i) for i in range(10)]})
+    assert status == 200
+    assert [result["sentence"] for result in payload["results"]] == [str(i) for i in range(10)]
+
+def test_cancelled_request_keeps_texts_counted_until_dropped():
+    async def run():
+        extractor = FakeExtractor(seconds=0.2)
+        batcher = MicroBatcher(extractor, max_batch_size=4, max_wait_ms=1, max_queue_size=16)
+        batcher.start()
+        running = asyncio.ensure_future(batcher.submit(["a"] * 4))
+        await asyncio.sleep(0.05)
+        cancelled = asyncio.ensure_future(batcher.submit(["b"] * 8))
+        await asyncio.sleep(0.01)
+        cancelled.cancel()
+        await asyncio.sleep(0.01)
+        # chunks of the cancelled request are still queued, so they still count against the queue
+        assert batcher._n_queued_texts == 12
+        await running
+        await asyncio.sleep(0.05)
+        assert batcher._n_queued_texts == 0
+        # chunks of the cancelled request are dropped without running them
+        assert extractor.batches == [["a"] * 4]
+        await batcher.stop()
+    asyncio.run(run())
+
+def test_queue_limit_counts_texts():
+    async def run():
+        batcher = MicroBatcher(FakeExtractor(seconds=0.1), max_batch_size=4, max_wait_ms=1, max_queue_size=10)
+        batcher.start()
+        first = asyncio.ensure_future(batcher.submit(["a"] * 8))
+        await asyncio.sleep(0.01)
+        with pytest.raises(QueueFullError):
+            await batcher.submit(["b"] * 3)
+        assert len(await first) == 8
+        assert batcher._n_queued_texts == 0
+        await batcher.stop()
+    asyncio.run(run())
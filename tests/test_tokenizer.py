@@ -0,0 +1,39 @@
+import pytest
+from bangla_person_ner.utils.tokenizer import BasicTokenizer, _char_class
+
+tokenizer = BasicTokenizer()
+
+# edge cases: empty and whitespace only texts, mixed scripts, danda and double danda, bangla and
+# ascii digits, repeated and unusual whitespace, punctuation runs, dots inside names
+EDGE_TEXTS = [
+    "",
+    " ",
+    "\t\n\r  \xa0\u3000",
+    "মো. আলমের কাছ থেকে ১৫ লাখ টাকা আদায় করা হয়।",
+    "আমি ভাত খাই।তুমি কী খাও?",
+    "প্রথম লাইন॥ দ্বিতীয় লাইন।।",
+    "Dhaka ঢাকা 2023 সালে ২০২৩ salary৳500",
+    "ড.মুহাম্মদ  ইউনূস\t\tএবং   Mr.Khan",
+    "১২,৩৪৫.৬৭ টাকা (প্রায়) -- \"উদ্ধৃতি\" [১]",
+    "a.b.c...!!!???",
+    "   leading and trailing   ",
+    "শব্দ\u200cযুক্ত ক্ষ\u200dমা",
+    "নাম\x00আছে\ufffdনেই\x7f",
+]
+
+@pytest.mark.parametrize("text", EDGE_TEXTS)
+def test_tokenize_matches_reference(text):
+    assert tokenizer.tokenize(text) == tokenizer.tokenize_reference(text)
+
+@pytest.mark.parametrize("text", EDGE_TEXTS)
+def test_tokenize_with_offsets_matches_reference(text):
+    expected = tokenizer.tokenize_reference(text)
+    spans = tokenizer.tokenize_with_offsets(text)
+    # a span without its removed (control) characters is the token
+    tokens = ["".join(char for char in text[start:end] if _char_class(char) != "x") for start, end in spans]
+    assert tokens == expected
+
+@pytest.mark.parametrize("text", [text for text in EDGE_TEXTS if not any(_char_class(char) == "x" for char in text)])
+def test_offsets_point_at_tokens(text):
+    spans = tokenizer.tokenize_with_offsets(text)
+    assert [text[start:end] for start, end in spans] == tokenizer.tokenize(text)